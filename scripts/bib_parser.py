@@ -0,0 +1,171 @@
+"""
+
+Shared parser for `papers.bib`
+
+Entries are split line-wise (an entry starts on a line beginning with `@`), so
+`BibEntry.raw` is the exact source text of the entry and can be written back
+verbatim. Parsed entries are cached in a pickle sidecar keyed by the SHA-256 of
+the bib file, so tools only re-parse after the file changes.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import pickle
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PAPERS_BIB_FILE = REPO_ROOT / "_bibliography" / "papers.bib"
+BIB_CACHE_FILE = REPO_ROOT / "_local" / "papers_bib_cache.pickle"
+BIB_CACHE_VERSION = 1
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class BibEntry(NamedTuple):
+    entry_type: str
+    key: str
+    fields: dict[str, str]
+    raw: str
+
+    def get(self, name: str, default: str = "") -> str:
+        return self.fields.get(name, default)
+
+
+def plain_text(value: str) -> str:
+    """`value` without BibTeX grouping braces, e.g. `{OLM}o` -> `OLMo`."""
+    return _WHITESPACE.sub(" ", value.replace("{", "").replace("}", "")).strip()
+
+
+def iter_bib_chunks(lines: Iterable[str]) -> Iterator[str]:
+    """Raw text of each entry; anything before the first `@` line is skipped."""
+    chunk: list[str] = []
+    for line in lines:
+        if line.startswith("@"):
+            if chunk:
+                yield "".join(chunk)
+            chunk = [line]
+        elif chunk:
+            chunk.append(line)
+    if chunk:
+        yield "".join(chunk)
+
+
+def _scan_value(text: str, i: int) -> tuple[str, int]:
+    """Read one value starting at `text[i]`; returns it without its outer delimiters."""
+    n = len(text)
+    if text[i] == "{":
+        depth = 1
+        j = i + 1
+        while j < n and depth:
+            if text[j] == "{":
+                depth += 1
+            elif text[j] == "}":
+                depth -= 1
+            j += 1
+        return text[i + 1 : j - 1], j
+    if text[i] == '"':
+        depth = 0
+        j = i + 1
+        while j < n:
+            char = text[j]
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+            elif char == '"' and depth == 0 and text[j - 1] != "\\":
+                break
+            j += 1
+        return text[i + 1 : j], j + 1
+    j = i
+    while j < n and text[j] not in ",}#\n":
+        j += 1
+    return text[i:j].strip(), j
+
+
+def parse_bib_chunk(chunk: str) -> BibEntry:
+    at = chunk.index("@")
+    brace = chunk.find("{", at)
+    if brace == -1:
+        raise ValueError(f"Malformed BibTeX entry: {chunk[:80]!r}")
+    entry_type = chunk[at + 1 : brace].strip().lower()
+    key_end = brace + 1
+    while key_end < len(chunk) and chunk[key_end] not in ",}":
+        key_end += 1
+    key = chunk[brace + 1 : key_end].strip()
+    fields: dict[str, str] = {}
+    text = chunk
+    n = len(text)
+    i = key_end
+    while i < n:
+        char = text[i]
+        if char == "}":
+            break
+        if char == "," or char.isspace():
+            i += 1
+            continue
+        equals = text.find("=", i)
+        if equals == -1:
+            break
+        name = text[i:equals].strip().lower()
+        i = equals + 1
+        parts = []
+        while True:
+            while i < n and text[i].isspace():
+                i += 1
+            if i >= n:
+                break
+            value, i = _scan_value(text, i)
+            parts.append(value)
+            while i < n and text[i].isspace():
+                i += 1
+            if i < n and text[i] == "#":
+                i += 1
+                continue
+            break
+        fields[name] = _WHITESPACE.sub(" ", "".join(parts)).strip()
+    return BibEntry(entry_type, key, fields, chunk)
+
+
+def parse_bib_text(text: str) -> list[BibEntry]:
+    return [parse_bib_chunk(chunk) for chunk in iter_bib_chunks(io.StringIO(text))]
+
+
+def _read_cache(cache_file: Path, digest: str) -> list[BibEntry] | None:
+    if not cache_file.exists():
+        return None
+    try:
+        with cache_file.open("rb") as handle:
+            cache = pickle.load(handle)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != BIB_CACHE_VERSION or cache.get("sha256") != digest:
+        return None
+    return [BibEntry(*entry) for entry in cache["entries"]]
+
+
+def load_bib_entries(bib_file: Path = PAPERS_BIB_FILE, cache_file: Path | None = BIB_CACHE_FILE) -> list[BibEntry]:
+    """Every entry of `bib_file`, from `cache_file` when the file is unchanged.
+
+    Entries are pickled as plain tuples so the cache stays readable whether
+    this module is imported as `scripts.bib_parser` or `bib_parser`.
+    """
+    if not bib_file.exists():
+        return []
+    text = bib_file.read_text()
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if cache_file is not None:
+        cached = _read_cache(cache_file, digest)
+        if cached is not None:
+            return cached
+    entries = parse_bib_text(text)
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": BIB_CACHE_VERSION, "sha256": digest, "entries": [tuple(entry) for entry in entries]}
+        with cache_file.open("wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    return entries
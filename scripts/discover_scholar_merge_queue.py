@@ -27,10 +27,8 @@ from scripts.scholar_merge_queue import (
     build_discovered_queue_items,
     default_merge_queue_path,
     format_merge_queue,
-    load_merge_queue,
-    merge_discovered_items,
-    save_merge_queue,
 )
+from scripts.scholar_merge_queue_store import merge_discovered_into_queue
 
 
 async def run(
@@ -119,8 +117,7 @@ async def run(
             },
             min_similarity=min_similarity,
         )
-        payload = merge_discovered_items(load_merge_queue(queue_file), discovered_items)
-        save_merge_queue(queue_file, payload)
+        merge_discovered_into_queue(queue_file, discovered_items)
         print(
             json.dumps(
                 {
@@ -145,7 +142,7 @@ def main() -> None:
         "--queue-file",
         type=Path,
         default=default_merge_queue_path(),
-        help="Where the read-only discovered merge queue should be written.",
+        help="Where the read-only discovered merge queue should be written (.json, or .db for the SQLite store).",
     )
     parser.add_argument(
         "--expand-show-more",
@@ -11,10 +11,12 @@ Usage:
 import argparse
 import re
 import subprocess
+import sys
 from collections import OrderedDict
 from pathlib import Path
 
-import bibtexparser
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.bib_parser import load_bib_entries
 
 # Paths
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -54,15 +56,11 @@ CATEGORIES = OrderedDict([
 
 def parse_bib(bib_path: Path) -> list[dict]:
     """Parse a .bib file and return list of entry dicts."""
-    text = bib_path.read_text()
-    parser = bibtexparser.bparser.BibTexParser(common_strings=True)
-    parser.ignore_nonstandard_types = False
-    bib_db = bibtexparser.loads(text, parser=parser)
     entries = []
-    for entry in bib_db.entries:
-        record = dict(entry)
-        record["type"] = record.pop("ENTRYTYPE", "")
-        record["key"] = record.pop("ID", "")
+    for entry in load_bib_entries(bib_path):
+        record = dict(entry.fields)
+        record["type"] = entry.entry_type
+        record["key"] = entry.key
         entries.append(record)
     return entries
 
@@ -12,54 +12,20 @@ Get PDFs for all papers in `papers.bib`
 """
 
 import os
-import re
+import sys
 from collections import defaultdict
+from pathlib import Path
 from time import sleep
 from typing import Dict, List
 
 import requests
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.bib_parser import BibEntry, load_bib_entries, plain_text
 
-def get_bib_chunks(lines: List[str]) -> List[str]:
-    # get bib starts
-    index_starts = []
-    for i, line in enumerate(lines):
-        if line.startswith('@'):
-            index_starts.append(i)
-    # group bibs
-    bibs = []
-    for i in range(len(index_starts) - 1):
-        start = index_starts[i]
-        end = index_starts[i + 1]
-        bibs.append(''.join(lines[start: end]))
-    # get last bib too
-    bibs.append(''.join(lines[index_starts[-1]:]))
-    return bibs
 
-
-def get_bib_id(line: str) -> str:
-    return re.search(r'@.*{(.*),', line).group(1)
-
-
-def get_arxiv_id(line: str) -> str:
-    return re.search(r'arxiv.*=.*({|\")(.+)(}|\")', line).group(2)
-
-
-def get_acl_id(line: str) -> str:
-    return re.search(r'acl.*=.*({|\")(.+)(}|\")', line).group(2)
-
-
-def get_or_id(line: str) -> str:
-    return re.search(r'openreview.*=.*({|\")(.+)(}|\")', line).group(2)
-
-
-def get_pmc_id(line: str) -> str:
-    return re.search(r'pmc.*=.*({|\")(.+)(}|\")', line).group(2)
-
-
-def bib_title(line: str) -> str:
-    line = line.replace('{', '').replace('}', '').replace('"', '')
-    return re.search(r'title.*=(.*),', line).group(1).strip()
+def bib_title(entry: BibEntry) -> str:
+    return plain_text(entry.get('title')).replace('"', '')
 
 
 def create_all_slugs(titles: List[str]) -> List[str]:
@@ -138,62 +104,45 @@ def fetch_pmc_pdf(pmc_id: str, target_path: str):
 
 if __name__ == '__main__':
     # 1) read
-    with open('_bibliography/papers.bib') as f_in:
-        lines = f_in.readlines()
-
-    # 2) organize
-    bib_chunks: List[str] = get_bib_chunks(lines=lines)
+    entries: List[BibEntry] = load_bib_entries(Path('_bibliography/papers.bib'))
 
-    # 3) get slugs first
-    titles = []
-    for bib_chunk in bib_chunks:
-        title_line = [line.strip() for line in bib_chunk.split('\n')
-                      if line.strip().startswith('title')][0]
-        titles.append(bib_title(line=title_line))
+    # 2) get slugs first
+    titles = [bib_title(entry=entry) for entry in entries]
 
     slugs = create_all_slugs(titles=titles)
-    assert len(slugs) == len(bib_chunks)
+    assert len(slugs) == len(entries)
 
-    # 4) fetch any arXiv PDFs first
+    # 3) fetch any arXiv PDFs first
     bib_id_to_slug: Dict = {}
-    for slug, bib_chunk in zip(slugs, bib_chunks):
+    for slug, entry in zip(slugs, entries):
 
         print('pdf={' + slug + '.pdf}')
 
         # bib id
-        bib_id_lines = [line for line in bib_chunk.split('\n') if line.strip().startswith('@')]
-        assert len(bib_id_lines) == 1
-        bib_id = get_bib_id(line=bib_id_lines[0])
-        bib_id_to_slug[bib_id] = slug
+        bib_id_to_slug[entry.key] = slug
 
         # pdf path
         target_pdf_path = os.path.join('assets/pdf/', f'{slug}.pdf')
 
         # start w/ arxiv papers
-        arxiv_lines = [line for line in bib_chunk.split('\n') if line.strip().startswith('arxiv')]
-        if arxiv_lines:
-            assert len(arxiv_lines) == 1
-            arxiv_id = get_arxiv_id(line=arxiv_lines[0])
+        arxiv_id = entry.get('arxiv')
+        if arxiv_id:
             # download
             if not os.path.exists(target_pdf_path):
                 fetch_arxiv_pdf(arxiv_id=arxiv_id, target_path=target_pdf_path)
                 sleep(2)
 
         # next ACL papers
-        acl_lines = [line for line in bib_chunk.split('\n') if line.strip().startswith('acl')]
-        if acl_lines:
-            assert len(acl_lines) == 1
-            acl_id = get_acl_id(line=acl_lines[0])
+        acl_id = entry.get('acl')
+        if acl_id:
             # download
             if not os.path.exists(target_pdf_path):
                 fetch_acl_pdf(acl_id=acl_id, target_path=target_pdf_path)
                 sleep(2)
 
         # next OpenReview papers
-        or_lines = [line for line in bib_chunk.split('\n') if line.strip().startswith('openreview')]
-        if or_lines:
-            assert len(or_lines) == 1
-            openreview_id = get_or_id(line=or_lines[0])
+        openreview_id = entry.get('openreview')
+        if openreview_id:
             # download
 
             if not os.path.exists(target_pdf_path):
@@ -201,10 +150,8 @@ if __name__ == '__main__':
                 sleep(2)
 
         # fetch any pubmed central papers
-        pmc_lines = [line for line in bib_chunk.split('\n') if line.strip().startswith('pmc')]
-        if pmc_lines:
-            assert len(pmc_lines) == 1
-            pmc_id = get_pmc_id(line=pmc_lines[0])
+        pmc_id = entry.get('pmc')
+        if pmc_id:
             # download
             if not os.path.exists(target_pdf_path):
                 fetch_pmc_pdf(pmc_id=pmc_id, target_path=target_pdf_path)
@@ -213,4 +160,3 @@ if __name__ == '__main__':
         # print anything else here, so manually add those PDFs
         if not os.path.exists(target_pdf_path):
             print(f'Missing; {slug}.pdf')
-
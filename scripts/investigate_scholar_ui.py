@@ -27,6 +27,7 @@ from urllib.parse import parse_qs, quote, quote_plus, unquote, urlsplit
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from scripts.parse_scholar_add_articles_snapshot import parse_snapshot
+from scripts.scholar_capture_store import save_capture
 from scripts.scholar_hygiene.config import (
     LOCAL_SCHOLAR_UI_ARTIFACT_DIR,
     SCHOLAR_UI_ARTIFACT_DIR,
@@ -353,29 +354,33 @@ async def run(
         artifact_dir.mkdir(parents=True, exist_ok=True)
         stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_path = artifact_dir / f"{stem}_{stamp}.png"
+        # A read path for the parser whether the capture is a plain file or a store entry.
         html_path = artifact_dir / f"{stem}_{stamp}.html"
-        metadata_path = artifact_dir / f"{stem}_{stamp}_capture.json"
         await page.screenshot(path=str(screenshot_path), full_page=True)
         html = await page.content()
-        html_path.write_text(html)
         markers = await page_markers(page)
-        metadata_path.write_text(
-            json.dumps(
-                {
-                    "captured_url": page.url,
-                    "page_title": await page.title(),
-                    "capture_kind": capture_kind,
-                    "markers": markers,
-                },
-                indent=2,
-                sort_keys=True,
-            )
+        capture = save_capture(
+            artifact_dir,
+            html_path.name,
+            html,
+            {
+                "captured_url": page.url,
+                "page_title": await page.title(),
+                "capture_kind": capture_kind,
+                "markers": markers,
+            },
         )
         print(f"Captured URL: {page.url}")
         print(f"Page title: {await page.title()}")
         print(f"Saved screenshot: {screenshot_path}")
-        print(f"Saved HTML: {html_path}")
-        print(f"Saved capture metadata: {metadata_path}")
+        if "html_path" in capture:
+            print(f"Saved HTML: {capture['html_path']}")
+            print(f"Saved capture metadata: {capture['metadata_path']}")
+        else:
+            print(
+                f"Saved HTML: {capture['capture_name']} -> {capture['blob_path']}"
+                + (" (unchanged page, blob reused)" if capture["deduplicated"] else "")
+            )
 
         parsed_path = None
         if parse_add_articles and (
@@ -391,8 +396,7 @@ async def run(
 
         return {
             "screenshot_path": screenshot_path,
-            "html_path": html_path,
-            "metadata_path": metadata_path,
+            **capture,
             "parsed_path": parsed_path,
             "markers": markers,
         }
@@ -27,6 +27,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from scripts.investigate_scholar_ui import default_artifact_dir
 from scripts.parse_scholar_add_articles_snapshot import parse_snapshot
 from scripts.parse_scholar_add_articles_snapshot import normalize_space
+from scripts.scholar_capture_store import save_capture
 from scripts.scholar_hygiene.config import LOCAL_SCHOLAR_UI_ARTIFACT_DIR, SCHOLAR_UI_ARTIFACT_DIR
 
 
@@ -146,33 +147,27 @@ async def run(
             return ""
         return await data.first.get_attribute("data-start") or ""
 
-    async def capture_page_artifacts(page, *, stem: str, capture_kind: str) -> dict[str, Path]:
+    async def capture_page_artifacts(page, *, stem: str, capture_kind: str) -> dict[str, object]:
         artifact_dir.mkdir(parents=True, exist_ok=True)
         stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_path = artifact_dir / f"{stem}_{stamp}.png"
+        # A read path for the parsers whether the capture is a plain file or a store entry.
         html_path = artifact_dir / f"{stem}_{stamp}.html"
-        metadata_path = artifact_dir / f"{stem}_{stamp}_capture.json"
         await page.screenshot(path=str(screenshot_path), full_page=True)
-        html_path.write_text(await page.content())
-        metadata_path.write_text(
-            json.dumps(
-                {
-                    "captured_url": page.url,
-                    "page_title": await page.title(),
-                    "capture_kind": capture_kind,
-                },
-                indent=2,
-                sort_keys=True,
-            )
+        capture = save_capture(
+            artifact_dir,
+            html_path.name,
+            await page.content(),
+            {
+                "captured_url": page.url,
+                "page_title": await page.title(),
+                "capture_kind": capture_kind,
+            },
         )
         if any((await page_markers(page)).values()):
             parsed_path = html_path.with_name(f"{html_path.stem}_add_articles.json")
             parsed_path.write_text(json.dumps(parse_snapshot(html_path), indent=2, sort_keys=True))
-        return {
-            "screenshot_path": screenshot_path,
-            "html_path": html_path,
-            "metadata_path": metadata_path,
-        }
+        return {"screenshot_path": screenshot_path, **capture}
 
     async def ensure_candidate_selected(page, checkbox_id: str) -> None:
         checkbox = page.locator(f"#{checkbox_id}")
@@ -26,6 +26,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from scripts.investigate_scholar_ui import default_artifact_dir
 from scripts.parse_scholar_add_articles_snapshot import normalize_space
+from scripts.scholar_capture_store import save_capture
 
 
 def normalize_title_text(text: str) -> str:
@@ -157,6 +158,58 @@ def format_visible_actions(actions: list[dict]) -> str:
     return "\n".join(lines)
 
 
+async def select_existing_page(context):
+    for candidate in reversed(context.pages):
+        has_profile_table = await candidate.locator(".gsc_a_tr").count() > 0
+        if has_profile_table:
+            return candidate
+    return context.pages[-1] if context.pages else await context.new_page()
+
+
+class ProfileSession:
+    """One CDP connection and Scholar profile page shared across several `run` calls.
+
+    The connection is opened on the first `profile_page()` call; a page that has
+    been closed in the meantime is re-selected from the same browser context.
+    """
+
+    def __init__(self, cdp_url: str) -> None:
+        self.cdp_url = cdp_url
+        self.connect_count = 0
+        self.page_select_count = 0
+        self._playwright = None
+        self._browser = None
+        self._page = None
+
+    async def profile_page(self):
+        if self._browser is None or not self._browser.is_connected():
+            from playwright.async_api import async_playwright
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.connect_over_cdp(self.cdp_url)
+            self._page = None
+            self.connect_count += 1
+        if self._page is None or self._page.is_closed():
+            context = self._browser.contexts[0] if self._browser.contexts else await self._browser.new_context()
+            self._page = await select_existing_page(context)
+            self.page_select_count += 1
+        return self._page
+
+    async def close(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._playwright = self._browser = self._page = None
+
+    async def __aenter__(self) -> "ProfileSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
 async def run(
     *,
     cdp_url: str,
@@ -169,9 +222,14 @@ async def run(
     list_visible_actions: bool,
     artifact_dir: Path,
     wait_seconds: int,
+    page=None,
 ) -> dict:
-    from playwright.async_api import async_playwright
+    """Review (and with `execute`, merge) one profile family.
 
+    Pass `page` to work on an already-open profile page (see `ProfileSession`)
+    instead of connecting to `cdp_url`; the page is re-validated but left open,
+    and a dry run clears the row selection it made.
+    """
     reviewed_targets = [parse_target_spec(spec) for spec in targets]
 
     async def wait_for_profile_page(page, timeout_seconds: int) -> None:
@@ -184,13 +242,6 @@ async def run(
             await page.wait_for_timeout(500)
         raise RuntimeError("Timed out waiting for the Scholar profile page action bar.")
 
-    async def select_existing_page(context):
-        for candidate in reversed(context.pages):
-            has_profile_table = await candidate.locator(".gsc_a_tr").count() > 0
-            if has_profile_table:
-                return candidate
-        return context.pages[-1] if context.pages else await context.new_page()
-
     async def profile_rows(page) -> list[dict]:
         return await page.locator(".gsc_a_tr").evaluate_all(
             """(rows) => rows.map((row) => {
@@ -249,30 +300,22 @@ async def run(
             }"""
         )
 
-    async def capture_page_artifacts(page, *, stem: str, capture_kind: str) -> dict[str, Path]:
+    async def capture_page_artifacts(page, *, stem: str, capture_kind: str) -> dict[str, object]:
         artifact_dir.mkdir(parents=True, exist_ok=True)
         stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_path = artifact_dir / f"{stem}_{stamp}.png"
-        html_path = artifact_dir / f"{stem}_{stamp}.html"
-        metadata_path = artifact_dir / f"{stem}_{stamp}_capture.json"
         await page.screenshot(path=str(screenshot_path), full_page=True)
-        html_path.write_text(await page.content())
-        metadata_path.write_text(
-            json.dumps(
-                {
-                    "captured_url": page.url,
-                    "page_title": await page.title(),
-                    "capture_kind": capture_kind,
-                },
-                indent=2,
-                sort_keys=True,
-            )
+        capture = save_capture(
+            artifact_dir,
+            f"{stem}_{stamp}.html",
+            await page.content(),
+            {
+                "captured_url": page.url,
+                "page_title": await page.title(),
+                "capture_kind": capture_kind,
+            },
         )
-        return {
-            "screenshot_path": screenshot_path,
-            "html_path": html_path,
-            "metadata_path": metadata_path,
-        }
+        return {"screenshot_path": screenshot_path, **capture}
 
     async def ensure_rows_selected(page, selected_rows: list[dict]) -> None:
         for row in selected_rows:
@@ -289,6 +332,15 @@ async def run(
             if not await checkbox.first.is_checked():
                 await checkbox.first.evaluate("(node) => node.click()")
 
+    async def restore_row_selection(page, original_rows: list[dict]) -> None:
+        for row in original_rows:
+            checkbox_id = row.get("checkbox_id", "")
+            if not checkbox_id or row.get("disabled"):
+                continue
+            checkbox = page.locator(selector_for_id("input", checkbox_id))
+            if await checkbox.count() > 0 and await checkbox.first.is_checked() != row.get("checked"):
+                await checkbox.first.evaluate("(node) => node.click()")
+
     async def click_merge_action(page, action: dict) -> None:
         action_id = action.get("id", "")
         if action_id:
@@ -355,13 +407,7 @@ async def run(
             await page.wait_for_timeout(500)
         raise RuntimeError("Timed out waiting for an observable profile-table change after clicking Merge.")
 
-    async with async_playwright() as playwright:
-        browser = await playwright.chromium.connect_over_cdp(cdp_url)
-        if browser.contexts:
-            context = browser.contexts[0]
-        else:
-            context = await browser.new_context()
-        page = await select_existing_page(context)
+    async def run_on_page(page, *, shared: bool) -> dict:
         await wait_for_profile_page(page, wait_seconds)
         await dismiss_stale_merge_modal(page)
 
@@ -372,7 +418,6 @@ async def run(
                 limit=visible_row_limit,
             )
             print(output)
-            await browser.close()
             return {"mode": "list_visible_rows", "output": output}
 
         expected_confirmation = build_confirmation_phrase([target["row_id"] for target in reviewed_targets])
@@ -392,7 +437,6 @@ async def run(
         if list_visible_actions:
             output = format_visible_actions(actions)
             print(output)
-            await browser.close()
             return {"mode": "list_visible_actions", "output": output}
         merge_action = choose_merge_action(actions)
 
@@ -416,7 +460,9 @@ async def run(
             print("")
             print("Dry run only. No mutation was performed.")
             print(f'If this reviewed family is correct, rerun with: --execute --confirm "{expected_confirmation}"')
-            await browser.close()
+            if shared:
+                # The next item reviews on this same page; do not leave this family selected.
+                await restore_row_selection(page, target_rows)
             return {
                 "mode": "dry_run",
                 "summary": summary,
@@ -436,7 +482,6 @@ async def run(
         }
         print("")
         print(json.dumps(outcome, indent=2, sort_keys=True))
-        await browser.close()
         return {
             "mode": "execute",
             "summary": summary,
@@ -444,6 +489,22 @@ async def run(
             "expected_confirmation": expected_confirmation,
         }
 
+    if page is not None:
+        return await run_on_page(page, shared=True)
+
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.connect_over_cdp(cdp_url)
+        try:
+            if browser.contexts:
+                context = browser.contexts[0]
+            else:
+                context = await browser.new_context()
+            return await run_on_page(await select_existing_page(context), shared=False)
+        finally:
+            await browser.close()
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
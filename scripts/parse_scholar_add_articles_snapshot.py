@@ -8,11 +8,15 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
 from urllib.parse import parse_qs, unquote, urljoin
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.scholar_capture_store import read_capture_metadata, read_capture_text
+
 SCHOLAR_BASE = "https://scholar.google.com"
 
 
@@ -25,14 +29,7 @@ def attr_map(attrs) -> dict[str, str]:
 
 
 def extract_capture_url(html_path: Path) -> str:
-    metadata_path = html_path.with_name(f"{html_path.stem}_capture.json")
-    if not metadata_path.exists():
-        return ""
-    try:
-        payload = json.loads(metadata_path.read_text())
-    except json.JSONDecodeError:
-        return ""
-    return payload.get("captured_url", "")
+    return read_capture_metadata(html_path).get("captured_url", "")
 
 
 def extract_search_query(html: str, captured_url: str) -> str:
@@ -164,7 +161,7 @@ class AddArticlesParser(HTMLParser):
 
 
 def parse_snapshot(html_path: Path) -> dict:
-    html = html_path.read_text()
+    html = read_capture_text(html_path)
     captured_url = extract_capture_url(html_path)
     parser = AddArticlesParser()
     parser.feed(html)
@@ -8,11 +8,15 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
 from urllib.parse import urljoin
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.scholar_capture_store import read_capture_text
+
 SCHOLAR_BASE = "https://scholar.google.com"
 
 
@@ -135,7 +139,7 @@ class ScholarDetailParser(HTMLParser):
 
 
 def parse_snapshot(html_path: Path) -> dict:
-    html = html_path.read_text()
+    html = read_capture_text(html_path)
     parser = ScholarDetailParser()
     parser.feed(html)
     payload = {
@@ -7,12 +7,18 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
+from typing import Iterator
 from urllib.parse import urljoin
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.scholar_capture_store import open_capture
+
 SCHOLAR_BASE = "https://scholar.google.com"
+SNAPSHOT_CHUNK_SIZE = 64 * 1024
 
 
 def normalize_space(text: str) -> str:
@@ -24,28 +30,46 @@ def attr_map(attrs) -> dict[str, str]:
 
 
 class ScholarProfileParser(HTMLParser):
+    """Incremental profile parser: completed rows accumulate in `rows` as each
+    `gsc_a_tr` closes, so callers may `feed` chunks and `drain_rows` between them.
+    """
+
+    # Field being captured -> end tag that finishes it.
+    PROFILE_FIELDS = {
+        "name": "div",
+        "affiliation": "div",
+        "stat_label": "td",
+        "stat_value": "td",
+        "articles_label": "span",
+    }
+    ROW_FIELDS = {
+        "title": "a",
+        "authors": "div",
+        "venue": "div",
+        "citations": "a",
+        "year": "span",
+    }
+
     def __init__(self) -> None:
         super().__init__()
         self.profile: dict = {}
         self.rows: list[dict] = []
+        self.articles_label = ""
 
-        self._in_name = False
-        self._in_affiliation = False
         self._in_stats = False
-        self._in_stat_label = False
-        self._in_stat_value = False
         self._current_stat_label = ""
-        self._current_stat_value = ""
         self._current_row: dict | None = None
         self._row_stack = 0
-        self._current_link_field: str | None = None
-        self._current_div_role: str | None = None
+        self._capturing: str | None = None
         self._capture_text: list[str] = []
-        self._capture_authors = False
-        self._capture_venue = False
-        self._capture_citations = False
-        self._capture_year = False
-        self._profile_articles_label = ""
+
+    def drain_rows(self) -> list[dict]:
+        rows, self.rows = self.rows, []
+        return rows
+
+    def _start_capture(self, field: str) -> None:
+        self._capturing = field
+        self._capture_text = []
 
     def handle_starttag(self, tag: str, attrs) -> None:
         attrs_d = attr_map(attrs)
@@ -53,22 +77,17 @@ class ScholarProfileParser(HTMLParser):
         elem_id = attrs_d.get("id", "")
 
         if tag == "div" and elem_id == "gsc_prf_in":
-            self._in_name = True
-            self._capture_text = []
+            self._start_capture("name")
         elif tag == "div" and elem_id == "gsc_prf_i":
-            self._in_affiliation = True
-            self._capture_text = []
+            self._start_capture("affiliation")
         elif tag == "table" and elem_id == "gsc_rsb_st":
             self._in_stats = True
         elif self._in_stats and tag == "td" and class_attr == "gsc_rsb_sth":
-            self._in_stat_label = True
-            self._capture_text = []
+            self._start_capture("stat_label")
         elif self._in_stats and tag == "td" and class_attr == "gsc_rsb_std":
-            self._in_stat_value = True
-            self._capture_text = []
+            self._start_capture("stat_value")
         elif tag == "span" and elem_id == "gsc_a_nn":
-            self._capture_text = []
-            self._current_link_field = "__articles_label__"
+            self._start_capture("articles_label")
         elif tag == "tr" and "gsc_a_tr" in class_attr.split():
             self._current_row = {
                 "title": "",
@@ -81,67 +100,45 @@ class ScholarProfileParser(HTMLParser):
             }
             self._row_stack = 1
         elif self._current_row is not None:
+            classes = class_attr.split()
             if tag == "tr":
                 self._row_stack += 1
-            if tag == "a" and "gsc_a_at" in class_attr.split():
-                self._current_link_field = "title"
-                self._current_row["detail_url"] = urljoin(
-                    SCHOLAR_BASE, attrs_d.get("href", "")
-                )
-                self._capture_text = []
+            if tag == "a" and "gsc_a_at" in classes:
+                self._current_row["detail_url"] = urljoin(SCHOLAR_BASE, attrs_d.get("href", ""))
+                self._start_capture("title")
             elif tag == "div" and class_attr == "gs_gray":
                 if not self._current_row["authors"]:
-                    self._capture_authors = True
-                    self._capture_text = []
+                    self._start_capture("authors")
                 elif not self._current_row["venue"]:
-                    self._capture_venue = True
-                    self._capture_text = []
-            elif tag == "a" and "gsc_a_ac" in class_attr.split():
-                self._capture_citations = True
+                    self._start_capture("venue")
+            elif tag == "a" and "gsc_a_ac" in classes:
                 self._current_row["citations_url"] = attrs_d.get("href", "")
-                self._capture_text = []
-            elif tag == "span" and "gsc_a_h" in class_attr.split():
-                self._capture_year = True
-                self._capture_text = []
+                self._start_capture("citations")
+            elif tag == "span" and "gsc_a_h" in classes:
+                self._start_capture("year")
 
     def handle_endtag(self, tag: str) -> None:
-        if self._in_name and tag == "div":
-            self.profile["name"] = normalize_space("".join(self._capture_text))
-            self._in_name = False
-        elif self._in_affiliation and tag == "div":
+        field = self._capturing
+        if field in self.PROFILE_FIELDS and tag == self.PROFILE_FIELDS[field]:
             text = normalize_space("".join(self._capture_text))
-            if text:
-                self.profile["affiliation"] = text
-            self._in_affiliation = False
-        elif self._in_stat_label and tag == "td":
-            self._current_stat_label = normalize_space("".join(self._capture_text))
-            self._in_stat_label = False
-        elif self._in_stat_value and tag == "td":
-            self._current_stat_value = normalize_space("".join(self._capture_text))
-            if self._current_stat_label:
-                self.profile.setdefault("stats", {})[self._current_stat_label] = self._current_stat_value
-            self._current_stat_label = ""
-            self._current_stat_value = ""
-            self._in_stat_value = False
-        elif self._current_link_field == "__articles_label__" and tag == "span":
-            self._profile_articles_label = normalize_space("".join(self._capture_text))
-            self._current_link_field = None
+            self._capturing = None
+            if field == "name":
+                self.profile["name"] = text
+            elif field == "affiliation":
+                if text:
+                    self.profile["affiliation"] = text
+            elif field == "stat_label":
+                self._current_stat_label = text
+            elif field == "stat_value":
+                if self._current_stat_label:
+                    self.profile.setdefault("stats", {})[self._current_stat_label] = text
+                self._current_stat_label = ""
+            else:
+                self.articles_label = text
         elif self._current_row is not None:
-            if self._current_link_field == "title" and tag == "a":
-                self._current_row["title"] = normalize_space("".join(self._capture_text))
-                self._current_link_field = None
-            elif self._capture_authors and tag == "div":
-                self._current_row["authors"] = normalize_space("".join(self._capture_text))
-                self._capture_authors = False
-            elif self._capture_venue and tag == "div":
-                self._current_row["venue"] = normalize_space("".join(self._capture_text))
-                self._capture_venue = False
-            elif self._capture_citations and tag == "a":
-                self._current_row["citations"] = normalize_space("".join(self._capture_text))
-                self._capture_citations = False
-            elif self._capture_year and tag == "span":
-                self._current_row["year"] = normalize_space("".join(self._capture_text))
-                self._capture_year = False
+            if field in self.ROW_FIELDS and tag == self.ROW_FIELDS[field]:
+                self._current_row[field] = normalize_space("".join(self._capture_text))
+                self._capturing = None
             elif tag == "tr":
                 self._row_stack -= 1
                 if self._row_stack == 0:
@@ -149,33 +146,39 @@ class ScholarProfileParser(HTMLParser):
                     self._current_row = None
 
     def handle_data(self, data: str) -> None:
-        if any(
-            [
-                self._in_name,
-                self._in_affiliation,
-                self._in_stat_label,
-                self._in_stat_value,
-                self._current_link_field is not None,
-                self._capture_authors,
-                self._capture_venue,
-                self._capture_citations,
-                self._capture_year,
-            ]
-        ):
+        if self._capturing is not None:
             self._capture_text.append(data)
 
 
-def parse_snapshot(html_path: Path) -> dict:
+def iter_snapshot_rows(
+    html_path: Path,
+    parser: ScholarProfileParser | None = None,
+    chunk_size: int = SNAPSHOT_CHUNK_SIZE,
+) -> Iterator[dict]:
+    """Yield visible rows as each one closes, reading `html_path` in `chunk_size` pieces.
+
+    Pass a `parser` to read the profile header from it once the generator is exhausted.
+    """
+    parser = parser or ScholarProfileParser()
+    with open_capture(html_path) as handle:
+        while chunk := handle.read(chunk_size):
+            parser.feed(chunk)
+            yield from parser.drain_rows()
+    parser.close()
+    yield from parser.drain_rows()
+
+
+def parse_snapshot(html_path: Path, chunk_size: int = SNAPSHOT_CHUNK_SIZE) -> dict:
     parser = ScholarProfileParser()
-    parser.feed(html_path.read_text())
+    rows = list(iter_snapshot_rows(html_path, parser, chunk_size))
     return {
         "snapshot_file": str(html_path),
         "profile": {
             **parser.profile,
-            "visible_articles_label": parser._profile_articles_label,
+            "visible_articles_label": parser.articles_label,
         },
-        "visible_rows": parser.rows,
-        "visible_row_count": len(parser.rows),
+        "visible_rows": rows,
+        "visible_row_count": len(rows),
     }
 
 
@@ -0,0 +1,135 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Re-parse every saved Scholar UI HTML snapshot in an artifact directory."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts import (
+    parse_scholar_add_articles_snapshot,
+    parse_scholar_detail_snapshot,
+    parse_scholar_profile_snapshot,
+    parse_scholar_versions_snapshot,
+)
+from scripts.scholar_capture_store import capture_html_paths, capture_mtime, read_capture_text
+from scripts.scholar_hygiene.config import LOCAL_SCHOLAR_UI_ARTIFACT_DIR
+
+
+class SnapshotKind(NamedTuple):
+    name: str
+    markers: tuple[str, ...]
+    parse: Callable[[Path], dict]
+    output_path: Callable[[Path], Path]
+
+
+# Checked in order: the Add Articles dialog is captured on top of the profile page.
+SNAPSHOT_KINDS = (
+    SnapshotKind(
+        "add_articles",
+        ('id="gsc_ia_res"', 'id="gsc_iadb_data"', "gsc_iadb_art"),
+        parse_scholar_add_articles_snapshot.parse_snapshot,
+        parse_scholar_add_articles_snapshot.default_output_path,
+    ),
+    SnapshotKind(
+        "detail",
+        ('id="gsc_oci_title"',),
+        parse_scholar_detail_snapshot.parse_snapshot,
+        parse_scholar_detail_snapshot.default_output_path,
+    ),
+    SnapshotKind(
+        "versions",
+        ('class="gs_r gs_or gs_scl"',),
+        parse_scholar_versions_snapshot.parse_versions_snapshot,
+        parse_scholar_versions_snapshot.default_output_path,
+    ),
+    SnapshotKind(
+        "profile",
+        ('id="gsc_prf_in"', "gsc_a_tr"),
+        parse_scholar_profile_snapshot.parse_snapshot,
+        parse_scholar_profile_snapshot.default_output_path,
+    ),
+)
+
+
+def detect_snapshot_kind(html: str) -> SnapshotKind | None:
+    for kind in SNAPSHOT_KINDS:
+        if any(marker in html for marker in kind.markers):
+            return kind
+    return None
+
+
+def is_parsed(html_path: Path) -> bool:
+    """Whether some parser output for `html_path` is at least as new as the HTML."""
+    html_mtime = capture_mtime(html_path)
+    for kind in SNAPSHOT_KINDS:
+        output_path = kind.output_path(html_path)
+        if output_path.exists() and output_path.stat().st_mtime >= html_mtime:
+            return True
+    return False
+
+
+def parse_snapshot_file(html_path: Path) -> dict:
+    kind = detect_snapshot_kind(read_capture_text(html_path))
+    if kind is None:
+        return {"html_path": str(html_path), "kind": None}
+    output_path = kind.output_path(html_path)
+    output_path.write_text(json.dumps(kind.parse(html_path), indent=2, sort_keys=True))
+    return {"html_path": str(html_path), "kind": kind.name, "output_path": str(output_path)}
+
+
+def parse_all(artifact_dir: Path, *, workers: int | None = None, force: bool = False) -> dict:
+    """Parse every HTML capture in `artifact_dir` whose output is missing or stale.
+
+    Captures may be plain files or entries in the capture store. Snapshots are
+    fanned out over a process pool; with one worker (or one pending file) they
+    are parsed in this process.
+    """
+    html_paths = capture_html_paths(artifact_dir)
+    pending = [path for path in html_paths if force or not is_parsed(path)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(pending) <= 1:
+        results = [parse_snapshot_file(path) for path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            results = list(pool.map(parse_snapshot_file, pending, chunksize=max(1, len(pending) // (workers * 4))))
+    parsed: dict[str, int] = {}
+    for result in results:
+        if result["kind"] is not None:
+            parsed[result["kind"]] = parsed.get(result["kind"], 0) + 1
+    return {
+        "snapshot_count": len(html_paths),
+        "skipped_up_to_date": len(html_paths) - len(pending),
+        "parsed": parsed,
+        "unrecognized": sorted(result["html_path"] for result in results if result["kind"] is None),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    parse_all_parser = subparsers.add_parser("parse-all", help="Parse every new or changed HTML snapshot")
+    parse_all_parser.add_argument("--artifact-dir", type=Path, default=LOCAL_SCHOLAR_UI_ARTIFACT_DIR)
+    parse_all_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parse_all_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-parse snapshots even when their JSON is newer than the HTML (e.g. after a parser fix)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "parse-all":
+        summary = parse_all(args.artifact_dir, workers=args.workers, force=args.force)
+        print(json.dumps(summary, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,17 +8,43 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from html import unescape
 from pathlib import Path
 from urllib.parse import urljoin
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.scholar_capture_store import read_capture_text
+
 SCHOLAR_BASE = "https://scholar.google.com"
 
+# Text inside one result block: runs without tags are taken whole, and a tag
+# only if it does not open the next block. A block that does not fit
+# `ROW_PATTERN` then fails within itself instead of rescanning the page.
+IN_BLOCK = r'(?:[^<]++|<(?!div class="gs_r gs_or gs_scl"))'
+ROW_PATTERN = re.compile(
+    r'<div class="gs_r gs_or gs_scl"(?P<attrs>[^>]*)>'
+    rf'{IN_BLOCK}*?<h3 class="gs_rt"[^>]*>(?P<title_block>{IN_BLOCK}*?)</h3>'
+    rf'<div class="gs_a">(?P<meta>{IN_BLOCK}*?)</div>'
+    rf'(?:<div class="gs_rs">(?P<snippet>{IN_BLOCK}*?)</div>)?'
+    rf'{IN_BLOCK}*?<div class="gs_fl gs_flb">(?P<footer>{IN_BLOCK}*?)</div>'
+    rf'{IN_BLOCK}*?</div></div>',
+)
+LINK_PATTERN = re.compile(r'<a[^>]+href="(?P<href>[^"]+)"[^>]*>(?P<label>.*?)</a>', re.DOTALL)
+TITLE_LINK_PATTERN = re.compile(r'<a[^>]+id="(?P<id>[^"]+)"[^>]+href="(?P<href>[^"]+)"[^>]*>(?P<title>.*?)</a>', re.DOTALL)
+DATA_RP_PATTERN = re.compile(r'data-rp="(?P<rp>\d+)"')
+DATA_DID_PATTERN = re.compile(r'data-did="(?P<did>[^"]*)"')
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
 
 def normalize_space(text: str) -> str:
     return " ".join(unescape(text or "").replace("\xa0", " ").split())
 
 
+def strip_tags(html: str) -> str:
+    return normalize_space(TAG_PATTERN.sub(" ", html))
+
+
 def default_output_path(html_path: Path) -> Path:
     return html_path.with_name(f"{html_path.stem}_versions.json")
 
@@ -29,38 +55,19 @@ def extract_cluster_id(html: str) -> str:
 
 
 def parse_versions_snapshot(html_path: Path) -> dict:
-    html = html_path.read_text()
+    html = read_capture_text(html_path)
     cluster_id = extract_cluster_id(html)
 
-    row_pattern = re.compile(
-        r'<div class="gs_r gs_or gs_scl"(?P<attrs>[^>]*)>'
-        r'.*?<h3 class="gs_rt"[^>]*>(?P<title_block>.*?)</h3>'
-        r'<div class="gs_a">(?P<meta>.*?)</div>'
-        r'(?:<div class="gs_rs">(?P<snippet>.*?)</div>)?'
-        r'.*?<div class="gs_fl gs_flb">(?P<footer>.*?)</div>'
-        r'.*?</div></div>',
-        re.DOTALL,
-    )
-    link_pattern = re.compile(r'<a[^>]+href="(?P<href>[^"]+)"[^>]*>(?P<label>.*?)</a>', re.DOTALL)
-    title_link_pattern = re.compile(r'<a[^>]+id="(?P<id>[^"]+)"[^>]+href="(?P<href>[^"]+)"[^>]*>(?P<title>.*?)</a>', re.DOTALL)
-    data_rp_pattern = re.compile(r'data-rp="(?P<rp>\d+)"')
-    data_did_pattern = re.compile(r'data-did="(?P<did>[^"]*)"')
-
     rows = []
-    for row_match in row_pattern.finditer(html):
+    for row_match in ROW_PATTERN.finditer(html):
         attrs = row_match.group("attrs")
-        title_block = row_match.group("title_block")
-        meta = row_match.group("meta")
-        snippet = row_match.group("snippet") or ""
-        footer = row_match.group("footer")
-
-        title_match = title_link_pattern.search(title_block)
+        title_match = TITLE_LINK_PATTERN.search(row_match.group("title_block"))
         if not title_match:
             continue
 
         footer_links = []
-        for link_match in link_pattern.finditer(footer):
-            label = normalize_space(re.sub(r"<[^>]+>", " ", link_match.group("label")))
+        for link_match in LINK_PATTERN.finditer(row_match.group("footer")):
+            label = strip_tags(link_match.group("label"))
             if not label:
                 continue
             footer_links.append(
@@ -70,15 +77,17 @@ def parse_versions_snapshot(html_path: Path) -> dict:
                 }
             )
 
+        rank_match = DATA_RP_PATTERN.search(attrs)
+        did_match = DATA_DID_PATTERN.search(attrs)
         rows.append(
             {
                 "result_id": title_match.group("id"),
-                "result_rank": int(data_rp_pattern.search(attrs).group("rp")) if data_rp_pattern.search(attrs) else None,
-                "data_did": data_did_pattern.search(attrs).group("did") if data_did_pattern.search(attrs) else "",
-                "title": normalize_space(re.sub(r"<[^>]+>", " ", title_match.group("title"))),
+                "result_rank": int(rank_match.group("rp")) if rank_match else None,
+                "data_did": did_match.group("did") if did_match else "",
+                "title": strip_tags(title_match.group("title")),
                 "title_url": urljoin(SCHOLAR_BASE, unescape(title_match.group("href"))),
-                "meta": normalize_space(re.sub(r"<[^>]+>", " ", meta)),
-                "snippet": normalize_space(re.sub(r"<[^>]+>", " ", snippet)),
+                "meta": strip_tags(row_match.group("meta")),
+                "snippet": strip_tags(row_match.group("snippet") or ""),
                 "footer_links": footer_links,
             }
         )
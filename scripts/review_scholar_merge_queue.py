@@ -11,11 +11,12 @@ from scripts.scholar_merge_queue import (
     format_merge_queue,
     format_merge_queue_item,
     format_merge_queue_triage,
-    get_queue_item,
-    load_merge_queue,
-    save_merge_queue,
-    select_queue_items,
-    update_queue_item_status,
+)
+from scripts.scholar_merge_queue_store import (
+    export_merge_queue_json,
+    import_merge_queue_json,
+    is_sqlite_queue_path,
+    open_merge_queue,
 )
 
 
@@ -25,7 +26,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--queue-file",
         type=Path,
         default=default_merge_queue_path(),
-        help="Path to the merge queue JSON artifact.",
+        help="Path to the merge queue artifact (.json, or .db for the SQLite store).",
     )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -56,62 +57,69 @@ def build_parser() -> argparse.ArgumentParser:
     bulk_parser.add_argument("--limit", type=int, help="Optional maximum number of matching items to update.")
     bulk_parser.add_argument("--note", help="Optional review note to write into all updated items.")
     bulk_parser.add_argument("--dry-run", action="store_true", help="Print matching items without writing changes.")
+
+    import_parser = subparsers.add_parser("import-json", help="Replace the SQLite queue contents with a JSON queue file.")
+    import_parser.add_argument("json_file", type=Path, help="Merge queue JSON file to import.")
+
+    export_parser = subparsers.add_parser("export-json", help="Write the SQLite queue contents as a JSON queue file.")
+    export_parser.add_argument("json_file", type=Path, help="Destination merge queue JSON file.")
     return parser
 
 
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
-    payload = load_merge_queue(args.queue_file)
 
-    if args.command == "list":
-        formatter = format_merge_queue_triage if args.triage else format_merge_queue
-        print(formatter(payload.get("items", []), status=args.status, limit=args.limit))
+    if args.command in {"import-json", "export-json"}:
+        if not is_sqlite_queue_path(args.queue_file):
+            parser.error(f"{args.command} requires a SQLite --queue-file (.db)")
+        if args.command == "import-json":
+            count = import_merge_queue_json(args.queue_file, args.json_file)
+            print(f"Imported {count} merge queue items into {args.queue_file}.")
+        else:
+            count = export_merge_queue_json(args.queue_file, args.json_file)
+            print(f"Exported {count} merge queue items to {args.json_file}.")
         return
 
-    if args.command == "show":
-        print(format_merge_queue_item(get_queue_item(payload, args.id)))
-        return
-
-    if args.command == "update":
-        updated_payload = update_queue_item_status(
-            payload,
-            item_id=args.id,
-            status=args.status,
-            note=args.note,
-        )
-        save_merge_queue(args.queue_file, updated_payload)
-        print(format_merge_queue_item(get_queue_item(updated_payload, args.id)))
-        return
+    with open_merge_queue(args.queue_file) as queue:
+        if args.command == "list":
+            formatter = format_merge_queue_triage if args.triage else format_merge_queue
+            items = queue.items_with_status(args.status) if args.status else queue.items
+            print(formatter(items, status=args.status, limit=args.limit))
+            return
 
-    if args.command == "bulk-update":
-        matches = select_queue_items(
-            payload,
-            status=args.match_status,
-            family_type=args.family_type,
-            confidence=args.confidence,
-            contains=args.contains,
-            exclude_contains=args.exclude_contains,
-            limit=args.limit,
-        )
-        if not matches:
-            print("No merge queue items matched the requested filters.")
+        if args.command == "show":
+            print(format_merge_queue_item(queue.get(args.id)))
             return
-        if args.dry_run:
-            print(format_merge_queue_triage(matches, limit=len(matches)))
+
+        if args.command == "update":
+            item = queue.update_status(args.id, status=args.status, note=args.note)
+            queue.save(args.queue_file)
+            print(format_merge_queue_item(item))
             return
-        updated_payload = payload
-        for item in matches:
-            updated_payload = update_queue_item_status(
-                updated_payload,
-                item_id=item["id"],
-                status=args.status,
-                note=args.note,
+
+        if args.command == "bulk-update":
+            matches = queue.select(
+                status=args.match_status,
+                family_type=args.family_type,
+                confidence=args.confidence,
+                contains=args.contains,
+                exclude_contains=args.exclude_contains,
+                limit=args.limit,
             )
-        save_merge_queue(args.queue_file, updated_payload)
-        updated_matches = [get_queue_item(updated_payload, item["id"]) for item in matches]
-        print(format_merge_queue_triage(updated_matches, limit=len(updated_matches)))
-        return
+            if not matches:
+                print("No merge queue items matched the requested filters.")
+                return
+            if args.dry_run:
+                print(format_merge_queue_triage(matches, limit=len(matches)))
+                return
+            updated_matches = [
+                queue.update_status(item["id"], status=args.status, note=args.note)
+                for item in matches
+            ]
+            queue.save(args.queue_file)
+            print(format_merge_queue_triage(updated_matches, limit=len(updated_matches)))
+            return
 
 
 if __name__ == "__main__":
@@ -7,6 +7,9 @@
 """
 Dry-run approved Scholar merge queue items serially.
 
+All items share one CDP connection and profile page; each item re-validates
+the page before it is reviewed, and per-item timings are reported at the end.
+
 Live batch execution is intentionally disabled. Use
 `run_next_scholar_merge_queue_item.py --execute` for one-item-at-a-time
 mutation until stronger per-item revalidation is implemented.
@@ -17,16 +20,14 @@ from __future__ import annotations
 import argparse
 import asyncio
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.mutate_scholar_merge_family import ProfileSession
 from scripts.run_next_scholar_merge_queue_item import run_queue_item
-from scripts.scholar_merge_queue import (
-    default_merge_queue_path,
-    format_merge_queue_triage,
-    load_merge_queue,
-    select_approved_items,
-)
+from scripts.scholar_merge_queue import default_merge_queue_path, format_merge_queue_triage
+from scripts.scholar_merge_queue_store import open_merge_queue
 
 
 async def run_batch(
@@ -44,7 +45,8 @@ async def run_batch(
             "for one-item-at-a-time mutation."
         )
 
-    approved_items = select_approved_items(load_merge_queue(queue_file), limit=limit)
+    with open_merge_queue(queue_file) as queue:
+        approved_items = queue.approved_items(limit=limit)
     if not approved_items:
         raise RuntimeError("No approved merge queue items found.")
 
@@ -52,21 +54,42 @@ async def run_batch(
     print("")
 
     results = []
-    for index, item in enumerate(approved_items, start=1):
-        print(f"[{index}/{len(approved_items)}] {item.get('family_label', '')}")
-        result = await run_queue_item(
-            cdp_url=cdp_url,
-            queue_file=queue_file,
-            item_id=item["id"],
-            execute=execute,
-            artifact_dir=artifact_dir,
-            wait_seconds=wait_seconds,
-        )
-        results.append(result)
-        print("")
+    timings = []
+    async with ProfileSession(cdp_url) as session:
+        for index, item in enumerate(approved_items, start=1):
+            print(f"[{index}/{len(approved_items)}] {item.get('family_label', '')}")
+            start = time.perf_counter()
+            result = await run_queue_item(
+                cdp_url=cdp_url,
+                queue_file=queue_file,
+                item_id=item["id"],
+                execute=execute,
+                artifact_dir=artifact_dir,
+                wait_seconds=wait_seconds,
+                session=session,
+            )
+            elapsed = time.perf_counter() - start
+            results.append(result)
+            timings.append((item, elapsed))
+            print(f"[{index}/{len(approved_items)}] done in {elapsed:.2f}s")
+            print("")
+    print(format_batch_timings(timings, connect_count=session.connect_count, page_select_count=session.page_select_count))
     return results
 
 
+def format_batch_timings(timings: list[tuple[dict, float]], *, connect_count: int, page_select_count: int) -> str:
+    lines = ["Per-item timing:"]
+    for item, elapsed in timings:
+        lines.append(f"  {elapsed:7.2f}s  {item.get('id', '')}  {item.get('family_label', '')}")
+    total = sum(elapsed for _, elapsed in timings)
+    mean = total / len(timings) if timings else 0.0
+    lines.append(
+        f"Total {total:.2f}s over {len(timings)} item(s), mean {mean:.2f}s; "
+        f"{connect_count} CDP connection(s), {page_select_count} page selection(s)"
+    )
+    return "\n".join(lines)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--cdp-url", required=True, help="Chrome DevTools URL for an already-open logged-in browser.")
@@ -74,7 +97,7 @@ def main() -> None:
         "--queue-file",
         type=Path,
         default=default_merge_queue_path(),
-        help="Path to the merge queue JSON artifact.",
+        help="Path to the merge queue artifact (.json, or .db for the SQLite store).",
     )
     parser.add_argument(
         "--execute",
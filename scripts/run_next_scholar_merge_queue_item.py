@@ -18,17 +18,13 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from scripts.mutate_scholar_merge_family import build_confirmation_phrase, run as run_merge_family
+from scripts.mutate_scholar_merge_family import ProfileSession, build_confirmation_phrase, run as run_merge_family
 from scripts.scholar_merge_queue import (
     default_merge_queue_path,
     format_merge_queue_item,
-    load_merge_queue,
-    save_merge_queue,
-    select_approved_items,
-    update_queue_item_result,
-    update_queue_item_verification,
     summarize_verification_output,
 )
+from scripts.scholar_merge_queue_store import open_merge_queue
 
 
 def build_verification_filter(item: dict) -> str:
@@ -46,7 +42,8 @@ async def run(
     artifact_dir: Path | None,
     wait_seconds: int,
 ) -> None:
-    item = select_approved_items(load_merge_queue(queue_file), limit=1)
+    with open_merge_queue(queue_file) as queue:
+        item = queue.approved_items(limit=1)
     if not item:
         raise RuntimeError("No approved merge queue items found.")
     await run_queue_item(
@@ -66,7 +63,7 @@ def main() -> None:
         "--queue-file",
         type=Path,
         default=default_merge_queue_path(),
-        help="Path to the merge queue JSON artifact.",
+        help="Path to the merge queue artifact (.json, or .db for the SQLite store).",
     )
     parser.add_argument(
         "--execute",
@@ -104,78 +101,84 @@ async def run_queue_item(
     execute: bool,
     artifact_dir: Path | None,
     wait_seconds: int,
+    session: ProfileSession | None = None,
 ) -> dict:
-    payload = load_merge_queue(queue_file)
-    approved_items = select_approved_items(payload)
-    item = next((candidate for candidate in approved_items if candidate.get("id") == item_id), None)
-    if item is None:
-        raise RuntimeError(f"Approved merge queue item not found: {item_id}")
-    print(format_merge_queue_item(item))
-    print("")
-
-    targets = [f"{target['row_id']}::{target['title']}" for target in item.get("targets", [])]
-    confirm = build_confirmation_phrase([target["row_id"] for target in item.get("targets", [])]) if execute else None
-
+    queue = open_merge_queue(queue_file)
     try:
-        result = await run_merge_family(
-            cdp_url=cdp_url,
-            targets=targets,
-            confirm=confirm,
-            execute=execute,
-            list_visible_rows=False,
-            visible_row_limit=20,
-            visible_row_title_filter=None,
-            list_visible_actions=False,
-            artifact_dir=artifact_dir or (queue_file.parent),
-            wait_seconds=wait_seconds,
-        )
-        verification = None
-        if execute:
-            verification = await run_merge_family(
+        item = queue.get(item_id) if item_id in queue else None
+        if item is None or item.get("status") != "approved" or not item.get("approved_by_operator"):
+            raise RuntimeError(f"Approved merge queue item not found: {item_id}")
+        print(format_merge_queue_item(item))
+        print("")
+
+        targets = [f"{target['row_id']}::{target['title']}" for target in item.get("targets", [])]
+        confirm = build_confirmation_phrase([target["row_id"] for target in item.get("targets", [])]) if execute else None
+
+        try:
+            page = await session.profile_page() if session is not None else None
+            result = await run_merge_family(
                 cdp_url=cdp_url,
-                targets=[],
-                confirm=None,
-                execute=False,
-                list_visible_rows=True,
+                targets=targets,
+                confirm=confirm,
+                execute=execute,
+                list_visible_rows=False,
                 visible_row_limit=20,
-                visible_row_title_filter=build_verification_filter(item),
+                visible_row_title_filter=None,
                 list_visible_actions=False,
                 artifact_dir=artifact_dir or (queue_file.parent),
                 wait_seconds=wait_seconds,
+                page=page,
             )
-        updated = update_queue_item_result(
-            payload,
-            item_id=item["id"],
-            result={
-                "runner_mode": result.get("mode"),
-                "summary": result.get("summary"),
-                "outcome": result.get("outcome"),
-                "expected_confirmation": result.get("expected_confirmation"),
-            },
-            status="merged" if execute else "approved",
-            increment_execution_attempts=execute,
-        )
-        if execute and verification is not None:
-            updated = update_queue_item_verification(
-                updated,
-                item_id=item["id"],
-                verification=summarize_verification_output(verification.get("output", "")),
+            verification = None
+            if execute:
+                verification = await run_merge_family(
+                    cdp_url=cdp_url,
+                    targets=[],
+                    confirm=None,
+                    execute=False,
+                    list_visible_rows=True,
+                    visible_row_limit=20,
+                    visible_row_title_filter=build_verification_filter(item),
+                    list_visible_actions=False,
+                    artifact_dir=artifact_dir or (queue_file.parent),
+                    wait_seconds=wait_seconds,
+                    page=page,
+                )
+            queue.update_result(
+                item["id"],
+                result={
+                    "runner_mode": result.get("mode"),
+                    "summary": result.get("summary"),
+                    "outcome": result.get("outcome"),
+                    "expected_confirmation": result.get("expected_confirmation"),
+                },
+                status="merged" if execute else "approved",
+                increment_execution_attempts=execute,
             )
-    except Exception as exc:
-        updated = update_queue_item_result(
-            payload,
-            item_id=item["id"],
-            result={
-                "error": str(exc),
-                "traceback": traceback.format_exc(),
-            },
-            status="failed",
-            increment_execution_attempts=execute,
-        )
-        save_merge_queue(queue_file, updated)
-        raise
+            if execute and verification is not None:
+                queue.update_verification(
+                    item["id"],
+                    verification=summarize_verification_output(verification.get("output", "")),
+                )
+        except Exception as exc:
+            # Start from the stored state so a half-applied success update is not kept.
+            queue.close()
+            queue = open_merge_queue(queue_file)
+            queue.update_result(
+                item["id"],
+                result={
+                    "error": str(exc),
+                    "traceback": traceback.format_exc(),
+                },
+                status="failed",
+                increment_execution_attempts=execute,
+            )
+            queue.save(queue_file)
+            raise
 
-    save_merge_queue(queue_file, updated)
+        queue.save(queue_file)
+    finally:
+        queue.close()
     return {
         "item_id": item["id"],
         "family_label": item.get("family_label", ""),
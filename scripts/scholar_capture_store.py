@@ -0,0 +1,196 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Content-addressed storage for Scholar UI HTML captures.
+
+Each capture's HTML is stored once as a gzip blob keyed by its SHA-256 under
+`<artifact_dir>/blobs/`, and `<artifact_dir>/captures.jsonl` maps the capture
+name (e.g. `merge_pre_20260413_101500.html`) to its blob and capture metadata.
+Identical pre/post snapshots therefore cost one manifest line each.
+
+Readers use `open_capture` / `read_capture_text` with the capture's usual path:
+a plain file at that path wins, otherwise the manifest entry is used. Captures
+written to the committed `plans/artifacts/scholar_ui/` stay plain files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import TextIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.scholar_hygiene.config import LOCAL_SCHOLAR_UI_ARTIFACT_DIR, SCHOLAR_UI_ARTIFACT_DIR
+
+CAPTURE_MANIFEST_FILE_NAME = "captures.jsonl"
+CAPTURE_BLOB_DIR_NAME = "blobs"
+CAPTURE_COMPRESSLEVEL = 6
+
+_manifest_cache: dict[Path, tuple[tuple[int, int], dict[str, dict]]] = {}
+
+
+class CaptureStore:
+    def __init__(self, artifact_dir: Path) -> None:
+        self.artifact_dir = artifact_dir
+        self.manifest_path = artifact_dir / CAPTURE_MANIFEST_FILE_NAME
+        self.blob_dir = artifact_dir / CAPTURE_BLOB_DIR_NAME
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.gz"
+
+    def entries(self) -> dict[str, dict]:
+        """Latest manifest entry per capture name, re-read only when the manifest changes."""
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return {}
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = _manifest_cache.get(self.manifest_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        entries = {}
+        for line in self.manifest_path.read_text().splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry["name"]] = entry
+        _manifest_cache[self.manifest_path] = (key, entries)
+        return entries
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries()
+
+    def put(self, name: str, text: str, metadata: dict | None = None, *, stored_at: float | None = None) -> dict:
+        """Store `text` as capture `name`; the blob is written only if it is new."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self.blob_path(digest)
+        deduplicated = blob_path.exists()
+        if not deduplicated:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(gzip.compress(data, compresslevel=CAPTURE_COMPRESSLEVEL, mtime=0))
+            os.replace(tmp_path, blob_path)
+        entry = {
+            "name": name,
+            "sha256": digest,
+            "size": len(data),
+            "stored_at": time.time() if stored_at is None else stored_at,
+            "metadata": metadata or {},
+        }
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        with self.manifest_path.open("a") as handle:
+            handle.write(json.dumps(entry, sort_keys=True) + "\n")
+        return {**entry, "blob_path": blob_path, "deduplicated": deduplicated}
+
+    def open_text(self, name: str) -> TextIO:
+        entry = self.entries()[name]
+        return io.TextIOWrapper(gzip.open(self.blob_path(entry["sha256"]), "rb"), encoding="utf-8")
+
+
+def is_committed_artifact_dir(artifact_dir: Path) -> bool:
+    return artifact_dir.resolve().is_relative_to(SCHOLAR_UI_ARTIFACT_DIR.resolve())
+
+
+def save_capture(artifact_dir: Path, name: str, html: str, metadata: dict) -> dict:
+    """Save one HTML capture and say where it went.
+
+    In the committed artifact dir the capture is a plain `name` file plus its
+    `_capture.json` sidecar, reviewable in a diff. Anywhere else it goes to the
+    store, and the manifest name and blob are returned instead of a file path.
+    """
+    if is_committed_artifact_dir(artifact_dir):
+        html_path = artifact_dir / name
+        metadata_path = html_path.with_name(f"{html_path.stem}_capture.json")
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        html_path.write_text(html)
+        metadata_path.write_text(json.dumps(metadata, indent=2, sort_keys=True))
+        return {"html_path": html_path, "metadata_path": metadata_path}
+    store = CaptureStore(artifact_dir)
+    stored = store.put(name, html, metadata)
+    return {
+        "capture_name": name,
+        "capture_manifest": store.manifest_path,
+        "blob_path": stored["blob_path"],
+        "deduplicated": stored["deduplicated"],
+    }
+
+
+def open_capture(html_path: Path) -> TextIO:
+    if html_path.exists():
+        return html_path.open()
+    store = CaptureStore(html_path.parent)
+    if html_path.name in store:
+        return store.open_text(html_path.name)
+    raise FileNotFoundError(html_path)
+
+
+def read_capture_text(html_path: Path) -> str:
+    with open_capture(html_path) as handle:
+        return handle.read()
+
+
+def read_capture_metadata(html_path: Path) -> dict:
+    """The `_capture.json` sidecar of a plain-file capture, else the manifest metadata."""
+    metadata_path = html_path.with_name(f"{html_path.stem}_capture.json")
+    if metadata_path.exists():
+        try:
+            return json.loads(metadata_path.read_text())
+        except json.JSONDecodeError:
+            return {}
+    return CaptureStore(html_path.parent).entries().get(html_path.name, {}).get("metadata", {})
+
+
+def capture_mtime(html_path: Path) -> float:
+    if html_path.exists():
+        return html_path.stat().st_mtime
+    return CaptureStore(html_path.parent).entries()[html_path.name]["stored_at"]
+
+
+def capture_html_paths(artifact_dir: Path) -> list[Path]:
+    names = {path.name for path in artifact_dir.glob("*.html")}
+    names.update(name for name in CaptureStore(artifact_dir).entries() if name.endswith(".html"))
+    return [artifact_dir / name for name in sorted(names)]
+
+
+def pack_artifact_dir(artifact_dir: Path) -> dict:
+    """Move plain `*.html` captures (and their `_capture.json` sidecars) into the store."""
+    store = CaptureStore(artifact_dir)
+    packed = deduplicated = bytes_removed = 0
+    for html_path in sorted(artifact_dir.glob("*.html")):
+        metadata_path = html_path.with_name(f"{html_path.stem}_capture.json")
+        # Keep the capture time so parse-all's staleness check still holds.
+        entry = store.put(
+            html_path.name,
+            html_path.read_text(),
+            read_capture_metadata(html_path),
+            stored_at=html_path.stat().st_mtime,
+        )
+        deduplicated += entry["deduplicated"]
+        for path in (html_path, metadata_path):
+            if path.exists():
+                bytes_removed += path.stat().st_size
+                path.unlink()
+        packed += 1
+    return {"packed": packed, "deduplicated": deduplicated, "plain_bytes_removed": bytes_removed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    pack = subparsers.add_parser("pack", help="Move existing plain HTML captures into the content-addressed store")
+    pack.add_argument("--artifact-dir", type=Path, default=LOCAL_SCHOLAR_UI_ARTIFACT_DIR)
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        print(json.dumps(pack_artifact_dir(args.artifact_dir), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,7 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from scripts.scholar_hygiene.workflow import collect_issues, review_issues, run_refresh, verify_issues
+from scripts.scholar_hygiene.workflow import collect_issues, review_issues, run_migrate, run_refresh, verify_issues
 from scripts.scholar_hygiene.ui_artifacts import (
     format_add_articles_candidates,
     load_add_articles_candidates,
@@ -30,7 +30,10 @@ def build_parser() -> argparse.ArgumentParser:
     refresh.add_argument("--skip-profile", action="store_true", help="Do not refresh your own Scholar profile")
     refresh.add_argument("--coauthors", action="store_true", help="Refresh cached coauthor profiles")
 
-    subparsers.add_parser("detect", help="Detect Scholar hygiene issues and write JSON/CSV artifacts")
+    subparsers.add_parser("migrate", help="Add typed columns to the export DB and backfill them")
+
+    detect = subparsers.add_parser("detect", help="Detect Scholar hygiene issues and write JSON/CSV artifacts")
+    detect.add_argument("--full", action="store_true", help="Ignore the saved detection state and re-score everything")
 
     review = subparsers.add_parser("review", help="Print a ranked review queue")
     review.add_argument("--type", choices=[
@@ -53,7 +56,8 @@ def build_parser() -> argparse.ArgumentParser:
     )
     add_articles.add_argument("--limit", type=int, default=20)
 
-    subparsers.add_parser("verify", help="Re-run detection and compare with the previous issue snapshot")
+    verify = subparsers.add_parser("verify", help="Re-run detection and compare with the previous issue snapshot")
+    verify.add_argument("--full", action="store_true", help="Ignore the saved detection state and re-score everything")
     return parser
 
 
@@ -69,8 +73,12 @@ def main() -> None:
         print(json.dumps(summary, indent=2, sort_keys=True))
         return
 
+    if args.command == "migrate":
+        print(json.dumps(run_migrate(), indent=2, sort_keys=True))
+        return
+
     if args.command == "detect":
-        issues = collect_issues()
+        issues = collect_issues(full=args.full)
         print(json.dumps({"issue_count": len(issues)}, indent=2, sort_keys=True))
         return
 
@@ -95,7 +103,7 @@ def main() -> None:
             return
 
     if args.command == "verify":
-        print(json.dumps(verify_issues(), indent=2, sort_keys=True))
+        print(json.dumps(verify_issues(full=args.full), indent=2, sort_keys=True))
         return
 
 
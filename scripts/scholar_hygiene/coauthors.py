@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import json
-import random
 import sqlite3
-import time
 from datetime import datetime, timedelta
 
 from .config import get_scholar_user_id
+from .ingest import ScholarCaptchaError, is_blocked_fetch_error
+from .scheduler import FetchScheduler, FetchUnit, interval_rate
 
 CACHE_DAYS = 30
+# Filled publication details rarely change; citation counts come from the fresh profile listing.
+PUBLICATION_CACHE_DAYS = 180
+PUBLICATION_CACHE_MAX_ENTRIES = 100_000
+# The scholarly client is shared module state and not thread-safe.
+COAUTHOR_FETCH_WORKERS = 1
+COAUTHOR_PROFILE_SLEEP_RANGE = (5.0, 8.0)
+COAUTHOR_PUBLICATION_SLEEP_RANGE = (1.0, 2.0)
 
 
 def _scholarly():
@@ -17,6 +24,11 @@ def _scholarly():
     return scholarly
 
 
+def is_fresh(date_scraped: str, ttl_days: int) -> bool:
+    scraped_date = datetime.strptime(date_scraped, "%Y-%m-%d")
+    return (datetime.today() - scraped_date) < timedelta(days=ttl_days)
+
+
 def is_coauthor_cached(conn: sqlite3.Connection, scholar_id: str) -> bool:
     cur = conn.cursor()
     cur.execute(
@@ -26,70 +38,204 @@ def is_coauthor_cached(conn: sqlite3.Connection, scholar_id: str) -> bool:
     row = cur.fetchone()
     if not row:
         return False
-    scraped_date = datetime.strptime(row[0], "%Y-%m-%d")
-    return (datetime.today() - scraped_date) < timedelta(days=CACHE_DAYS)
+    return is_fresh(row[0], CACHE_DAYS)
+
+
+def load_publication_fills(
+    conn: sqlite3.Connection,
+    scholar_id: str,
+    publications: list[dict],
+    ttl_days: int = PUBLICATION_CACHE_DAYS,
+) -> dict[str, dict]:
+    """Cached fills for `publications` that are younger than `ttl_days`, by author_pub_id.
+
+    Each hit is merged with its fresh listing entry and marked as used for LRU eviction.
+    """
+    stubs = {publication["author_pub_id"]: publication for publication in publications if publication.get("author_pub_id")}
+    if not stubs:
+        return {}
+    placeholders = ",".join("?" for _ in stubs)
+    rows = conn.execute(
+        f"""
+        SELECT author_pub_id, source_json, date_scraped FROM coauthor_publication_fills
+        WHERE scholar_id = ? AND author_pub_id IN ({placeholders})
+        """,
+        (scholar_id, *stubs),
+    ).fetchall()
+    fills = {}
+    for author_pub_id, source_json, date_scraped in rows:
+        if is_fresh(date_scraped, ttl_days):
+            fills[author_pub_id] = merge_publication_fill(stubs[author_pub_id], json.loads(source_json))
+    if fills:
+        placeholders = ",".join("?" for _ in fills)
+        conn.execute(
+            f"""
+            UPDATE coauthor_publication_fills SET last_used = ?
+            WHERE scholar_id = ? AND author_pub_id IN ({placeholders})
+            """,
+            (datetime.now().isoformat(timespec="seconds"), scholar_id, *fills),
+        )
+    return fills
 
 
-def fetch_my_coauthors() -> list[dict]:
-    scholarly = _scholarly()
-    author = scholarly.search_author_id(get_scholar_user_id())
-    author = scholarly.fill(author, sections=["coauthors"])
-    return author.get("coauthors", [])
+def merge_publication_fill(stub: dict, filled: dict) -> dict:
+    # The listing entry is current; only the filled bib details come from the cache.
+    return {**filled, **{key: value for key, value in stub.items() if key not in ("bib", "filled")}}
 
 
-def fetch_and_cache_coauthor_profile(
-    conn: sqlite3.Connection, coauthor_stub: dict, today: str
-) -> dict | None:
-    scholar_id = coauthor_stub.get("scholar_id", "")
-    if not scholar_id:
-        return None
+def cache_publication_fill(conn: sqlite3.Connection, scholar_id: str, publication: dict, today: str) -> None:
+    author_pub_id = publication.get("author_pub_id")
+    if not author_pub_id:
+        return
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO coauthor_publication_fills
+        (scholar_id, author_pub_id, source_json, date_scraped, last_used)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (scholar_id, author_pub_id, json.dumps(publication), today, datetime.now().isoformat(timespec="seconds")),
+    )
 
-    cur = conn.cursor()
-    if is_coauthor_cached(conn, scholar_id):
-        cur.execute(
-            "SELECT source_json FROM coauthors WHERE scholar_id = ?",
-            (scholar_id,),
+
+def evict_publication_fills(
+    conn: sqlite3.Connection,
+    ttl_days: int = PUBLICATION_CACHE_DAYS,
+    max_entries: int = PUBLICATION_CACHE_MAX_ENTRIES,
+) -> int:
+    """Drop expired fills, then the least recently used ones beyond `max_entries`."""
+    cutoff = (datetime.today() - timedelta(days=ttl_days)).strftime("%Y-%m-%d")
+    evicted = conn.execute("DELETE FROM coauthor_publication_fills WHERE date_scraped <= ?", (cutoff,)).rowcount
+    evicted += conn.execute(
+        """
+        DELETE FROM coauthor_publication_fills WHERE rowid IN (
+            SELECT rowid FROM coauthor_publication_fills
+            ORDER BY last_used DESC, rowid DESC
+            LIMIT -1 OFFSET ?
         )
-        row = cur.fetchone()
-        if row:
-            return json.loads(row[0])
+        """,
+        (max_entries,),
+    ).rowcount
+    conn.commit()
+    return evicted
+
 
+def fetch_my_coauthors() -> list[dict]:
     scholarly = _scholarly()
-    try:
-        author = scholarly.search_author_id(scholar_id)
-        author = scholarly.fill(author, sections=["publications"])
-        filled_pubs = []
-        for pub in author.get("publications", []):
-            try:
-                filled_pubs.append(scholarly.fill(pub))
-                time.sleep(random.uniform(1, 2))
-            except Exception:
-                filled_pubs.append(pub)
-        author["publications"] = filled_pubs
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO coauthors (scholar_id, source_json, date_scraped)
-            VALUES (?, ?, ?)
-            """,
-            (scholar_id, json.dumps(author), today),
-        )
-        conn.commit()
-        return author
-    except Exception:
-        return None
+    author = scholarly.search_author_id(get_scholar_user_id())
+    author = scholarly.fill(author, sections=["coauthors"])
+    return author.get("coauthors", [])
 
 
-def refresh_coauthor_cache(conn: sqlite3.Connection, today: str) -> dict:
+def cache_coauthor_profile(conn: sqlite3.Connection, scholar_id: str, author: dict, today: str) -> None:
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO coauthors (scholar_id, source_json, date_scraped)
+        VALUES (?, ?, ?)
+        """,
+        (scholar_id, json.dumps(author), today),
+    )
+    conn.commit()
+
+
+def refresh_coauthor_cache(
+    conn: sqlite3.Connection,
+    today: str,
+    workers: int = COAUTHOR_FETCH_WORKERS,
+    publication_ttl_days: int = PUBLICATION_CACHE_DAYS,
+    max_cached_publications: int = PUBLICATION_CACHE_MAX_ENTRIES,
+) -> dict:
+    """Fetch stale coauthor profiles, then fill their new or stale publications.
+
+    Both phases go through a `FetchScheduler`, paced per host like the old
+    serial sleeps (5-8 s per profile, 1-2 s per publication). Publications
+    with a fill younger than `publication_ttl_days` in
+    `coauthor_publication_fills` are not fetched again, and every new fill
+    is cached as soon as it lands, so an interrupted refresh resumes where
+    it stopped. A profile is cached once its last publication is filled.
+    """
+    scholarly = _scholarly()
     coauthors = fetch_my_coauthors()
-    refreshed = 0
+    stale = []
     for stub in coauthors:
         scholar_id = stub.get("scholar_id", "")
-        if not scholar_id:
+        if scholar_id and scholar_id not in stale and not is_coauthor_cached(conn, scholar_id):
+            stale.append(scholar_id)
+
+    def fetch_profile(unit: FetchUnit) -> dict:
+        try:
+            return scholarly.fill(scholarly.search_author_id(unit.payload), sections=["publications"])
+        except Exception as exc:
+            if is_blocked_fetch_error(exc):
+                raise ScholarCaptchaError(str(exc)) from exc
+            raise
+
+    rate, jitter = interval_rate(COAUTHOR_PROFILE_SLEEP_RANGE)
+    profiles = FetchScheduler(
+        workers=workers,
+        rate_per_host=rate,
+        jitter=jitter,
+        retry_on=(ScholarCaptchaError,),
+    ).run([FetchUnit(key=scholar_id, payload=scholar_id) for scholar_id in stale], fetch_profile)
+
+    remaining: dict[str, int] = {}
+    publication_units = []
+    reused = 0
+    for scholar_id in stale:
+        author = profiles.results.get(scholar_id)
+        if author is None:
             continue
-        cached = is_coauthor_cached(conn, scholar_id)
-        profile = fetch_and_cache_coauthor_profile(conn, stub, today)
-        if profile and not cached:
-            refreshed += 1
-            time.sleep(random.uniform(5, 8))
-    return {"coauthor_count": len(coauthors), "refreshed_profiles": refreshed}
-
+        publications = author.get("publications", [])
+        cached_fills = load_publication_fills(conn, scholar_id, publications, publication_ttl_days)
+        reused += len(cached_fills)
+        remaining[scholar_id] = 0
+        for position, publication in enumerate(publications):
+            if publication.get("author_pub_id") in cached_fills:
+                publications[position] = cached_fills[publication["author_pub_id"]]
+                continue
+            remaining[scholar_id] += 1
+            publication_key = publication.get("author_pub_id") or position
+            publication_units.append(
+                FetchUnit(key=f"{scholar_id}:{publication_key}", payload=(scholar_id, position, publication))
+            )
+        if not remaining[scholar_id]:
+            cache_coauthor_profile(conn, scholar_id, author, today)
+
+    def fill_publication(unit: FetchUnit) -> dict:
+        try:
+            return scholarly.fill(unit.payload[2])
+        except Exception as exc:
+            if is_blocked_fetch_error(exc):
+                raise ScholarCaptchaError(str(exc)) from exc
+            raise
+
+    def store(unit: FetchUnit, publication: dict, filled: bool = True) -> None:
+        scholar_id, position, _stub = unit.payload
+        if filled:
+            cache_publication_fill(conn, scholar_id, publication, today)
+        author = profiles.results[scholar_id]
+        author["publications"][position] = publication
+        remaining[scholar_id] -= 1
+        if remaining[scholar_id] == 0:
+            cache_coauthor_profile(conn, scholar_id, author, today)
+        else:
+            conn.commit()
+
+    rate, jitter = interval_rate(COAUTHOR_PUBLICATION_SLEEP_RANGE)
+    report = FetchScheduler(
+        workers=workers,
+        rate_per_host=rate,
+        jitter=jitter,
+        retry_on=(ScholarCaptchaError,),
+    ).run(publication_units, fill_publication, store)
+    for unit in publication_units:
+        if unit.key in report.failures:
+            # Keep the unfilled listing entry, as a failed fill always has; it is not cached.
+            store(unit, unit.payload[2], filled=False)
+    evicted = evict_publication_fills(conn, publication_ttl_days, max_cached_publications)
+    return {
+        "coauthor_count": len(coauthors),
+        "refreshed_profiles": len(remaining),
+        "filled_publications": len(report.results),
+        "reused_publication_fills": reused,
+        "evicted_publication_fills": evicted,
+    }
@@ -11,9 +11,11 @@ PAPERS_BIB_FILE = REPO_ROOT / "_bibliography" / "papers.bib"
 ISSUES_JSON_FILE = REPO_ROOT / "_bibliography" / "scholar_issues.json"
 ISSUES_CSV_FILE = REPO_ROOT / "_bibliography" / "scholar_issues.csv"
 STATE_JSON_FILE = REPO_ROOT / "_bibliography" / "scholar_state.json"
+DETECTION_STATE_JSON_FILE = REPO_ROOT / "_local" / "scholar_detection_state.json"
 DISMISSALS_JSON_FILE = REPO_ROOT / "_bibliography" / "scholar_dismissals.json"
 SCHOLAR_UI_ARTIFACT_DIR = REPO_ROOT / "plans" / "artifacts" / "scholar_ui"
 LOCAL_SCHOLAR_UI_ARTIFACT_DIR = REPO_ROOT / "_local" / "scholar_ui"
+ADD_ARTICLES_CACHE_JSON_FILE = LOCAL_SCHOLAR_UI_ARTIFACT_DIR / "add_articles_cache.json"
 
 
 def get_scholar_user_id() -> str:
@@ -4,14 +4,61 @@ import json
 import sqlite3
 from pathlib import Path
 
+from typing import Iterator
+
 from .config import DB_FILE
+from .records import CoauthorPublication, coauthor_publication_record
+
+IDENTIFIER_BIB_KEYS = ("doi", "eprint", "arxiv")
+
+# `refresh_profile` steps in order; a run is resumed until it reaches the last.
+INGEST_STEPS = ("started", "listed", "filled", "cleaned", "done")
+
+# Stored as the DB's `PRAGMA user_version`. Bump it whenever what gets
+# materialized below changes; `migrate_database` then rebuilds every row once.
+NORMALIZED_LAYOUT_VERSION = 1
 
+# Typed columns materialized from the JSON blobs by `sync_normalized_columns`.
+# `normalized` stays 0 for rows written by code that only knows the JSON layout.
+# `year` is TEXT because Scholar's `pub_year` is a string; readers get it back as-is.
+PUBLICATION_COLUMNS = {
+    "bib_title": "TEXT",
+    "author": "TEXT",
+    "venue": "TEXT",
+    "year": "TEXT",
+    "publisher": "TEXT",
+    "num_citations": "INTEGER",
+    "pub_url": "TEXT",
+    "url": "TEXT",
+    "doi": "TEXT",
+    "eprint": "TEXT",
+    "arxiv": "TEXT",
+    "normalized": "INTEGER NOT NULL DEFAULT 0",
+}
+VERSION_COLUMNS = {
+    "title": "TEXT",
+    "year": "TEXT",
+    "venue": "TEXT",
+    "normalized": "INTEGER NOT NULL DEFAULT 0",
+}
+COAUTHOR_COLUMNS = {
+    "name": "TEXT",
+    "normalized": "INTEGER NOT NULL DEFAULT 0",
+}
 
-def connect(db_file: Path = DB_FILE) -> sqlite3.Connection:
+
+def connect(db_file: Path = DB_FILE, *, read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        return sqlite3.connect(f"{db_file.resolve().as_uri()}?mode=ro", uri=True)
     return sqlite3.connect(str(db_file))
 
 
 def ensure_base_tables(conn: sqlite3.Connection) -> None:
+    create_base_tables(conn)
+    conn.commit()
+
+
+def create_base_tables(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS publications (
@@ -51,16 +98,302 @@ def ensure_base_tables(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS coauthor_publication_fills (
+            scholar_id TEXT NOT NULL,
+            author_pub_id TEXT NOT NULL,
+            source_json TEXT NOT NULL,
+            date_scraped TEXT NOT NULL,
+            last_used TEXT NOT NULL,
+            PRIMARY KEY (scholar_id, author_pub_id)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_coauthor_publication_fills_used ON coauthor_publication_fills(last_used)"
+    )
+    ensure_ingest_journal_tables(conn)
+
+
+def migrate_database(conn: sqlite3.Connection) -> None:
+    """Add the typed columns and child tables, then backfill rows written since.
+
+    Only write paths (`refresh`, `migrate`) call this; readers fall back to the
+    JSON blobs for rows that have not been normalized yet.
+    """
+    create_base_tables(conn)
+    ensure_normalized_tables(conn)
+    sync_normalized_columns(conn)
+    conn.commit()
+
+
+def table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    return row is not None
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def ensure_normalized_tables(conn: sqlite3.Connection) -> None:
+    for table, columns in (
+        ("publications", PUBLICATION_COLUMNS),
+        ("versions", VERSION_COLUMNS),
+        ("coauthors", COAUTHOR_COLUMNS),
+    ):
+        existing = table_columns(conn, table)
+        for column, column_type in columns.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS publication_clusters (
+            publication_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            cluster_id TEXT NOT NULL,
+            PRIMARY KEY (publication_id, position),
+            FOREIGN KEY (publication_id) REFERENCES publications(id)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_publication_clusters_cluster ON publication_clusters(cluster_id)"
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS coauthor_publications (
+            scholar_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            title TEXT,
+            author TEXT,
+            year TEXT,
+            num_citations INTEGER,
+            pub_url TEXT,
+            url TEXT,
+            doi TEXT,
+            eprint TEXT,
+            arxiv TEXT,
+            PRIMARY KEY (scholar_id, position),
+            FOREIGN KEY (scholar_id) REFERENCES coauthors(scholar_id)
+        )
+        """
+    )
+    (layout_version,) = conn.execute("PRAGMA user_version").fetchone()
+    if layout_version != NORMALIZED_LAYOUT_VERSION:
+        for table in ("publications", "versions", "coauthors"):
+            conn.execute(f"UPDATE {table} SET normalized = 0")
+        conn.execute(f"PRAGMA user_version = {NORMALIZED_LAYOUT_VERSION}")
+
+
+def publication_columns(data: dict, title: str | None) -> dict:
+    bib = data.get("bib", {})
+    return {
+        "bib_title": bib.get("title", title or ""),
+        "author": bib.get("author", ""),
+        "venue": bib.get("conference")
+        or bib.get("journal")
+        or bib.get("citation")
+        or bib.get("venue", ""),
+        "year": bib.get("pub_year", ""),
+        "publisher": bib.get("publisher", ""),
+        "num_citations": data.get("num_citations", 0),
+        "pub_url": data.get("pub_url") or bib.get("pub_url", ""),
+        "url": data.get("url") or bib.get("url"),
+        **{key: bib.get(key) for key in IDENTIFIER_BIB_KEYS},
+    }
+
+
+def version_columns(source: dict) -> dict:
+    bib = source.get("bib", {})
+    return {
+        "title": bib.get("title"),
+        "year": bib.get("pub_year"),
+        "venue": bib.get("conference") or bib.get("journal") or bib.get("citation") or bib.get("venue"),
+    }
+
+
+def coauthor_publication_columns(publication: dict) -> dict:
+    bib = publication.get("bib", {})
+    return {
+        "title": bib.get("title"),
+        "author": bib.get("author"),
+        "year": bib.get("pub_year"),
+        "num_citations": publication.get("num_citations"),
+        "pub_url": publication.get("pub_url") or bib.get("pub_url"),
+        "url": publication.get("url") or bib.get("url"),
+        **{key: bib.get(key) for key in IDENTIFIER_BIB_KEYS},
+    }
+
+
+def sync_normalized_columns(conn: sqlite3.Connection) -> None:
+    """Materialize typed columns for rows written since the last sync."""
+    rows = conn.execute("SELECT id, title, full_json FROM publications WHERE normalized = 0").fetchall()
+    for pub_id, title, full_json in rows:
+        data = json.loads(full_json) if full_json else {}
+        columns = publication_columns(data, title)
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        conn.execute(
+            f"UPDATE publications SET {assignments}, normalized = 1 WHERE id = ?",
+            (*columns.values(), pub_id),
+        )
+        conn.execute("DELETE FROM publication_clusters WHERE publication_id = ?", (pub_id,))
+        conn.executemany(
+            "INSERT INTO publication_clusters (publication_id, position, cluster_id) VALUES (?, ?, ?)",
+            [(pub_id, position, cluster_id) for position, cluster_id in enumerate(data.get("cites_id") or [])],
+        )
+    conn.execute("DELETE FROM publication_clusters WHERE publication_id NOT IN (SELECT id FROM publications)")
+
+    rows = conn.execute("SELECT id, source_json FROM versions WHERE normalized = 0").fetchall()
+    for version_id, source_json in rows:
+        columns = version_columns(json.loads(source_json) if source_json else {})
+        conn.execute(
+            "UPDATE versions SET title = ?, year = ?, venue = ?, normalized = 1 WHERE id = ?",
+            (*columns.values(), version_id),
+        )
+
+    rows = conn.execute("SELECT scholar_id, source_json FROM coauthors WHERE normalized = 0").fetchall()
+    for scholar_id, source_json in rows:
+        payload = json.loads(source_json)
+        conn.execute(
+            "UPDATE coauthors SET name = ?, normalized = 1 WHERE scholar_id = ?",
+            (payload.get("name"), scholar_id),
+        )
+        conn.execute("DELETE FROM coauthor_publications WHERE scholar_id = ?", (scholar_id,))
+        for position, publication in enumerate(payload.get("publications", [])):
+            columns = coauthor_publication_columns(publication)
+            conn.execute(
+                f"""
+                INSERT INTO coauthor_publications (scholar_id, position, {", ".join(columns)})
+                VALUES (?, ?, {", ".join("?" for _ in columns)})
+                """,
+                (scholar_id, position, *columns.values()),
+            )
+    conn.execute("DELETE FROM coauthor_publications WHERE scholar_id NOT IN (SELECT scholar_id FROM coauthors)")
+
+
+def ensure_ingest_journal_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            scholar_user_id TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            step TEXT NOT NULL,
+            profile_json TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_run_units (
+            run_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            unit_key TEXT NOT NULL,
+            PRIMARY KEY (run_id, kind, unit_key),
+            FOREIGN KEY (run_id) REFERENCES ingest_runs(id)
+        )
+        """
+    )
+
+
+def open_ingest_run(
+    conn: sqlite3.Connection, scholar_user_id: str, today: str, resume_since: str | None = None
+) -> dict:
+    """The latest unfinished run started on or after `resume_since`, or a new one."""
+    row = conn.execute(
+        """
+        SELECT id, started_at, step, profile_json FROM ingest_runs
+        WHERE scholar_user_id = ? AND step != ? AND started_at >= ?
+        ORDER BY id DESC LIMIT 1
+        """,
+        (scholar_user_id, INGEST_STEPS[-1], resume_since or ""),
+    ).fetchone()
+    if row:
+        run_id, started_at, step, profile_json = row
+        return {
+            "id": run_id,
+            "started_at": started_at,
+            "step": step,
+            "profile": json.loads(profile_json) if profile_json else None,
+            "resumed": True,
+        }
+    cur = conn.execute(
+        "INSERT INTO ingest_runs (scholar_user_id, started_at, updated_at, step) VALUES (?, ?, ?, ?)",
+        (scholar_user_id, today, today, INGEST_STEPS[0]),
+    )
+    conn.commit()
+    return {"id": cur.lastrowid, "started_at": today, "step": INGEST_STEPS[0], "profile": None, "resumed": False}
+
+
+def advance_ingest_run(
+    conn: sqlite3.Connection, run: dict, step: str, today: str, profile: dict | None = None
+) -> None:
+    if profile is not None:
+        conn.execute("UPDATE ingest_runs SET profile_json = ? WHERE id = ?", (json.dumps(profile), run["id"]))
+        run["profile"] = profile
+    conn.execute("UPDATE ingest_runs SET step = ?, updated_at = ? WHERE id = ?", (step, today, run["id"]))
     conn.commit()
+    run["step"] = step
 
 
-def load_publications(conn: sqlite3.Connection) -> list[dict]:
+def ingest_step_done(run: dict, step: str) -> bool:
+    return INGEST_STEPS.index(run["step"]) >= INGEST_STEPS.index(step)
+
+
+def mark_ingest_unit(conn: sqlite3.Connection, run_id: int, kind: str, unit_key: str) -> None:
+    # Committed together with the unit's own rows by the caller.
+    conn.execute(
+        "INSERT OR IGNORE INTO ingest_run_units (run_id, kind, unit_key) VALUES (?, ?, ?)",
+        (run_id, kind, unit_key),
+    )
+
+
+def is_normalized_layout(conn: sqlite3.Connection, table: str = "publications") -> bool:
+    return "normalized" in table_columns(conn, table)
+
+
+def publication_from_columns(pub_id: str, columns: dict, cites_id: list[str]) -> dict:
+    # `full_json` only carries the identifier fields detectors look at.
+    identifiers = {key: columns[key] for key in IDENTIFIER_BIB_KEYS if columns.get(key)}
+    return {
+        "id": pub_id,
+        "title": columns["bib_title"],
+        "author": columns["author"],
+        "venue": columns["venue"],
+        "year": columns["year"],
+        "publisher": columns["publisher"],
+        "num_citations": columns["num_citations"],
+        "pub_url": columns["pub_url"],
+        "cites_id": cites_id,
+        "full_json": {"bib": identifiers, "pub_url": columns["pub_url"], "url": columns["url"]},
+    }
+
+
+def load_publications(conn: sqlite3.Connection, include_json: bool = True) -> list[dict]:
+    """Profile publications ordered by title.
+
+    With `include_json=False` rows are read from the typed columns and
+    `full_json` is reduced to the identifier fields, skipping the blob parse
+    for every row that has already been normalized.
+    """
+    if not table_exists(conn, "publications"):
+        return []
+    if not include_json and is_normalized_layout(conn):
+        return load_publication_columns(conn)
     cur = conn.cursor()
     cur.execute("SELECT id, title, full_json FROM publications ORDER BY title")
     rows = cur.fetchall()
     publications = []
     for pub_id, title, full_json in rows:
         data = json.loads(full_json)
+        if not include_json:
+            publications.append(
+                publication_from_columns(pub_id, publication_columns(data, title), data.get("cites_id", []))
+            )
+            continue
         bib = data.get("bib", {})
         publications.append(
             {
@@ -82,42 +415,209 @@ def load_publications(conn: sqlite3.Connection) -> list[dict]:
     return publications
 
 
+def load_publication_columns(conn: sqlite3.Connection) -> list[dict]:
+    column_names = [column for column in PUBLICATION_COLUMNS if column != "normalized"]
+    clusters: dict[str, list[str]] = {}
+    for pub_id, cluster_id in conn.execute(
+        "SELECT publication_id, cluster_id FROM publication_clusters ORDER BY publication_id, position"
+    ):
+        clusters.setdefault(pub_id, []).append(cluster_id)
+
+    publications = []
+    for pub_id, title, normalized, full_json, *values in conn.execute(
+        f"""
+        SELECT id, title, normalized, CASE WHEN normalized = 1 THEN NULL ELSE full_json END,
+               {", ".join(column_names)}
+        FROM publications ORDER BY title
+        """
+    ):
+        if normalized:
+            publications.append(publication_from_columns(pub_id, dict(zip(column_names, values)), clusters.get(pub_id, [])))
+        else:
+            data = json.loads(full_json)
+            publications.append(
+                publication_from_columns(pub_id, publication_columns(data, title), data.get("cites_id", []))
+            )
+    return publications
+
+
+def version_from_columns(cluster_id: str, pub_url: str, columns: dict) -> dict:
+    bib = {
+        key: columns[column]
+        for key, column in (("title", "title"), ("pub_year", "year"), ("venue", "venue"))
+        if columns[column] is not None
+    }
+    return {"cluster_id": cluster_id, "pub_url": pub_url, "source_json": {"bib": bib} if bib else {}}
+
+
 def load_versions_for_publication_ids(
-    conn: sqlite3.Connection, publication_ids: set[str] | None = None
+    conn: sqlite3.Connection, publication_ids: set[str] | None = None, include_json: bool = True
 ) -> dict[str, list[dict]]:
+    if not table_exists(conn, "versions"):
+        return {}
+    use_columns = not include_json and is_normalized_layout(conn, "versions")
+    selected = (
+        "publication_id, cluster_id, pub_url, normalized, "
+        "CASE WHEN normalized = 1 THEN NULL ELSE source_json END, title, year, venue"
+        if use_columns
+        else "publication_id, cluster_id, pub_url, 1, source_json, NULL, NULL, NULL"
+    )
     cur = conn.cursor()
     if publication_ids:
         placeholders = ",".join("?" for _ in publication_ids)
         cur.execute(
             f"""
-            SELECT publication_id, cluster_id, pub_url, source_json
+            SELECT {selected}
             FROM versions
             WHERE publication_id IN ({placeholders})
             """,
             tuple(sorted(publication_ids)),
         )
     else:
-        cur.execute("SELECT publication_id, cluster_id, pub_url, source_json FROM versions")
+        cur.execute(f"SELECT {selected} FROM versions")
     grouped: dict[str, list[dict]] = {}
-    for publication_id, cluster_id, pub_url, source_json in cur.fetchall():
-        grouped.setdefault(publication_id, []).append(
-            {
+    for publication_id, cluster_id, pub_url, normalized, source_json, title, year, venue in cur.fetchall():
+        if use_columns and normalized:
+            version = version_from_columns(cluster_id, pub_url, {"title": title, "year": year, "venue": venue})
+        elif not include_json:
+            source = json.loads(source_json) if source_json else {}
+            version = version_from_columns(cluster_id, pub_url, version_columns(source))
+        else:
+            version = {
                 "cluster_id": cluster_id,
                 "pub_url": pub_url,
                 "source_json": json.loads(source_json) if source_json else {},
             }
-        )
+        grouped.setdefault(publication_id, []).append(version)
     return grouped
 
 
-def load_cached_coauthors(conn: sqlite3.Connection) -> list[dict]:
+def coauthor_publication_from_columns(columns: dict) -> dict:
+    bib = {
+        key: columns[column]
+        for key, column in (
+            ("title", "title"),
+            ("author", "author"),
+            ("pub_year", "year"),
+            *((key, key) for key in IDENTIFIER_BIB_KEYS),
+        )
+        if columns[column] is not None
+    }
+    publication = {"bib": bib}
+    for key in ("num_citations", "pub_url", "url"):
+        if columns[key] is not None:
+            publication[key] = columns[key]
+    return publication
+
+
+def load_cached_coauthors(conn: sqlite3.Connection, include_json: bool = True) -> list[dict]:
+    """Cached coauthor profiles.
+
+    With `include_json=False` each profile only carries its name and the
+    publication fields detectors read, taken from `coauthor_publications`.
+    """
+    if not table_exists(conn, "coauthors"):
+        return []
+    use_columns = not include_json and is_normalized_layout(conn, "coauthors")
+    publications_by_scholar: dict[str, list[dict]] = {}
+    if use_columns:
+        column_names = [
+            "title", "author", "year", "num_citations", "pub_url", "url", *IDENTIFIER_BIB_KEYS,
+        ]
+        for scholar_id, *values in conn.execute(
+            f"SELECT scholar_id, {', '.join(column_names)} FROM coauthor_publications ORDER BY scholar_id, position"
+        ):
+            publications_by_scholar.setdefault(scholar_id, []).append(
+                coauthor_publication_from_columns(dict(zip(column_names, values)))
+            )
+
     cur = conn.cursor()
-    cur.execute("SELECT scholar_id, source_json, date_scraped FROM coauthors")
+    if use_columns:
+        cur.execute(
+            """
+            SELECT scholar_id, CASE WHEN normalized = 1 THEN NULL ELSE source_json END, date_scraped, normalized, name
+            FROM coauthors
+            """
+        )
+    else:
+        cur.execute("SELECT scholar_id, source_json, date_scraped, 0, NULL FROM coauthors")
     coauthors = []
-    for scholar_id, source_json, date_scraped in cur.fetchall():
-        payload = json.loads(source_json)
+    for scholar_id, source_json, date_scraped, normalized, name in cur.fetchall():
+        if use_columns and normalized:
+            payload = {"publications": publications_by_scholar.get(scholar_id, [])}
+            if name is not None:
+                payload["name"] = name
+        else:
+            payload = json.loads(source_json)
+            if not include_json:
+                payload = {
+                    **({"name": payload["name"]} if payload.get("name") is not None else {}),
+                    "publications": [
+                        coauthor_publication_from_columns(coauthor_publication_columns(publication))
+                        for publication in payload.get("publications", [])
+                    ],
+                }
         payload["_cached_scholar_id"] = scholar_id
         payload["_date_scraped"] = date_scraped
         coauthors.append(payload)
     return coauthors
 
+
+def load_unscraped_clusters(conn: sqlite3.Connection) -> list[tuple[str, str, str]]:
+    """`(publication_id, title, cluster_id)` for every cluster without versions.
+
+    Rows come back in publication insertion order and then `cites_id` order.
+    Reads `publication_clusters`, so callers run `migrate_database` first.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT clusters.publication_id, publications.title, clusters.cluster_id
+        FROM publication_clusters AS clusters
+        JOIN publications ON publications.id = clusters.publication_id
+        WHERE NOT EXISTS (SELECT 1 FROM versions WHERE versions.cluster_id = clusters.cluster_id)
+        ORDER BY publications.rowid, clusters.position
+        """
+    )
+    return cur.fetchall()
+
+
+def iter_coauthor_publications(conn: sqlite3.Connection) -> Iterator[CoauthorPublication]:
+    """Cached coauthor publications as compact records, in `load_cached_coauthors` order.
+
+    Rows are streamed from the cursor rather than loaded as whole profiles.
+    """
+    if not table_exists(conn, "coauthors"):
+        return
+    if not is_normalized_layout(conn, "coauthors"):
+        for _scholar_id, source_json in conn.execute("SELECT scholar_id, source_json FROM coauthors"):
+            yield from coauthor_records_from_json(source_json)
+        return
+
+    column_names = ["title", "author", "year", "num_citations", "pub_url", "url", *IDENTIFIER_BIB_KEYS]
+    rows = conn.execute(
+        f"""
+        SELECT coauthors.normalized, coauthors.name,
+               CASE WHEN coauthors.normalized = 1 THEN NULL ELSE coauthors.source_json END,
+               publications.position, {", ".join(f"publications.{column}" for column in column_names)}
+        FROM coauthors
+        LEFT JOIN coauthor_publications AS publications
+            ON coauthors.normalized = 1 AND publications.scholar_id = coauthors.scholar_id
+        ORDER BY coauthors.rowid, publications.position
+        """
+    )
+    for normalized, name, source_json, position, *values in rows:
+        if not normalized:
+            yield from coauthor_records_from_json(source_json)
+        elif position is not None:
+            publication = coauthor_publication_from_columns(dict(zip(column_names, values)))
+            yield coauthor_publication_record(name if name is not None else "Unknown", publication)
+
+
+def coauthor_records_from_json(source_json: str) -> Iterator[CoauthorPublication]:
+    payload = json.loads(source_json)
+    name = payload["name"] if payload.get("name") is not None else "Unknown"
+    for publication in payload.get("publications", []):
+        yield coauthor_publication_record(
+            name, coauthor_publication_from_columns(coauthor_publication_columns(publication))
+        )
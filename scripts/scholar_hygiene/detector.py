@@ -1,15 +1,33 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
 from dataclasses import dataclass
 from datetime import datetime
+from difflib import SequenceMatcher
+from itertools import combinations
 from pathlib import Path
+from typing import Iterable
 
 from .config import DISMISSALS_JSON_FILE, ISSUES_CSV_FILE, ISSUES_JSON_FILE, STATE_JSON_FILE
+from .index import (
+    CandidateIndex,
+    IndexedTitle,
+    index_title,
+    indexed_token_jaccard,
+    title_ratio_upper_bound,
+)
+from .records import (
+    CoauthorPublication,
+    coauthor_publication_record,
+    publication_identifier_set,
+)
 from .utils import (
+    author_last_names,
     author_overlap_score,
     author_shared_last_name_count,
+    last_name_overlap,
     normalize_text,
     safe_int,
     title_similarity,
@@ -17,6 +35,20 @@ from .utils import (
 )
 
 
+# Lowest title similarity / token overlap that contributes to a match score.
+# Candidate pruning relies on pairs below both contributing nothing for titles.
+MIN_SCORED_TITLE_SIMILARITY = 0.8
+MIN_SCORED_TOKEN_OVERLAP = 0.75
+MIN_QUERY_TITLE_SIMILARITY = 0.45
+MIN_QUERY_TOKEN_OVERLAP = 0.35
+# Profile pairs without a shared cluster id only reach the under-clustered
+# threshold when title, author, year and coauthor support all fire.
+UNDER_CLUSTERED_TITLE_SIMILARITY = 0.85
+UNDER_CLUSTERED_AUTHOR_OVERLAP = 0.6
+UNDER_CLUSTERED_YEAR_WINDOW = 1
+COAUTHOR_SUPPORT_TITLE_SIMILARITY = 0.84
+
+
 @dataclass
 class MatchResult:
     score: float
@@ -24,22 +56,25 @@ class MatchResult:
     matched_by_identifier: bool = False
 
 
-def publication_identifier_set(record: dict) -> set[str]:
-    identifiers = set()
-    full_json = record.get("full_json", {})
-    bib = full_json.get("bib", {})
-    for key in ("doi", "eprint", "arxiv"):
-        value = bib.get(key) or record.get(key)
-        if value:
-            identifiers.add(str(value).lower())
-    for key in ("pub_url", "url"):
-        value = full_json.get(key) or bib.get(key) or record.get(key)
-        if value:
-            lowered = str(value).lower()
-            identifiers.add(lowered)
-            if "arxiv.org/abs/" in lowered:
-                identifiers.add(lowered.rsplit("/", 1)[-1])
-    return identifiers
+@dataclass
+class PublicationFeatures:
+    clusters: set[str]
+    title: IndexedTitle
+    last_names: set[str]
+    year: int | None
+
+
+def publication_features(publication: dict) -> PublicationFeatures:
+    return PublicationFeatures(
+        clusters=set(publication.get("cites_id", [])),
+        title=index_title(publication.get("title", "")),
+        last_names=author_last_names(publication.get("author", "")),
+        year=safe_int(publication.get("year")),
+    )
+
+
+def indexed_title_similarity(left: IndexedTitle, right: IndexedTitle) -> float:
+    return SequenceMatcher(None, left.normalized, right.normalized).ratio()
 
 
 def expected_identifier_set(record: dict) -> set[str]:
@@ -63,12 +98,12 @@ def score_expected_to_publication(expected: dict, publication: dict) -> MatchRes
     if title_score >= 0.9:
         reasons.append(f"title similarity {title_score:.2f}")
         score += 0.75
-    elif title_score >= 0.8:
+    elif title_score >= MIN_SCORED_TITLE_SIMILARITY:
         reasons.append(f"title similarity {title_score:.2f}")
         score += 0.45
 
     token_score = token_jaccard(expected["title"], publication["title"])
-    if token_score >= 0.75:
+    if token_score >= MIN_SCORED_TOKEN_OVERLAP:
         reasons.append(f"title token overlap {token_score:.2f}")
         score += 0.25
 
@@ -94,8 +129,8 @@ def score_expected_to_coauthor_publication(expected: dict, coauthor_name: str, p
     return result
 
 
-def score_expected_to_add_articles_candidate(expected: dict, candidate: dict) -> MatchResult:
-    publication_like = {
+def add_articles_publication_like(candidate: dict) -> dict:
+    return {
         "title": candidate.get("title", ""),
         "author": candidate.get("author", ""),
         "year": candidate.get("year", ""),
@@ -103,7 +138,26 @@ def score_expected_to_add_articles_candidate(expected: dict, candidate: dict) ->
             "pub_url": candidate.get("title_url", ""),
         },
     }
-    result = score_expected_to_publication(expected, publication_like)
+
+
+def coauthor_record_like(record: CoauthorPublication) -> dict:
+    return {"title": record.title, "author": record.authors, "year": record.year, "identifiers": record.identifiers}
+
+
+def as_coauthor_publications(coauthors: Iterable[dict | CoauthorPublication]) -> list[CoauthorPublication]:
+    """Accept cached coauthor profiles or already-flattened `CoauthorPublication` records."""
+    records = []
+    for item in coauthors:
+        if isinstance(item, CoauthorPublication):
+            records.append(item)
+            continue
+        name = item.get("name", "Unknown")
+        records.extend(coauthor_publication_record(name, publication) for publication in item.get("publications", []))
+    return records
+
+
+def score_expected_to_add_articles_candidate(expected: dict, candidate: dict) -> MatchResult:
+    result = score_expected_to_publication(expected, add_articles_publication_like(candidate))
     if candidate.get("in_profile"):
         return MatchResult(
             score=0.0,
@@ -122,15 +176,7 @@ def score_expected_to_add_articles_candidate(expected: dict, candidate: dict) ->
 
 
 def score_publication_to_add_articles_candidate(publication: dict, candidate: dict) -> MatchResult:
-    publication_like = {
-        "title": candidate.get("title", ""),
-        "author": candidate.get("author", ""),
-        "year": candidate.get("year", ""),
-        "full_json": {
-            "pub_url": candidate.get("title_url", ""),
-        },
-    }
-    result = score_expected_to_publication(publication, publication_like)
+    result = score_expected_to_publication(publication, add_articles_publication_like(candidate))
     query = candidate.get("search_query") or "unknown query"
     bonus, bonus_reason = query_specificity_bonus(publication["title"], query)
     shared_author_count = author_shared_last_name_count(
@@ -174,7 +220,7 @@ def query_specificity_bonus(title: str, query: str) -> tuple[float, str]:
         return 0.35, f"query closely matches title ({max(title_ratio, token_ratio):.2f})"
     if title_ratio >= 0.65 or token_ratio >= 0.6:
         return 0.2, f"query strongly overlaps title ({max(title_ratio, token_ratio):.2f})"
-    if title_ratio >= 0.45 or token_ratio >= 0.35:
+    if title_ratio >= MIN_QUERY_TITLE_SIMILARITY or token_ratio >= MIN_QUERY_TOKEN_OVERLAP:
         return 0.1, f"query overlaps title ({max(title_ratio, token_ratio):.2f})"
     return 0.0, ""
 
@@ -199,46 +245,217 @@ def build_manual_queries(expected: dict) -> list[str]:
     return queries
 
 
-def detect_missing_profile_articles(
-    expected_papers: list[dict],
-    publications: list[dict],
-    coauthors: list[dict],
-    add_articles_candidates: list[dict] | None = None,
-) -> list[dict]:
-    issues = []
-    add_articles_candidates = add_articles_candidates or []
-    for expected in expected_papers:
-        best_profile_match = max(
-            (score_expected_to_publication(expected, publication) for publication in publications),
+def build_publication_index(publications: list[dict]) -> CandidateIndex:
+    return CandidateIndex(
+        publications,
+        title_of=lambda publication: publication.get("title", ""),
+        identifiers_of=publication_identifier_set,
+    )
+
+
+class CoauthorRecordFilter:
+    """Whether a coauthor publication can reach any detector for these papers.
+
+    Missing-article scans shortlist coauthor records by identifier or by the
+    title and token bounds against an expected paper, and under-clustered
+    scans by the title bound against a profile publication. The bounds are
+    symmetric, so looking each record up in indexes over those titles keeps
+    exactly the records some scan could shortlist; dropping the rest never
+    changes the issues found.
+    """
+
+    def __init__(self, expected_papers: list[dict], publications: list[dict]) -> None:
+        self.expected_index = CandidateIndex(
+            expected_papers,
+            title_of=lambda expected: expected["title"],
+            identifiers_of=expected_identifier_set,
+        )
+        self.publication_index = CandidateIndex(
+            publications,
+            title_of=lambda publication: publication.get("title", ""),
+            identifiers_of=lambda _publication: (),
+        )
+        # The same paper usually sits on several coauthor profiles.
+        self._title_reachable: dict[str, bool] = {}
+
+    def keeps(self, record: CoauthorPublication) -> bool:
+        if self.expected_index.identifier_matches(record.identifiers):
+            return True
+        if record.title not in self._title_reachable:
+            title = index_title(record.title)
+            self._title_reachable[record.title] = self.publication_index.has_title_match(
+                title, min_title_ratio=COAUTHOR_SUPPORT_TITLE_SIMILARITY
+            ) or self.expected_index.has_title_match(
+                title, min_title_ratio=MIN_SCORED_TITLE_SIMILARITY, min_token_jaccard=MIN_SCORED_TOKEN_OVERLAP
+            )
+        return self._title_reachable[record.title]
+
+
+def record_content_key(record: dict) -> str:
+    payload = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ExpectedMatchStore:
+    """Sparse expected paper x profile publication matrix of `MatchResult`s.
+
+    Results are computed on first use and cached by the content hashes of both
+    records, so every detector in a run shares the same scoring work. Pairs
+    outside the profile shortlist share no identifier and sit below both title
+    thresholds, so they score at most on author and year.
+    """
+
+    def __init__(self, expected_papers: list[dict], publications: list[dict]) -> None:
+        self.expected_papers = expected_papers
+        self.publications = publications
+        self.expected_keys = [record_content_key(expected) for expected in expected_papers]
+        self.publication_keys = [record_content_key(publication) for publication in publications]
+        self.results: dict[tuple[str, str], MatchResult] = {}
+        profile_index = build_publication_index(publications)
+        self.publications_by_expected: list[list[int]] = []
+        self.expected_by_publication: list[list[int]] = [[] for _ in publications]
+        for expected_position, expected in enumerate(expected_papers):
+            positions = profile_index.candidates(
+                index_title(expected["title"]),
+                expected_identifier_set(expected),
+                min_title_ratio=MIN_SCORED_TITLE_SIMILARITY,
+                min_token_jaccard=MIN_SCORED_TOKEN_OVERLAP,
+            )
+            self.publications_by_expected.append(positions)
+            for position in positions:
+                self.expected_by_publication[position].append(expected_position)
+
+    def result(self, expected_position: int, publication_position: int) -> MatchResult:
+        key = (self.expected_keys[expected_position], self.publication_keys[publication_position])
+        if key not in self.results:
+            self.results[key] = score_expected_to_publication(
+                self.expected_papers[expected_position],
+                self.publications[publication_position],
+            )
+        return self.results[key]
+
+    def best_for_expected(self, expected_position: int, *, shortlist_only: bool = True) -> MatchResult:
+        positions = (
+            self.publications_by_expected[expected_position] if shortlist_only else range(len(self.publications))
+        )
+        return max(
+            (self.result(expected_position, position) for position in positions),
             key=lambda item: item.score,
             default=MatchResult(score=0.0, reasons=[]),
         )
+
+    def best_for_publication(self, publication_position: int) -> tuple[MatchResult, dict] | None:
+        best = None
+        for expected_position in self.expected_by_publication[publication_position]:
+            result = self.result(expected_position, publication_position)
+            if best is None or result.score > best[0].score:
+                best = (result, self.expected_papers[expected_position])
+        return best
+
+
+class MissingArticleScan:
+    """Indexes shared by the per-expected-paper missing article checks."""
+
+    def __init__(
+        self,
+        expected_papers: list[dict],
+        publications: list[dict],
+        coauthors: list[dict],
+        add_articles_candidates: list[dict] | None = None,
+        match_store: ExpectedMatchStore | None = None,
+    ) -> None:
+        self.expected_papers = expected_papers
+        self.publications = publications
+        self.add_articles_candidates = add_articles_candidates or []
+        self.match_store = match_store or ExpectedMatchStore(expected_papers, publications)
+        self.coauthor_entries = as_coauthor_publications(coauthors)
+        self.coauthor_index = build_publication_index([coauthor_record_like(entry) for entry in self.coauthor_entries])
+        self.add_articles_index = build_publication_index(
+            [add_articles_publication_like(candidate) for candidate in self.add_articles_candidates]
+        )
+        self.add_articles_positions_by_query: dict[str, list[int]] = {}
+        for position, candidate in enumerate(self.add_articles_candidates):
+            query = candidate.get("search_query") or "unknown query"
+            self.add_articles_positions_by_query.setdefault(query, []).append(position)
+        self.query_titles = {query: index_title(query) for query in self.add_articles_positions_by_query}
+        self.expected_titles = [index_title(expected["title"]) for expected in expected_papers]
+        self._shortlists: dict[int, tuple[list[int], list[int], list[int]]] = {}
+
+    def shortlists(self, expected_position: int) -> tuple[list[int], list[int], list[int]]:
+        """Profile, coauthor and Add Articles positions scored for this paper.
+
+        Records outside each shortlist share no identifier and sit below both
+        title thresholds, which caps their score below every cutoff used here.
+        """
+        if expected_position in self._shortlists:
+            return self._shortlists[expected_position]
+        expected = self.expected_papers[expected_position]
+        profile_positions, coauthor_positions, add_articles_positions = self._candidate_positions(expected_position)
+
+        # A query that closely matches the expected title can lift an
+        # otherwise weak Add Articles row over the cutoff, so keep those too.
+        for query in self._bonus_query_candidates(expected_position):
+            bonus, _ = query_specificity_bonus(expected["title"], query)
+            if bonus > 0:
+                add_articles_positions.update(self.add_articles_positions_by_query[query])
+
+        self._shortlists[expected_position] = (profile_positions, coauthor_positions, sorted(add_articles_positions))
+        return self._shortlists[expected_position]
+
+    def dependencies(self, expected_position: int) -> tuple[list[int], list[int], list[int]]:
+        """A superset of `shortlists` that skips the exact query-bonus check."""
+        profile_positions, coauthor_positions, add_articles_positions = self._candidate_positions(expected_position)
+        for query in self._bonus_query_candidates(expected_position):
+            add_articles_positions.update(self.add_articles_positions_by_query[query])
+        return profile_positions, coauthor_positions, sorted(add_articles_positions)
+
+    def _candidate_positions(self, expected_position: int) -> tuple[list[int], list[int], set[int]]:
+        expected = self.expected_papers[expected_position]
+        expected_title = self.expected_titles[expected_position]
+        expected_identifiers = expected_identifier_set(expected)
+        candidate_thresholds = {
+            "min_title_ratio": MIN_SCORED_TITLE_SIMILARITY,
+            "min_token_jaccard": MIN_SCORED_TOKEN_OVERLAP,
+        }
+        return (
+            self.match_store.publications_by_expected[expected_position],
+            self.coauthor_index.candidates(expected_title, expected_identifiers, **candidate_thresholds),
+            set(self.add_articles_index.candidates(expected_title, expected_identifiers, **candidate_thresholds)),
+        )
+
+    def _bonus_query_candidates(self, expected_position: int) -> list[str]:
+        expected_title = self.expected_titles[expected_position]
+        return [
+            query
+            for query, query_title in self.query_titles.items()
+            if title_ratio_upper_bound(expected_title, query_title) >= MIN_QUERY_TITLE_SIMILARITY
+            or indexed_token_jaccard(expected_title, query_title) >= MIN_QUERY_TOKEN_OVERLAP
+        ]
+
+    def issue_for(self, expected_position: int) -> dict | None:
+        expected = self.expected_papers[expected_position]
+        best_profile_match = self.match_store.best_for_expected(expected_position)
         if best_profile_match.score >= 1.0:
-            continue
+            return None
 
+        _, coauthor_positions, add_articles_positions = self.shortlists(expected_position)
         best_coauthor = None
-        for profile in coauthors:
-            coauthor_name = profile.get("name", "Unknown")
-            for publication in profile.get("publications", []):
-                candidate = {
-                    "title": publication.get("bib", {}).get("title", ""),
-                    "author": publication.get("bib", {}).get("author", ""),
-                    "year": publication.get("bib", {}).get("pub_year", ""),
-                    "full_json": publication,
+        for position in coauthor_positions:
+            entry = self.coauthor_entries[position]
+            result = score_expected_to_coauthor_publication(expected, entry.coauthor_name, coauthor_record_like(entry))
+            if best_coauthor is None or result.score > best_coauthor["result"].score:
+                best_coauthor = {
+                    "result": result,
+                    "coauthor_name": entry.coauthor_name,
+                    "publication": entry,
                 }
-                result = score_expected_to_coauthor_publication(expected, coauthor_name, candidate)
-                if best_coauthor is None or result.score > best_coauthor["result"].score:
-                    best_coauthor = {
-                        "result": result,
-                        "coauthor_name": coauthor_name,
-                        "publication": publication,
-                    }
 
         if not best_coauthor or best_coauthor["result"].score < 0.85:
             best_coauthor = None
 
         best_add_articles = None
-        for candidate in add_articles_candidates:
+        for position in add_articles_positions:
+            candidate = self.add_articles_candidates[position]
             result = score_expected_to_add_articles_candidate(expected, candidate)
             if best_add_articles is None or result.score > best_add_articles["result"].score:
                 best_add_articles = {
@@ -255,7 +472,11 @@ def detect_missing_profile_articles(
             evidence_source = ("add_articles", best_add_articles)
             evidence_score = best_add_articles["result"].score
         if evidence_source is None:
-            continue
+            return None
+
+        # The shortlist only decides the >= 1.0 cutoff; report the same best
+        # profile match a full scan would.
+        best_profile_match = self.match_store.best_for_expected(expected_position, shortlist_only=False)
 
         issue_id = f"missing:{expected['id']}"
         source_kind, source_payload = evidence_source
@@ -271,8 +492,8 @@ def detect_missing_profile_articles(
             evidence.update(
                 {
                     "coauthor_name": source_payload["coauthor_name"],
-                    "coauthor_title": source_payload["publication"].get("bib", {}).get("title", ""),
-                    "coauthor_citations": source_payload["publication"].get("num_citations", 0),
+                    "coauthor_title": source_payload["publication"].title,
+                    "coauthor_citations": source_payload["publication"].num_citations,
                     "reasons": source_payload["result"].reasons,
                 }
             )
@@ -293,108 +514,183 @@ def detect_missing_profile_articles(
                     "reasons": source_payload["result"].reasons,
                 }
             )
-        issues.append(
-            {
-                "id": issue_id,
-                "type": "missing_profile_article",
-                "title": expected["title"],
-                "confidence": classify_confidence(score),
-                "score": round(score, 3),
-                "recommended_action": "Search Google Scholar Add Articles with the suggested queries and attach the matching paper to your profile.",
-                "manual_queries": build_manual_queries(expected),
-                "evidence": evidence,
-            }
-        )
-    return issues
+        return {
+            "id": issue_id,
+            "type": "missing_profile_article",
+            "title": expected["title"],
+            "confidence": classify_confidence(score),
+            "score": round(score, 3),
+            "recommended_action": "Search Google Scholar Add Articles with the suggested queries and attach the matching paper to your profile.",
+            "manual_queries": build_manual_queries(expected),
+            "evidence": evidence,
+        }
 
 
-def detect_under_clustered_articles(
+def detect_missing_profile_articles(
+    expected_papers: list[dict],
     publications: list[dict],
     coauthors: list[dict],
     add_articles_candidates: list[dict] | None = None,
+    match_store: ExpectedMatchStore | None = None,
 ) -> list[dict]:
+    scan = MissingArticleScan(expected_papers, publications, coauthors, add_articles_candidates, match_store)
     issues = []
-    seen_pairs = set()
-    add_articles_candidates = add_articles_candidates or []
-
-    for index, left in enumerate(publications):
-        left_clusters = set(left.get("cites_id", []))
-        for right in publications[index + 1 :]:
-            right_clusters = set(right.get("cites_id", []))
-            shared_clusters = sorted(left_clusters & right_clusters)
-            title_score = title_similarity(left["title"], right["title"])
-            author_score = author_overlap_score(left.get("author", ""), right.get("author", ""))
-            year_left = safe_int(left.get("year"))
-            year_right = safe_int(right.get("year"))
-            year_close = year_left and year_right and abs(year_left - year_right) <= 1
-
-            score = 0.0
-            reasons = []
-            if shared_clusters:
-                reasons.append(f"shared cluster ids: {', '.join(shared_clusters[:3])}")
-                score += 1.1
-            if title_score >= 0.85:
-                reasons.append(f"title similarity {title_score:.2f}")
-                score += 0.35
-            if author_score >= 0.6:
-                reasons.append(f"author overlap {author_score:.2f}")
-                score += 0.25
-            if year_close:
-                reasons.append(f"year proximity {year_left}/{year_right}")
-                score += 0.1
-
-            coauthor_support = []
-            for profile in coauthors:
-                for publication in profile.get("publications", []):
-                    coauthor_title = publication.get("bib", {}).get("title", "")
-                    if (
-                        title_similarity(left["title"], coauthor_title) >= 0.84
-                        and title_similarity(right["title"], coauthor_title) >= 0.84
-                    ):
-                        coauthor_support.append(profile.get("name", "Unknown"))
-                        break
-            if coauthor_support:
-                reasons.append(f"coauthor sees a single likely merged paper: {', '.join(sorted(set(coauthor_support))[:2])}")
-                score += 0.2
+    for expected_position in range(len(expected_papers)):
+        issue = scan.issue_for(expected_position)
+        if issue is not None:
+            issues.append(issue)
+    return issues
 
-            if score < 0.9:
-                continue
 
-            pair_key = tuple(sorted((left["id"], right["id"])))
-            if pair_key in seen_pairs:
-                continue
-            seen_pairs.add(pair_key)
-            issues.append(
-                {
-                    "id": f"cluster:{pair_key[0]}:{pair_key[1]}",
-                    "type": "under_clustered_profile_article",
-                    "title": left["title"],
-                    "confidence": classify_confidence(score),
-                    "score": round(score, 3),
-                    "recommended_action": "Open both profile entries in Scholar and merge them if they represent the same paper.",
-                    "manual_queries": [f"\"{left['title']}\"", f"\"{right['title']}\""],
-                    "evidence": {
-                        "left": {
-                            "id": left["id"],
-                            "title": left["title"],
-                            "citations": left["num_citations"],
-                            "year": left["year"],
-                        },
-                        "right": {
-                            "id": right["id"],
-                            "title": right["title"],
-                            "citations": right["num_citations"],
-                            "year": right["year"],
-                        },
-                        "shared_clusters": shared_clusters,
-                        "reasons": reasons,
-                    },
-                }
+def under_clustered_candidate_pairs(features: list[PublicationFeatures]) -> list[tuple[int, int]]:
+    """Position pairs that can reach the under-clustered threshold, in scan order.
+
+    Pairs sharing a cluster id always qualify. Any other pair needs title,
+    author and year evidence at once, so only pairs within the year window are
+    compared, and they must clear the author overlap and the title bound.
+    """
+    pairs: set[tuple[int, int]] = set()
+    by_cluster: dict[str, list[int]] = {}
+    by_year: dict[int, list[int]] = {}
+    for position, feature in enumerate(features):
+        for cluster in feature.clusters:
+            by_cluster.setdefault(cluster, []).append(position)
+        if feature.year:
+            by_year.setdefault(feature.year, []).append(position)
+
+    for positions in by_cluster.values():
+        pairs.update(combinations(positions, 2))
+
+    for year, positions in by_year.items():
+        nearby = [
+            position
+            for other_year in range(year - UNDER_CLUSTERED_YEAR_WINDOW, year + UNDER_CLUSTERED_YEAR_WINDOW + 1)
+            for position in by_year.get(other_year, ())
+        ]
+        for left_position in positions:
+            left = features[left_position]
+            for right_position in nearby:
+                pair = (left_position, right_position)
+                if right_position <= left_position or pair in pairs:
+                    continue
+                right = features[right_position]
+                if (
+                    last_name_overlap(left.last_names, right.last_names) >= UNDER_CLUSTERED_AUTHOR_OVERLAP
+                    and title_ratio_upper_bound(left.title, right.title) >= UNDER_CLUSTERED_TITLE_SIMILARITY
+                ):
+                    pairs.add(pair)
+    return sorted(pairs)
+
+
+class UnderClusteredScan:
+    """Features and indexes shared by the under-clustered pair and Add Articles checks."""
+
+    def __init__(
+        self,
+        publications: list[dict],
+        coauthors: list[dict],
+        add_articles_candidates: list[dict] | None = None,
+    ) -> None:
+        self.publications = publications
+        self.add_articles_candidates = add_articles_candidates or []
+        self.features = [publication_features(publication) for publication in publications]
+        coauthor_entries = as_coauthor_publications(coauthors)
+        self.coauthor_names = [entry.coauthor_name for entry in coauthor_entries]
+        self.coauthor_index = build_publication_index([coauthor_record_like(entry) for entry in coauthor_entries])
+        self.pairs = under_clustered_candidate_pairs(self.features)
+        self._coauthor_candidates: dict[int, list[int]] = {}
+        self._coauthor_matches: dict[int, set[int]] = {}
+
+    def coauthor_candidates(self, position: int) -> list[int]:
+        """Coauthor publications whose title could support this publication."""
+        if position not in self._coauthor_candidates:
+            self._coauthor_candidates[position] = sorted(
+                self.coauthor_index.title_matches(
+                    self.features[position].title,
+                    min_title_ratio=COAUTHOR_SUPPORT_TITLE_SIMILARITY,
+                )
             )
+        return self._coauthor_candidates[position]
+
+    def matching_coauthor_positions(self, position: int) -> set[int]:
+        if position not in self._coauthor_matches:
+            title = self.features[position].title
+            self._coauthor_matches[position] = {
+                match
+                for match in self.coauthor_candidates(position)
+                if indexed_title_similarity(title, self.coauthor_index.titles[match]) >= COAUTHOR_SUPPORT_TITLE_SIMILARITY
+            }
+        return self._coauthor_matches[position]
+
+    def pair_issue(self, left_position: int, right_position: int) -> dict | None:
+        left = self.publications[left_position]
+        right = self.publications[right_position]
+        left_features = self.features[left_position]
+        right_features = self.features[right_position]
+        shared_clusters = sorted(left_features.clusters & right_features.clusters)
+        title_score = indexed_title_similarity(left_features.title, right_features.title)
+        author_score = last_name_overlap(left_features.last_names, right_features.last_names)
+        year_left = left_features.year
+        year_right = right_features.year
+        year_close = year_left and year_right and abs(year_left - year_right) <= UNDER_CLUSTERED_YEAR_WINDOW
+
+        score = 0.0
+        reasons = []
+        if shared_clusters:
+            reasons.append(f"shared cluster ids: {', '.join(shared_clusters[:3])}")
+            score += 1.1
+        if title_score >= UNDER_CLUSTERED_TITLE_SIMILARITY:
+            reasons.append(f"title similarity {title_score:.2f}")
+            score += 0.35
+        if author_score >= UNDER_CLUSTERED_AUTHOR_OVERLAP:
+            reasons.append(f"author overlap {author_score:.2f}")
+            score += 0.25
+        if year_close:
+            reasons.append(f"year proximity {year_left}/{year_right}")
+            score += 0.1
+
+        shared_coauthor_positions = self.matching_coauthor_positions(left_position) & self.matching_coauthor_positions(
+            right_position
+        )
+        coauthor_support = [self.coauthor_names[position] for position in shared_coauthor_positions]
+        if coauthor_support:
+            reasons.append(f"coauthor sees a single likely merged paper: {', '.join(sorted(set(coauthor_support))[:2])}")
+            score += 0.2
+
+        if score < 0.9:
+            return None
+
+        pair_key = tuple(sorted((left["id"], right["id"])))
+        return {
+            "id": f"cluster:{pair_key[0]}:{pair_key[1]}",
+            "type": "under_clustered_profile_article",
+            "title": left["title"],
+            "confidence": classify_confidence(score),
+            "score": round(score, 3),
+            "recommended_action": "Open both profile entries in Scholar and merge them if they represent the same paper.",
+            "manual_queries": [f"\"{left['title']}\"", f"\"{right['title']}\""],
+            "evidence": {
+                "left": {
+                    "id": left["id"],
+                    "title": left["title"],
+                    "citations": left["num_citations"],
+                    "year": left["year"],
+                },
+                "right": {
+                    "id": right["id"],
+                    "title": right["title"],
+                    "citations": right["num_citations"],
+                    "year": right["year"],
+                },
+                "shared_clusters": shared_clusters,
+                "reasons": reasons,
+            },
+        }
 
-    for publication in publications:
+    def add_articles_issue(self, position: int) -> dict | None:
+        publication = self.publications[position]
         best_candidate = None
-        for candidate in add_articles_candidates:
+        for candidate in self.add_articles_candidates:
             if candidate.get("in_profile"):
                 continue
             result = score_publication_to_add_articles_candidate(publication, candidate)
@@ -405,123 +701,153 @@ def detect_under_clustered_articles(
                 }
 
         if not best_candidate or best_candidate["result"].score < 0.9:
-            continue
+            return None
 
         candidate = best_candidate["candidate"]
         issue_id = f"cluster:add:{publication['id']}:{candidate.get('doc_id', 'unknown')}"
-        issues.append(
-            {
-                "id": issue_id,
-                "type": "under_clustered_profile_article",
-                "title": publication["title"],
-                "confidence": classify_confidence(best_candidate["result"].score),
-                "score": round(best_candidate["result"].score, 3),
-                "recommended_action": (
-                    "Open the matching Add Articles candidate and your existing profile paper, "
-                    "attach the candidate if needed, then merge the resulting Scholar entries."
-                ),
-                "manual_queries": [candidate.get("search_query", ""), f"\"{publication['title']}\""],
-                "evidence": {
-                    "left": {
-                        "id": publication["id"],
-                        "title": publication["title"],
-                        "citations": publication["num_citations"],
-                        "year": publication["year"],
-                    },
-                    "add_articles_candidate": {
-                        "title": candidate.get("title", ""),
-                        "title_url": candidate.get("title_url", ""),
-                        "authors_venue": candidate.get("authors_venue", ""),
-                        "doc_id": candidate.get("doc_id", ""),
-                        "search_query": candidate.get("search_query", ""),
-                        "captured_url": candidate.get("captured_url", ""),
-                        "artifact_file": candidate.get("artifact_file", ""),
-                    },
-                    "shared_clusters": [],
-                    "reasons": best_candidate["result"].reasons,
+        return {
+            "id": issue_id,
+            "type": "under_clustered_profile_article",
+            "title": publication["title"],
+            "confidence": classify_confidence(best_candidate["result"].score),
+            "score": round(best_candidate["result"].score, 3),
+            "recommended_action": (
+                "Open the matching Add Articles candidate and your existing profile paper, "
+                "attach the candidate if needed, then merge the resulting Scholar entries."
+            ),
+            "manual_queries": [candidate.get("search_query", ""), f"\"{publication['title']}\""],
+            "evidence": {
+                "left": {
+                    "id": publication["id"],
+                    "title": publication["title"],
+                    "citations": publication["num_citations"],
+                    "year": publication["year"],
                 },
-            }
-        )
-    return issues
+                "add_articles_candidate": {
+                    "title": candidate.get("title", ""),
+                    "title_url": candidate.get("title_url", ""),
+                    "authors_venue": candidate.get("authors_venue", ""),
+                    "doc_id": candidate.get("doc_id", ""),
+                    "search_query": candidate.get("search_query", ""),
+                    "captured_url": candidate.get("captured_url", ""),
+                    "artifact_file": candidate.get("artifact_file", ""),
+                },
+                "shared_clusters": [],
+                "reasons": best_candidate["result"].reasons,
+            },
+        }
 
 
-def detect_metadata_anomalies(publications: list[dict], versions_by_publication: dict[str, list[dict]], expected_papers: list[dict]) -> list[dict]:
+def detect_under_clustered_articles(
+    publications: list[dict],
+    coauthors: list[dict],
+    add_articles_candidates: list[dict] | None = None,
+) -> list[dict]:
+    scan = UnderClusteredScan(publications, coauthors, add_articles_candidates)
     issues = []
-    expected_lookup = expected_papers
-    for publication in publications:
-        versions = versions_by_publication.get(publication["id"], [])
-        if not versions:
+    seen_issue_ids = set()
+    for left_position, right_position in scan.pairs:
+        issue = scan.pair_issue(left_position, right_position)
+        if issue is None or issue["id"] in seen_issue_ids:
             continue
+        seen_issue_ids.add(issue["id"])
+        issues.append(issue)
 
-        observed_years = set()
-        observed_venues = set()
-        divergent_titles = []
-        for version in versions:
-            if version["pub_url"] in {"__empty__", "__error__"}:
-                continue
-            source = version["source_json"]
-            bib = source.get("bib", {})
-            version_title = bib.get("title", "")
-            version_year = bib.get("pub_year", "")
-            version_venue = bib.get("conference") or bib.get("journal") or bib.get("citation") or bib.get("venue", "")
-            if version_year:
-                observed_years.add(str(version_year))
-            if version_venue:
-                observed_venues.add(version_venue)
-            if version_title and title_similarity(publication["title"], version_title) < 0.5:
-                divergent_titles.append(version_title)
-
-        matched_expected = None
-        for expected in expected_lookup:
-            match_result = score_expected_to_publication(expected, publication)
-            if matched_expected is None or match_result.score > matched_expected[0].score:
-                matched_expected = (match_result, expected)
+    for position in range(len(publications)):
+        issue = scan.add_articles_issue(position)
+        if issue is not None:
+            issues.append(issue)
+    return issues
 
-        reasons = []
-        score = 0.0
-        if len(observed_years) >= 2:
-            reasons.append(f"conflicting years in versions: {sorted(observed_years)}")
-            score += 0.5
-        if len(observed_venues) >= 2:
-            reasons.append("conflicting venues across versions")
-            score += 0.35
-        if divergent_titles:
-            reasons.append(f"{len(divergent_titles)} divergent version titles")
-            score += 0.35
-        if matched_expected:
-            match_result, expected = matched_expected
-            if match_result.score >= 0.85:
-                expected_year = str(expected.get("year", "")).strip()
-                if expected_year and observed_years and expected_year not in observed_years:
-                    reasons.append(f"local bibliography year differs: {expected_year}")
-                    score += 0.25
-                expected_venue = expected.get("venue", "").strip()
-                if expected_venue and observed_venues and expected_venue not in observed_venues:
-                    reasons.append("local bibliography venue differs")
-                    score += 0.2
-
-        if score < 0.45:
+
+def publication_metadata_issue(
+    position: int,
+    publication: dict,
+    versions: list[dict],
+    match_store: ExpectedMatchStore,
+) -> dict | None:
+    if not versions:
+        return None
+
+    observed_years = set()
+    observed_venues = set()
+    divergent_titles = []
+    for version in versions:
+        if version["pub_url"] in {"__empty__", "__error__"}:
             continue
+        source = version["source_json"]
+        bib = source.get("bib", {})
+        version_title = bib.get("title", "")
+        version_year = bib.get("pub_year", "")
+        version_venue = bib.get("conference") or bib.get("journal") or bib.get("citation") or bib.get("venue", "")
+        if version_year:
+            observed_years.add(str(version_year))
+        if version_venue:
+            observed_venues.add(version_venue)
+        if version_title and title_similarity(publication["title"], version_title) < 0.5:
+            divergent_titles.append(version_title)
+
+    # Only shortlisted expected papers can clear the 0.85 cutoff below.
+    matched_expected = match_store.best_for_publication(position)
 
-        issues.append(
-            {
-                "id": f"metadata:{publication['id']}",
-                "type": "metadata_anomaly",
-                "title": publication["title"],
-                "confidence": classify_confidence(score),
-                "score": round(score, 3),
-                "recommended_action": "Inspect the Scholar cluster and choose the canonical entry with the correct year/venue metadata.",
-                "manual_queries": [f"\"{publication['title']}\""],
-                "evidence": {
-                    "publication_id": publication["id"],
-                    "publication_title": publication["title"],
-                    "observed_years": sorted(observed_years),
-                    "observed_venues": sorted(observed_venues),
-                    "divergent_titles": divergent_titles[:10],
-                    "reasons": reasons,
-                },
-            }
-        )
+    reasons = []
+    score = 0.0
+    if len(observed_years) >= 2:
+        reasons.append(f"conflicting years in versions: {sorted(observed_years)}")
+        score += 0.5
+    if len(observed_venues) >= 2:
+        reasons.append("conflicting venues across versions")
+        score += 0.35
+    if divergent_titles:
+        reasons.append(f"{len(divergent_titles)} divergent version titles")
+        score += 0.35
+    if matched_expected:
+        match_result, expected = matched_expected
+        if match_result.score >= 0.85:
+            expected_year = str(expected.get("year", "")).strip()
+            if expected_year and observed_years and expected_year not in observed_years:
+                reasons.append(f"local bibliography year differs: {expected_year}")
+                score += 0.25
+            expected_venue = expected.get("venue", "").strip()
+            if expected_venue and observed_venues and expected_venue not in observed_venues:
+                reasons.append("local bibliography venue differs")
+                score += 0.2
+
+    if score < 0.45:
+        return None
+
+    return {
+        "id": f"metadata:{publication['id']}",
+        "type": "metadata_anomaly",
+        "title": publication["title"],
+        "confidence": classify_confidence(score),
+        "score": round(score, 3),
+        "recommended_action": "Inspect the Scholar cluster and choose the canonical entry with the correct year/venue metadata.",
+        "manual_queries": [f"\"{publication['title']}\""],
+        "evidence": {
+            "publication_id": publication["id"],
+            "publication_title": publication["title"],
+            "observed_years": sorted(observed_years),
+            "observed_venues": sorted(observed_venues),
+            "divergent_titles": divergent_titles[:10],
+            "reasons": reasons,
+        },
+    }
+
+
+def detect_metadata_anomalies(
+    publications: list[dict],
+    versions_by_publication: dict[str, list[dict]],
+    expected_papers: list[dict],
+    match_store: ExpectedMatchStore | None = None,
+) -> list[dict]:
+    issues = []
+    match_store = match_store or ExpectedMatchStore(expected_papers, publications)
+    for position, publication in enumerate(publications):
+        versions = versions_by_publication.get(publication["id"], [])
+        issue = publication_metadata_issue(position, publication, versions, match_store)
+        if issue is not None:
+            issues.append(issue)
     return issues
 
 
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable
+
+from .config import DETECTION_STATE_JSON_FILE
+from .detector import (
+    ExpectedMatchStore,
+    MissingArticleScan,
+    UnderClusteredScan,
+    as_coauthor_publications,
+    publication_metadata_issue,
+    record_content_key,
+)
+from .records import CoauthorPublication
+
+DETECTION_STATE_VERSION = 2
+
+
+def fingerprint(parts: list[str]) -> str:
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def load_detection_state(path: Path = DETECTION_STATE_JSON_FILE) -> dict:
+    if not path.exists():
+        return {}
+    state = json.loads(path.read_text())
+    if state.get("version") != DETECTION_STATE_VERSION:
+        return {}
+    return state
+
+
+def save_detection_state(state: dict, path: Path = DETECTION_STATE_JSON_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+
+def input_hashes(
+    expected_papers: list[dict],
+    publications: list[dict],
+    coauthors: list[dict | CoauthorPublication],
+    add_articles_candidates: list[dict],
+) -> dict[str, dict[str, str]]:
+    publications_by_coauthor: dict[str, list[dict]] = {}
+    for entry in as_coauthor_publications(coauthors):
+        publications_by_coauthor.setdefault(entry.coauthor_name, []).append(entry._asdict())
+    artifacts: dict[str, list[dict]] = {}
+    for candidate in add_articles_candidates:
+        artifacts.setdefault(candidate.get("artifact_file", ""), []).append(candidate)
+    return {
+        "expected_papers": {str(paper.get("id", "")): record_content_key(paper) for paper in expected_papers},
+        "publications": {str(publication.get("id", "")): record_content_key(publication) for publication in publications},
+        "coauthors": {
+            str(name): record_content_key({"publications": entries}) for name, entries in publications_by_coauthor.items()
+        },
+        "add_articles_artifacts": {
+            artifact_file: record_content_key({"candidates": candidates}) for artifact_file, candidates in artifacts.items()
+        },
+    }
+
+
+def changed_input_counts(previous: dict[str, dict[str, str]], current: dict[str, dict[str, str]]) -> dict[str, int]:
+    counts = {}
+    for kind, hashes in current.items():
+        previous_hashes = previous.get(kind, {})
+        keys = set(hashes) | set(previous_hashes)
+        counts[kind] = sum(1 for key in keys if hashes.get(key) != previous_hashes.get(key))
+    return counts
+
+
+def detect_issues_incrementally(
+    expected_papers: list[dict],
+    publications: list[dict],
+    versions_by_publication: dict[str, list[dict]],
+    coauthors: list[dict | CoauthorPublication],
+    add_articles_candidates: list[dict],
+    previous_state: dict | None = None,
+) -> tuple[list[dict], dict]:
+    """Run all three detectors, reusing issues whose inputs did not change.
+
+    Every unit of work (an expected paper, a profile pair, a publication) is
+    fingerprinted by the content hashes of the records it reads. A unit whose
+    fingerprint matches the previous state reuses its stored issue; all others
+    are recomputed. Issues come back in the same order as a full run.
+    """
+    previous_state = previous_state or {}
+    previous_units = previous_state.get("units", {})
+    units: dict[str, dict] = {}
+    counts = {"reused": 0, "recomputed": 0}
+
+    def resolve(
+        unit_key: str,
+        parts: list[str],
+        compute: Callable[[], dict | None],
+        issue_parts: list[str] | None = None,
+    ) -> dict | None:
+        # `issue_parts` are inputs that only shape the evidence of an emitted issue.
+        def unit_fingerprint(issue: dict | None) -> str:
+            if issue is None or not issue_parts:
+                return fingerprint(parts)
+            return fingerprint(parts + issue_parts)
+
+        cached = previous_units.get(unit_key)
+        if cached is not None and cached["fingerprint"] == unit_fingerprint(cached["issue"]):
+            issue = cached["issue"]
+            counts["reused"] += 1
+        else:
+            issue = compute()
+            if issue is not None:
+                issue = json.loads(json.dumps(issue))
+            counts["recomputed"] += 1
+        units[unit_key] = {"fingerprint": unit_fingerprint(issue), "issue": issue}
+        return json.loads(json.dumps(issue)) if issue is not None else None
+
+    match_store = ExpectedMatchStore(expected_papers, publications)
+    publication_keys = match_store.publication_keys
+    expected_keys = match_store.expected_keys
+    all_publications = fingerprint(publication_keys)
+    issues = []
+
+    coauthors = as_coauthor_publications(coauthors)
+    missing_scan = MissingArticleScan(
+        expected_papers,
+        publications,
+        coauthors,
+        add_articles_candidates,
+        match_store=match_store,
+    )
+    coauthor_keys = [record_content_key(entry._asdict()) for entry in missing_scan.coauthor_entries]
+    add_articles_keys = [record_content_key(candidate) for candidate in add_articles_candidates]
+    for expected_position in range(len(expected_papers)):
+        profile_positions, coauthor_positions, add_articles_positions = missing_scan.dependencies(expected_position)
+        issue = resolve(
+            f"missing:{expected_keys[expected_position]}",
+            [
+                expected_keys[expected_position],
+                "profile",
+                *(publication_keys[position] for position in profile_positions),
+                "coauthor",
+                *(coauthor_keys[position] for position in coauthor_positions),
+                "add_articles",
+                *(add_articles_keys[position] for position in add_articles_positions),
+            ],
+            lambda: missing_scan.issue_for(expected_position),
+            issue_parts=[all_publications],
+        )
+        if issue is not None:
+            issues.append(issue)
+
+    cluster_scan = UnderClusteredScan(publications, coauthors, add_articles_candidates)
+    seen_issue_ids = set()
+    for left_position, right_position in cluster_scan.pairs:
+        issue = resolve(
+            f"cluster:{publication_keys[left_position]}:{publication_keys[right_position]}",
+            [
+                publication_keys[left_position],
+                publication_keys[right_position],
+                "coauthor",
+                *(coauthor_keys[position] for position in cluster_scan.coauthor_candidates(left_position)),
+                "coauthor",
+                *(coauthor_keys[position] for position in cluster_scan.coauthor_candidates(right_position)),
+            ],
+            lambda: cluster_scan.pair_issue(left_position, right_position),
+        )
+        if issue is None or issue["id"] in seen_issue_ids:
+            continue
+        seen_issue_ids.add(issue["id"])
+        issues.append(issue)
+
+    all_add_articles = fingerprint(add_articles_keys)
+    for position in range(len(publications)):
+        issue = resolve(
+            f"cluster:add:{publication_keys[position]}",
+            [publication_keys[position], all_add_articles],
+            lambda: cluster_scan.add_articles_issue(position),
+        )
+        if issue is not None:
+            issues.append(issue)
+
+    for position, publication in enumerate(publications):
+        versions = versions_by_publication.get(publication["id"], [])
+        issue = resolve(
+            f"metadata:{publication_keys[position]}",
+            [
+                publication_keys[position],
+                record_content_key({"versions": versions}),
+                *(expected_keys[expected_position] for expected_position in match_store.expected_by_publication[position]),
+            ],
+            lambda: publication_metadata_issue(position, publication, versions, match_store),
+        )
+        if issue is not None:
+            issues.append(issue)
+
+    hashes = input_hashes(expected_papers, publications, coauthors, add_articles_candidates)
+    state = {
+        "version": DETECTION_STATE_VERSION,
+        "input_hashes": hashes,
+        "changed_inputs": changed_input_counts(previous_state.get("input_hashes", {}), hashes),
+        "unit_counts": counts,
+        "units": units,
+    }
+    return issues, state
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Callable, Iterable, Iterator
+
+from .utils import normalize_title, tokenize_title
+
+
+@dataclass
+class IndexedTitle:
+    normalized: str
+    tokens: set[str]
+    char_counts: Counter
+
+
+def index_title(title: str) -> IndexedTitle:
+    normalized = normalize_title(title)
+    return IndexedTitle(
+        normalized=normalized,
+        tokens=tokenize_title(normalized),
+        char_counts=Counter(normalized),
+    )
+
+
+def title_ratio_upper_bound(left: IndexedTitle, right: IndexedTitle) -> float:
+    # Same bound as SequenceMatcher.quick_ratio(): no alignment can match more
+    # characters than the two titles have in common.
+    total = len(left.normalized) + len(right.normalized)
+    if not total:
+        return 1.0
+    matches = sum((left.char_counts & right.char_counts).values())
+    return 2.0 * matches / total
+
+
+def indexed_token_jaccard(left: IndexedTitle, right: IndexedTitle) -> float:
+    if not left.tokens or not right.tokens:
+        return 0.0
+    return len(left.tokens & right.tokens) / len(left.tokens | right.tokens)
+
+
+def length_window_bounds(lengths: list[int], length: int, threshold: float) -> tuple[int, int]:
+    """Slice of ascending `lengths` that can reach `threshold` ratio against `length`."""
+    if threshold <= 0:
+        return 0, len(lengths)
+    # ratio <= 2 * min(a, b) / (a + b); widened by one so rounding never drops a title.
+    low = int(length * threshold / (2 - threshold)) - 1
+    high = int(length * (2 - threshold) / threshold) + 1
+    return bisect_left(lengths, low), bisect_right(lengths, high)
+
+
+class CharCountMasks:
+    """Title character counts as unary-coded bit masks.
+
+    Each character gets a run of bits as wide as its largest count among the
+    indexed titles, so `(left & right).bit_count()` is the number of characters
+    two titles have in common: the numerator of `title_ratio_upper_bound`.
+    """
+
+    def __init__(self, titles: Iterable[IndexedTitle]) -> None:
+        widths: dict[str, int] = {}
+        for title in titles:
+            for char, count in title.char_counts.items():
+                if count > widths.get(char, 0):
+                    widths[char] = count
+        self.slots: dict[str, tuple[int, int]] = {}
+        offset = 0
+        for char in sorted(widths):
+            self.slots[char] = (offset, widths[char])
+            offset += widths[char]
+
+    def mask(self, title: IndexedTitle) -> int:
+        mask = 0
+        for char, count in title.char_counts.items():
+            slot = self.slots.get(char)
+            if slot is not None:
+                offset, width = slot
+                mask |= ((1 << min(count, width)) - 1) << offset
+        return mask
+
+
+class CandidateIndex:
+    """Identifier, token and title-length lookups over a fixed list of records.
+
+    `candidates` returns positions (in list order) of every record that shares
+    an identifier with the query, or whose title could still reach
+    `min_title_ratio` title similarity or `min_token_jaccard` token overlap.
+    The title checks are exact bounds, so no record that reaches either
+    threshold is ever left out.
+    """
+
+    def __init__(
+        self,
+        records: list[dict],
+        *,
+        title_of: Callable[[dict], str],
+        identifiers_of: Callable[[dict], Iterable[str]],
+    ) -> None:
+        self.records = records
+        self.titles = [index_title(title_of(record)) for record in records]
+        self.by_identifier: dict[str, list[int]] = {}
+        self.by_token: dict[str, list[int]] = {}
+        for position, record in enumerate(records):
+            for identifier in identifiers_of(record):
+                self.by_identifier.setdefault(identifier, []).append(position)
+            for token in self.titles[position].tokens:
+                self.by_token.setdefault(token, []).append(position)
+        self.by_length = sorted(range(len(records)), key=lambda position: len(self.titles[position].normalized))
+        self.lengths = [len(self.titles[position].normalized) for position in self.by_length]
+        self.char_masks = CharCountMasks(self.titles)
+        self.masks = [self.char_masks.mask(self.titles[position]) for position in self.by_length]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def identifier_matches(self, identifiers: Iterable[str]) -> set[int]:
+        matches = set()
+        for identifier in identifiers:
+            matches.update(self.by_identifier.get(identifier, ()))
+        return matches
+
+    def title_matches(
+        self,
+        title: IndexedTitle,
+        *,
+        min_title_ratio: float,
+        min_token_jaccard: float | None = None,
+    ) -> set[int]:
+        return set(self.iter_title_matches(title, min_title_ratio=min_title_ratio, min_token_jaccard=min_token_jaccard))
+
+    def has_title_match(
+        self,
+        title: IndexedTitle,
+        *,
+        min_title_ratio: float,
+        min_token_jaccard: float | None = None,
+    ) -> bool:
+        matches = self.iter_title_matches(title, min_title_ratio=min_title_ratio, min_token_jaccard=min_token_jaccard)
+        return next(matches, None) is not None
+
+    def iter_title_matches(
+        self,
+        title: IndexedTitle,
+        *,
+        min_title_ratio: float,
+        min_token_jaccard: float | None = None,
+    ) -> Iterator[int]:
+        """Positions for `title_matches`, lazily; a position may repeat."""
+        length = len(title.normalized)
+        mask = self.char_masks.mask(title)
+        start, stop = length_window_bounds(self.lengths, length, min_title_ratio)
+        # Same arithmetic as `title_ratio_upper_bound`, one popcount per title.
+        for position, other_length, other_mask in zip(
+            self.by_length[start:stop], self.lengths[start:stop], self.masks[start:stop]
+        ):
+            if (
+                2.0 * (mask & other_mask).bit_count() / (length + other_length) if length + other_length else 1.0
+            ) >= min_title_ratio:
+                yield position
+        # Any positive token overlap needs a shared token.
+        if min_token_jaccard is not None and min_token_jaccard > 0:
+            for token in title.tokens:
+                for position in self.by_token.get(token, ()):
+                    if indexed_token_jaccard(title, self.titles[position]) >= min_token_jaccard:
+                        yield position
+
+    def candidates(
+        self,
+        title: IndexedTitle,
+        identifiers: Iterable[str],
+        *,
+        min_title_ratio: float,
+        min_token_jaccard: float,
+    ) -> list[int]:
+        matches = self.identifier_matches(identifiers)
+        matches |= self.title_matches(
+            title,
+            min_title_ratio=min_title_ratio,
+            min_token_jaccard=min_token_jaccard,
+        )
+        return sorted(matches)
+
+
+def char_ratio_upper_bound(left: str, left_counts: Counter, right: str, right_counts: Counter) -> float:
+    total = len(left) + len(right)
+    if not total:
+        return 1.0
+    return 2.0 * sum((left_counts & right_counts).values()) / total
+
+
+class NearestTitleIndex:
+    """Best `SequenceMatcher` ratio for a query title among fixed titles.
+
+    `best_match` returns exactly what a linear scan keeping the first highest
+    ratio would, but only scores titles whose length and character counts
+    could still beat the best ratio found so far, highest bound first.
+    """
+
+    def __init__(self, titles: list[str], *, key: Callable[[str], str] = normalize_title) -> None:
+        self.titles = list(titles)
+        self.key = key
+        self.keys = [key(title) for title in self.titles]
+        self.char_counts = [Counter(title_key) for title_key in self.keys]
+        self.by_length = sorted(range(len(self.keys)), key=lambda position: len(self.keys[position]))
+        self.lengths = [len(self.keys[position]) for position in self.by_length]
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def length_window(self, length: int, threshold: float) -> list[int]:
+        start, stop = length_window_bounds(self.lengths, length, threshold)
+        return self.by_length[start:stop]
+
+    def best_match(self, title: str, threshold: float = 0.0) -> tuple[str | None, float]:
+        query = self.key(title)
+        query_counts = Counter(query)
+        bounded = []
+        for position in self.length_window(len(query), threshold):
+            bound = char_ratio_upper_bound(query, query_counts, self.keys[position], self.char_counts[position])
+            if bound > 0 and bound >= threshold:
+                bounded.append((-bound, position))
+        bounded.sort()
+
+        best_position = None
+        best_score = 0.0
+        # The ratio is not symmetric, so the query stays the first sequence.
+        matcher = SequenceMatcher(None, query, "")
+        for negative_bound, position in bounded:
+            if -negative_bound < best_score:
+                break
+            matcher.set_seq2(self.keys[position])
+            score = matcher.ratio()
+            if score > best_score or (score == best_score and best_position is not None and position < best_position):
+                best_position = position
+                best_score = score
+        if best_position is None or best_score < threshold:
+            return None, 0.0
+        return self.titles[best_position], best_score
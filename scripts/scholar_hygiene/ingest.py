@@ -2,11 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import json
-import random
 import sqlite3
-import time
 import urllib.request
-from datetime import datetime
+from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from pathlib import Path
 
@@ -17,7 +15,22 @@ except ImportError:  # pragma: no cover - local fallback
         return iterable
 
 from .config import DB_FILE, get_scholar_user_id
-from .db import ensure_base_tables
+from .db import (
+    advance_ingest_run,
+    ingest_step_done,
+    load_unscraped_clusters,
+    mark_ingest_unit,
+    migrate_database,
+    open_ingest_run,
+)
+from .index import NearestTitleIndex
+from .scheduler import FetchScheduler, FetchUnit, interval_rate
+
+
+# The scholarly client is shared module state and not thread-safe.
+VERSION_FETCH_WORKERS = 1
+# Older unfinished runs are abandoned: their profile listing is too stale to clean against.
+INGEST_RUN_RESUME_DAYS = 7
 
 
 class ScholarFetchError(RuntimeError):
@@ -86,21 +99,22 @@ def hash_version(cluster_id: str, pub_url: str) -> str:
     return hashlib.md5(f"{cluster_id}:{pub_url}".encode("utf-8")).hexdigest()
 
 
+def comparable_title(title: str) -> str:
+    return title.lower().strip()
+
+
 def title_similarity(title1: str, title2: str) -> float:
-    return SequenceMatcher(None, title1.lower().strip(), title2.lower().strip()).ratio()
+    return SequenceMatcher(None, comparable_title(title1), comparable_title(title2)).ratio()
 
 
-def find_similar_title(removed_title: str, current_titles: list[str], threshold: float = 0.7):
-    best_match = None
-    best_score = 0.0
-    for title in current_titles:
-        score = title_similarity(removed_title, title)
-        if score > best_score:
-            best_score = score
-            best_match = title
-    if best_score >= threshold:
-        return best_match, best_score
-    return None, 0.0
+def find_similar_title(
+    removed_title: str,
+    current_titles: list[str],
+    threshold: float = 0.7,
+    index: NearestTitleIndex | None = None,
+):
+    index = index or NearestTitleIndex(current_titles, key=comparable_title)
+    return index.best_match(removed_title, threshold)
 
 
 def insert_paper(conn: sqlite3.Connection, paper: dict, today: str) -> None:
@@ -143,8 +157,9 @@ def clean_rows(conn: sqlite3.Connection, visited_paper_ids: set[str], current_ti
         conn.execute("DELETE FROM publications")
     conn.commit()
 
+    index = NearestTitleIndex(current_titles, key=comparable_title)
     for paper_id, removed_title in removed_rows:
-        similar_title, score = find_similar_title(removed_title, current_titles)
+        similar_title, score = find_similar_title(removed_title, current_titles, index=index)
         removed.append(
             {
                 "id": paper_id,
@@ -156,100 +171,103 @@ def clean_rows(conn: sqlite3.Connection, visited_paper_ids: set[str], current_ti
     return removed
 
 
-def is_cluster_scraped(conn: sqlite3.Connection, cluster_id: str) -> bool:
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM versions WHERE cluster_id = ? LIMIT 1", (cluster_id,))
-    return cur.fetchone() is not None
+def insert_version(
+    conn: sqlite3.Connection,
+    pub_id: str,
+    cluster_id: str,
+    pub_url: str,
+    source_json: str,
+    today: str,
+) -> None:
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO versions
+        (id, publication_id, cluster_id, pub_url, source_json, date_scraped)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (hash_version(cluster_id, pub_url), pub_id, cluster_id, pub_url, source_json, today),
+    )
+
+
+def is_blocked_fetch_error(exc: BaseException) -> bool:
+    # scholarly gives up with MaxTriesExceededException once every attempt hit a CAPTCHA.
+    return (
+        isinstance(exc, ScholarCaptchaError)
+        or type(exc).__name__ == "MaxTriesExceededException"
+        or "captcha" in str(exc).lower()
+    )
+
+
+def version_fetch_scheduler(sleep_range: tuple[float, float], workers: int = VERSION_FETCH_WORKERS) -> FetchScheduler:
+    rate, jitter = interval_rate(sleep_range)
+    return FetchScheduler(
+        workers=workers,
+        rate_per_host=rate,
+        jitter=jitter,
+        retry_on=(ScholarCaptchaError,),
+    )
 
 
-def scrape_versions(conn: sqlite3.Connection, sleep_range: tuple[float, float] = (10, 15), today: str | None = None) -> int:
+def scrape_versions(
+    conn: sqlite3.Connection,
+    sleep_range: tuple[float, float] = (10, 15),
+    today: str | None = None,
+    commit_every: int = 10,
+    scheduler: FetchScheduler | None = None,
+    run_id: int | None = None,
+) -> int:
     scholarly = _scholarly()
     today = today or today_string()
-    cur = conn.cursor()
-    cur.execute("SELECT id, title, full_json FROM publications")
-    rows = cur.fetchall()
-
-    to_scrape = []
-    for pub_id, title, full_json in rows:
-        data = json.loads(full_json)
-        for cluster_id in data.get("cites_id", []):
-            if not is_cluster_scraped(conn, cluster_id):
-                to_scrape.append((pub_id, title, cluster_id))
-
-    for pub_id, title, cluster_id in tqdm(to_scrape, desc="Cluster versions"):
-        if is_cluster_scraped(conn, cluster_id):
-            continue
+    migrate_database(conn)
+    to_scrape = load_unscraped_clusters(conn)
+
+    # A cluster cited by several publications is scraped once, for the first of them.
+    units = []
+    seen: set[str] = set()
+    for pub_id, _title, cluster_id in to_scrape:
+        if cluster_id not in seen:
+            seen.add(cluster_id)
+            units.append(FetchUnit(key=cluster_id, payload=pub_id))
+
+    def fetch(unit: FetchUnit) -> list[dict] | dict:
         try:
-            results = scholarly.search_pubs_custom_url(f"/scholar?cluster={cluster_id}")
-            found = 0
-            for result in results:
-                pub_url = result.get("pub_url", "")
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO versions
-                    (id, publication_id, cluster_id, pub_url, source_json, date_scraped)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        hash_version(cluster_id, pub_url),
-                        pub_id,
-                        cluster_id,
-                        pub_url,
-                        json.dumps(result),
-                        today,
-                    ),
-                )
-                found += 1
-            if found == 0:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO versions
-                    (id, publication_id, cluster_id, pub_url, source_json, date_scraped)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        hash_version(cluster_id, "__empty__"),
-                        pub_id,
-                        cluster_id,
-                        "__empty__",
-                        "{}",
-                        today,
-                    ),
-                )
-            conn.commit()
+            return list(scholarly.search_pubs_custom_url(f"/scholar?cluster={unit.key}"))
         except Exception as exc:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO versions
-                (id, publication_id, cluster_id, pub_url, source_json, date_scraped)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    hash_version(cluster_id, "__error__"),
-                    pub_id,
-                    cluster_id,
-                    "__error__",
-                    json.dumps({"error": str(exc)}),
-                    today,
-                ),
-            )
+            if is_blocked_fetch_error(exc):
+                raise ScholarCaptchaError(str(exc)) from exc
+            return {"error": str(exc)}
+
+    # Advanced once per stored cluster; works with the tqdm fallback too.
+    progress = iter(tqdm(range(len(units)), desc="Cluster versions"))
+    pending = 0
+
+    def store(unit: FetchUnit, results: list[dict] | dict) -> None:
+        nonlocal pending
+        pub_id, cluster_id = unit.payload, unit.key
+        if run_id is not None:
+            mark_ingest_unit(conn, run_id, "cluster", cluster_id)
+        if isinstance(results, dict):
+            insert_version(conn, pub_id, cluster_id, "__error__", json.dumps(results), today)
+        elif not results:
+            insert_version(conn, pub_id, cluster_id, "__empty__", "{}", today)
+        for result in results if isinstance(results, list) else ():
+            insert_version(conn, pub_id, cluster_id, result.get("pub_url", ""), json.dumps(result), today)
+        pending += 1
+        if pending >= commit_every:
             conn.commit()
-        time.sleep(random.uniform(*sleep_range))
-    return len(to_scrape)
+            pending = 0
+        next(progress, None)
 
+    scheduler = scheduler or version_fetch_scheduler(sleep_range)
+    try:
+        # Clusters still blocked after backoff are left unscraped for the next run.
+        scheduler.run(units, fetch, store)
+    finally:
+        conn.commit()
+    return len(to_scrape)
 
-def refresh_profile(
-    conn: sqlite3.Connection,
-    scholar_user_id: str | None = None,
-    profile_sleep_seconds: float = 1.0,
-    version_sleep_range: tuple[float, float] = (10, 15),
-) -> dict:
-    scholarly = _scholarly()
-    scholar_user_id = scholar_user_id or get_scholar_user_id()
-    today = today_string()
-    ensure_base_tables(conn)
-    preflight_scholar_access(scholar_user_id)
 
+def fetch_profile_listing(scholarly, scholar_user_id: str) -> dict:
     try:
         author = scholarly.search_author_id(scholar_user_id)
         author = scholarly.fill(author)
@@ -261,31 +279,98 @@ def refresh_profile(
                 "This usually means Scholar returned a blocked or changed page."
             ) from exc
         raise
+    return {"name": author.get("name", ""), "publications": author.get("publications", [])}
+
+
+def refresh_profile(
+    conn: sqlite3.Connection,
+    scholar_user_id: str | None = None,
+    profile_sleep_seconds: float = 1.0,
+    version_sleep_range: tuple[float, float] = (10, 15),
+) -> dict:
+    """Sync the profile into the DB, resuming the last unfinished run if any.
+
+    Each step is recorded in `ingest_runs` once it completes. A resumed run
+    reuses the stored profile listing instead of fetching it again; papers
+    already in `publications` and clusters with stored versions are skipped
+    as in any run, so resuming needs no per-unit state. `ingest_run_units`
+    only records which papers and clusters each run fetched. `clean_rows`
+    only ever runs against a complete listing after every paper in it was
+    filled.
+    """
+    scholarly = _scholarly()
+    scholar_user_id = scholar_user_id or get_scholar_user_id()
+    today = today_string()
+    migrate_database(conn)
+    resume_since = (datetime.today() - timedelta(days=INGEST_RUN_RESUME_DAYS)).strftime("%Y-%m-%d")
+    run = open_ingest_run(conn, scholar_user_id, today, resume_since=resume_since)
+    resumed_from_step = run["step"] if run["resumed"] else None
+
+    if not ingest_step_done(run, "listed"):
+        preflight_scholar_access(scholar_user_id)
+        advance_ingest_run(conn, run, "listed", today, profile=fetch_profile_listing(scholarly, scholar_user_id))
+    author = run["profile"]
 
     scraped_ids = set()
     current_titles = []
-    inserted = 0
-    for paper in tqdm(author.get("publications", []), desc="Profile publications"):
+    to_fill = []
+    for paper in author["publications"]:
         title = paper.get("bib", {}).get("title", "")
         if not title:
             continue
         paper_id = hash_title(title)
         scraped_ids.add(paper_id)
         current_titles.append(title)
-        if is_paper_exists(conn, paper_id):
-            continue
-        time.sleep(profile_sleep_seconds)
-        insert_paper(conn, scholarly.fill(paper), today)
-        inserted += 1
+        if not is_paper_exists(conn, paper_id):
+            to_fill.append(FetchUnit(key=paper_id, payload=paper))
+
+    def fill(unit: FetchUnit) -> dict:
+        try:
+            return scholarly.fill(unit.payload)
+        except Exception as exc:
+            if is_blocked_fetch_error(exc):
+                raise ScholarCaptchaError(str(exc)) from exc
+            raise
+
+    progress = iter(tqdm(range(len(to_fill)), desc="Profile publications"))
+
+    def store(unit: FetchUnit, paper: dict) -> None:
+        mark_ingest_unit(conn, run["id"], "paper", unit.key)
+        insert_paper(conn, paper, today)
+        next(progress, None)
+
+    inserted = 0
+    if not ingest_step_done(run, "filled"):
+        rate = 1.0 / profile_sleep_seconds if profile_sleep_seconds > 0 else None
+        report = FetchScheduler(
+            workers=VERSION_FETCH_WORKERS,
+            rate_per_host=rate,
+            retry_on=(ScholarCaptchaError,),
+        ).run(to_fill, fill, store)
+        inserted = len(report.results)
+        if report.failures:
+            # The run stays at "listed"; the next call fills only what is still missing.
+            raise next(iter(report.failures.values()))
+        advance_ingest_run(conn, run, "filled", today)
+
+    removed = []
+    if not ingest_step_done(run, "cleaned"):
+        if not scraped_ids:
+            raise ScholarFetchError(
+                "The profile listing has no titled publications; refusing to remove every row from the database."
+            )
+        removed = clean_rows(conn, scraped_ids, current_titles)
+        advance_ingest_run(conn, run, "cleaned", today)
 
-    removed = clean_rows(conn, scraped_ids, current_titles)
-    scraped_versions = scrape_versions(conn, sleep_range=version_sleep_range, today=today)
+    scraped_versions = scrape_versions(conn, sleep_range=version_sleep_range, today=today, run_id=run["id"])
+    advance_ingest_run(conn, run, "done", today)
     return {
         "author_name": author.get("name", ""),
-        "profile_paper_count": len(author.get("publications", [])),
+        "profile_paper_count": len(author["publications"]),
         "inserted_publications": inserted,
         "removed_publications": removed,
         "scraped_cluster_count": scraped_versions,
+        "resumed_from_step": resumed_from_step,
     }
 
 
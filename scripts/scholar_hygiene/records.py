@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class CoauthorPublication(NamedTuple):
+    """One publication on a cached coauthor profile, reduced to what detectors read."""
+
+    coauthor_name: str
+    title: str
+    authors: str
+    year: object
+    identifiers: tuple[str, ...]
+    num_citations: object = 0
+
+
+def publication_identifier_set(record: dict) -> set[str]:
+    if "identifiers" in record:
+        return set(record["identifiers"])
+    identifiers = set()
+    full_json = record.get("full_json", {})
+    bib = full_json.get("bib", {})
+    for key in ("doi", "eprint", "arxiv"):
+        value = bib.get(key) or record.get(key)
+        if value:
+            identifiers.add(str(value).lower())
+    for key in ("pub_url", "url"):
+        value = full_json.get(key) or bib.get(key) or record.get(key)
+        if value:
+            lowered = str(value).lower()
+            identifiers.add(lowered)
+            if "arxiv.org/abs/" in lowered:
+                identifiers.add(lowered.rsplit("/", 1)[-1])
+    return identifiers
+
+
+def coauthor_publication_like(publication: dict) -> dict:
+    return {
+        "title": publication.get("bib", {}).get("title", ""),
+        "author": publication.get("bib", {}).get("author", ""),
+        "year": publication.get("bib", {}).get("pub_year", ""),
+        "full_json": publication,
+    }
+
+
+def coauthor_publication_record(coauthor_name: str, publication: dict) -> CoauthorPublication:
+    like = coauthor_publication_like(publication)
+    return CoauthorPublication(
+        coauthor_name=coauthor_name,
+        title=like["title"],
+        authors=like["author"],
+        year=like["year"],
+        identifiers=tuple(sorted(publication_identifier_set(like))),
+        num_citations=publication.get("num_citations", 0),
+    )
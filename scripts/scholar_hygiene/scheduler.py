@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+DEFAULT_HOST = "scholar.google.com"
+
+
+@dataclass
+class FetchUnit:
+    key: str
+    payload: Any = None
+    host: str = DEFAULT_HOST
+
+
+@dataclass
+class FetchReport:
+    results: dict[str, Any] = field(default_factory=dict)
+    failures: dict[str, BaseException] = field(default_factory=dict)
+
+
+class TokenBucket:
+    """At most `rate` acquisitions per second per host, `capacity` in a burst.
+
+    `rate=None` disables the limit. `jitter` adds a uniform random wait of up
+    to that many seconds after each acquisition, and `pause` blocks the bucket
+    entirely (used for CAPTCHA backoff).
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        *,
+        capacity: float = 1.0,
+        jitter: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.tokens = capacity
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+        self.tokens = 0.0
+        self.updated = self.paused_until
+
+    async def acquire(self, sleep: Callable[[float], Awaitable[None]]) -> None:
+        async with self.lock:
+            while True:
+                now = self.clock()
+                wait = self.paused_until - now
+                if wait <= 0:
+                    if self.rate is None:
+                        break
+                    self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    wait = (1 - self.tokens) / self.rate
+                await sleep(wait)
+            if self.jitter:
+                await sleep(self.rng.uniform(0, self.jitter))
+
+
+class FetchScheduler:
+    """Run blocking fetches on a bounded worker pool, rate-limited per host.
+
+    `fetch(unit)` runs in a worker thread; `on_result(unit, result)` runs on
+    the event loop thread, so it may write to a SQLite connection owned by the
+    caller. Exceptions listed in `retry_on` pause the unit's host for a
+    jittered exponential backoff and are retried up to `max_retries` times;
+    anything else fails the unit immediately.
+
+    The scholarly client is a module-level singleton and not thread-safe, so
+    fetches through it must keep the default single worker; more workers only
+    make sense when each fetch uses its own client.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 1,
+        rate_per_host: float | None = None,
+        burst: float = 1.0,
+        jitter: float = 0.0,
+        retry_on: tuple[type[BaseException], ...] = (),
+        max_retries: int = 3,
+        backoff_base: float = 60.0,
+        backoff_max: float = 900.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(
+                self.rate_per_host,
+                capacity=self.burst,
+                jitter=self.jitter,
+                clock=self.clock,
+                rng=self.rng,
+            )
+        return self.buckets[host]
+
+    def backoff_delay(self, attempt: int) -> float:
+        return min(self.backoff_max, self.backoff_base * 2**attempt) * self.rng.uniform(0.5, 1.5)
+
+    async def run_async(
+        self,
+        units: list[FetchUnit],
+        fetch: Callable[[FetchUnit], Any],
+        on_result: Callable[[FetchUnit, Any], None] | None = None,
+    ) -> FetchReport:
+        # Buckets hold an asyncio.Lock, so they must not outlive the loop.
+        self.buckets = {}
+        report = FetchReport()
+        queue: asyncio.Queue[FetchUnit] = asyncio.Queue()
+        for unit in units:
+            queue.put_nowait(unit)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    unit = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                bucket = self.bucket(unit.host)
+                attempt = 0
+                while True:
+                    await bucket.acquire(self.sleep)
+                    try:
+                        result = await asyncio.to_thread(fetch, unit)
+                    except self.retry_on as exc:
+                        if attempt >= self.max_retries:
+                            report.failures[unit.key] = exc
+                            break
+                        bucket.pause(self.backoff_delay(attempt))
+                        attempt += 1
+                        continue
+                    except Exception as exc:
+                        report.failures[unit.key] = exc
+                        break
+                    report.results[unit.key] = result
+                    if on_result is not None:
+                        on_result(unit, result)
+                    break
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, queue.qsize()) or 1)))
+        return report
+
+    def run(
+        self,
+        units: list[FetchUnit],
+        fetch: Callable[[FetchUnit], Any],
+        on_result: Callable[[FetchUnit, Any], None] | None = None,
+    ) -> FetchReport:
+        return asyncio.run(self.run_async(units, fetch, on_result))
+
+
+def interval_rate(sleep_range: tuple[float, float]) -> tuple[float | None, float]:
+    """`(rate, jitter)` that spaces requests like `time.sleep(random.uniform(*sleep_range))`."""
+    low, high = sleep_range
+    if high <= 0:
+        return None, 0.0
+    if low <= 0:
+        return None, high
+    return 1.0 / low, high - low
@@ -5,7 +5,7 @@ import re
 from pathlib import Path
 from typing import Iterable
 
-from .config import SCHOLAR_UI_ARTIFACT_DIR
+from .config import ADD_ARTICLES_CACHE_JSON_FILE, SCHOLAR_UI_ARTIFACT_DIR
 
 
 def extract_year(text: str) -> str:
@@ -13,41 +13,133 @@ def extract_year(text: str) -> str:
     return match.group(0) if match else ""
 
 
-def load_add_articles_candidates(artifact_dir: Path | None = None) -> list[dict]:
+ADD_ARTICLES_CACHE_VERSION = 1
+
+# In-process memo so detection and review in one command parse nothing twice.
+_loaded_candidates: dict[str, tuple[dict, list[dict]]] = {}
+
+
+def artifact_signatures(base_dir: Path) -> dict[str, dict]:
+    signatures = {}
+    for path in sorted(base_dir.glob("*_add_articles.json")):
+        stat = path.stat()
+        signatures[str(path)] = {"mtime": stat.st_mtime, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    return signatures
+
+
+def read_artifact_candidates(path: Path, mtime: float) -> list[dict]:
+    try:
+        payload = json.loads(path.read_text())
+    except json.JSONDecodeError:
+        return []
+    if not payload.get("rows"):
+        # An empty Add Articles capture is not strong enough evidence to
+        # supersede previously captured positive rows for the same query.
+        return []
+    candidates = []
+    for row in payload.get("rows", []):
+        candidate = dict(row)
+        candidate["artifact_file"] = str(path)
+        candidate["search_query"] = payload.get("search_query", "")
+        candidate["captured_url"] = payload.get("captured_url", "")
+        candidate["result_stats"] = payload.get("result_stats", {})
+        candidate["year"] = extract_year(row.get("authors_venue", ""))
+        candidate["author"] = row.get("authors_venue", "")
+        candidate["artifact_mtime"] = mtime
+        candidates.append(candidate)
+    return candidates
+
+
+def candidate_key(candidate: dict) -> str:
+    return candidate.get("doc_id") or f"{candidate.get('title','')}|{candidate.get('search_query','')}"
+
+
+def merge_candidates(candidates_by_key: dict[str, dict], candidates: Iterable[dict]) -> None:
+    for candidate in candidates:
+        key = candidate_key(candidate)
+        existing = candidates_by_key.get(key)
+        if existing is None or candidate["artifact_mtime"] >= existing.get("artifact_mtime", 0):
+            candidates_by_key[key] = candidate
+
+
+def load_add_articles_cache(cache_file: Path | None, base_dir: Path) -> dict:
+    if cache_file is None or not cache_file.exists():
+        return {}
+    try:
+        cache = json.loads(cache_file.read_text())
+    except json.JSONDecodeError:
+        return {}
+    if cache.get("version") != ADD_ARTICLES_CACHE_VERSION or cache.get("artifact_dir") != str(base_dir):
+        return {}
+    return cache
+
+
+def load_add_articles_candidates(artifact_dir: Path | None = None, cache_file: Path | None = None) -> list[dict]:
+    """Deduplicated Add Articles rows from every capture in `artifact_dir`.
+
+    Parsed rows are kept per artifact in `cache_file` (by default only for the
+    default artifact directory), keyed by path, mtime and size, so only new or
+    changed captures are read. When captures are only appended, the doc_id
+    dedup result is carried over and just the new rows are merged into it.
+    """
     base_dir = artifact_dir or SCHOLAR_UI_ARTIFACT_DIR
+    if artifact_dir is None and cache_file is None:
+        cache_file = ADD_ARTICLES_CACHE_JSON_FILE
     if not base_dir.exists():
         return []
 
-    candidates_by_key: dict[str, dict] = {}
-    for path in sorted(base_dir.glob("*_add_articles.json")):
-        try:
-            payload = json.loads(path.read_text())
-        except json.JSONDecodeError:
-            continue
-        if not payload.get("rows"):
-            # An empty Add Articles capture is not strong enough evidence to
-            # supersede previously captured positive rows for the same query.
-            continue
-        for row in payload.get("rows", []):
-            candidate = dict(row)
-            candidate["artifact_file"] = str(path)
-            candidate["search_query"] = payload.get("search_query", "")
-            candidate["captured_url"] = payload.get("captured_url", "")
-            candidate["result_stats"] = payload.get("result_stats", {})
-            candidate["year"] = extract_year(row.get("authors_venue", ""))
-            candidate["author"] = row.get("authors_venue", "")
-            candidate["artifact_mtime"] = path.stat().st_mtime
-            key = candidate.get("doc_id") or f"{candidate.get('title','')}|{candidate.get('search_query','')}"
-            existing = candidates_by_key.get(key)
-            if existing is None or candidate["artifact_mtime"] >= existing.get("artifact_mtime", 0):
-                candidates_by_key[key] = candidate
-    return sorted(
+    signatures = artifact_signatures(base_dir)
+    memo = _loaded_candidates.get(str(base_dir))
+    if memo is not None and memo[0] == signatures:
+        return [dict(candidate) for candidate in memo[1]]
+
+    cache = load_add_articles_cache(cache_file, base_dir)
+    cached_files = cache.get("files", {})
+    files = {}
+    for path, signature in signatures.items():
+        cached = cached_files.get(path)
+        if cached is not None and cached["signature"] == signature:
+            files[path] = cached
+        else:
+            files[path] = {"signature": signature, "candidates": read_artifact_candidates(Path(path), signature["mtime"])}
+
+    new_paths = [path for path in files if path not in cached_files or files[path] is not cached_files[path]]
+    appended_only = (
+        "winners" in cache
+        and set(cached_files) <= set(files)
+        and all(path > max(cached_files, default="") for path in new_paths)
+    )
+    if appended_only:
+        # Artifacts are merged in path order, so appending later paths keeps the same winners.
+        candidates_by_key = dict(cache["winners"])
+        for path in new_paths:
+            merge_candidates(candidates_by_key, files[path]["candidates"])
+    else:
+        candidates_by_key = {}
+        for path in files:
+            merge_candidates(candidates_by_key, files[path]["candidates"])
+
+    candidates = sorted(
         candidates_by_key.values(),
         key=lambda candidate: (
             candidate.get("search_query", "").lower(),
             candidate.get("title", "").lower(),
         ),
     )
+    if cache_file is not None and (new_paths or set(cached_files) != set(files)):
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(
+            json.dumps(
+                {
+                    "version": ADD_ARTICLES_CACHE_VERSION,
+                    "artifact_dir": str(base_dir),
+                    "files": files,
+                    "winners": candidates_by_key,
+                }
+            )
+        )
+    _loaded_candidates[str(base_dir)] = (signatures, candidates)
+    return [dict(candidate) for candidate in candidates]
 
 
 def format_add_articles_candidates(
@@ -56,14 +56,16 @@ def author_last_names(author_text: str) -> set[str]:
     return last_names
 
 
-def author_overlap_score(left: str, right: str) -> float:
-    left_names = author_last_names(left)
-    right_names = author_last_names(right)
+def last_name_overlap(left_names: set[str], right_names: set[str]) -> float:
     if not left_names or not right_names:
         return 0.0
     return len(left_names & right_names) / len(left_names | right_names)
 
 
+def author_overlap_score(left: str, right: str) -> float:
+    return last_name_overlap(author_last_names(left), author_last_names(right))
+
+
 def author_shared_last_name_count(left: str, right: str) -> int:
     left_names = author_last_names(left)
     right_names = author_last_names(right)
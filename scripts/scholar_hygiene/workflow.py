@@ -4,15 +4,11 @@ import json
 from datetime import datetime
 
 from .coauthors import refresh_coauthor_cache
-from .config import ISSUES_JSON_FILE, STATE_JSON_FILE
-from .db import connect, ensure_base_tables, load_cached_coauthors, load_publications, load_versions_for_publication_ids
-from .detector import (
-    detect_metadata_anomalies,
-    detect_missing_profile_articles,
-    detect_under_clustered_articles,
-    write_issue_artifacts,
-)
+from .config import DB_FILE, ISSUES_JSON_FILE, STATE_JSON_FILE
+from .db import connect, iter_coauthor_publications, load_publications, load_versions_for_publication_ids, migrate_database
+from .detector import CoauthorRecordFilter, write_issue_artifacts
 from .expected import load_expected_papers
+from .incremental import detect_issues_incrementally, load_detection_state, save_detection_state
 from .ui_artifacts import load_add_articles_candidates
 from .utils import title_similarity
 
@@ -21,7 +17,7 @@ def run_refresh(refresh_profile_data: bool = True, refresh_coauthors_data: bool
     from .ingest import refresh_profile, today_string
 
     conn = connect()
-    ensure_base_tables(conn)
+    migrate_database(conn)
     summary = {"refreshed_profile": None, "refreshed_coauthors": None}
     try:
         if refresh_profile_data:
@@ -33,39 +29,52 @@ def run_refresh(refresh_profile_data: bool = True, refresh_coauthors_data: bool
         conn.close()
 
 
-def collect_issues() -> list[dict]:
+def run_migrate() -> dict:
     conn = connect()
     try:
-        ensure_base_tables(conn)
-        publications = load_publications(conn)
-        versions_by_publication = load_versions_for_publication_ids(
-            conn, {publication["id"] for publication in publications}
-        )
-        cached_coauthors = load_cached_coauthors(conn)
+        migrate_database(conn)
+        (publication_count,) = conn.execute("SELECT COUNT(*) FROM publications").fetchone()
     finally:
         conn.close()
+    return {"db_file": str(DB_FILE), "publication_count": publication_count}
+
 
+def collect_issues(full: bool = False) -> list[dict]:
     expected_papers = load_expected_papers()
     add_articles_candidates = load_add_articles_candidates()
 
-    missing = detect_missing_profile_articles(
+    # Detection only reads: rows not yet normalized by `refresh`/`migrate` are parsed from JSON,
+    # and a DB that has not been created yet reads as empty.
+    publications: list[dict] = []
+    versions_by_publication: dict[str, list[dict]] = {}
+    cached_coauthors = []
+    if DB_FILE.exists():
+        conn = connect(read_only=True)
+        try:
+            publications = load_publications(conn, include_json=False)
+            versions_by_publication = load_versions_for_publication_ids(
+                conn, {publication["id"] for publication in publications}, include_json=False
+            )
+            # Only coauthor publications some detector could shortlist are kept in memory.
+            coauthor_filter = CoauthorRecordFilter(expected_papers, publications)
+            cached_coauthors = [record for record in iter_coauthor_publications(conn) if coauthor_filter.keeps(record)]
+        finally:
+            conn.close()
+
+    issues, detection_state = detect_issues_incrementally(
         expected_papers,
         publications,
+        versions_by_publication,
         cached_coauthors,
-        add_articles_candidates=add_articles_candidates,
+        add_articles_candidates,
+        previous_state=None if full else load_detection_state(),
     )
-    clusters = detect_under_clustered_articles(
-        publications,
-        cached_coauthors,
-        add_articles_candidates=add_articles_candidates,
-    )
-    metadata = detect_metadata_anomalies(publications, versions_by_publication, expected_papers)
-
     issues = sorted(
-        missing + clusters + metadata,
+        issues,
         key=lambda issue: (-issue["score"], issue["type"], issue["title"].lower()),
     )
     write_issue_artifacts(issues, generated_at=datetime.now().isoformat())
+    save_detection_state(detection_state)
     return issues
 
 
@@ -175,10 +184,10 @@ def review_issues(issue_type: str | None = None, limit: int = 20) -> str:
     return "\n".join(lines)
 
 
-def verify_issues() -> dict:
+def verify_issues(full: bool = False) -> dict:
     previous_state = json.loads(STATE_JSON_FILE.read_text()) if STATE_JSON_FILE.exists() else {}
     previous_ids = set(previous_state.get("issue_ids", []))
-    issues = collect_issues()
+    issues = collect_issues(full=full)
     current_ids = {issue["id"] for issue in issues}
     return {
         "previous_issue_count": len(previous_ids),
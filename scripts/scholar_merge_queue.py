@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import hashlib
 import json
+import math
 import re
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 from scripts.investigate_scholar_ui import default_artifact_dir
@@ -46,6 +49,14 @@ DIGIT_WORDS = {
     "9": "nine",
 }
 
+DIGIT_WORD_PATTERN = re.compile(r"\b[0-9]\b")
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+
+TITLE_FEATURE_CACHE_SIZE = 8192
+
+COMMON_TOKEN_MIN_ROWS = 32
+COMMON_TOKEN_FRACTION = 0.05
+
 ORDINAL_TOKENS = {
     "first",
     "second",
@@ -75,76 +86,101 @@ def parse_citations(text: str) -> int:
 
 def normalize_family_text(text: str) -> str:
     text = normalize_space(text).casefold()
-    for digit, word in DIGIT_WORDS.items():
-        text = re.sub(rf"\b{re.escape(digit)}\b", word, text)
-    return re.sub(r"[^a-z0-9]+", " ", text).strip()
-
-
-def family_tokens(title: str) -> set[str]:
-    tokens = []
-    for token in normalize_family_text(title).split():
+    text = DIGIT_WORD_PATTERN.sub(lambda match: DIGIT_WORDS[match.group(0)], text)
+    return NON_ALNUM_PATTERN.sub(" ", text).strip()
+
+
+@dataclass(frozen=True)
+class TitleFeatures:
+    title: str
+    normalized: str
+    normalized_words: tuple[str, ...]
+    tokens: frozenset[str]
+    ordered_tokens: tuple[str, ...]
+    ordinals: frozenset[str]
+    colon_prefix: str | None
+    colon_suffix: str | None
+
+
+@lru_cache(maxsize=TITLE_FEATURE_CACHE_SIZE)
+def title_features(title: str) -> TitleFeatures:
+    normalized = normalize_family_text(title)
+    ordered = []
+    for token in normalized.split():
         if len(token) <= 1:
             continue
         if token in STOPWORDS:
             continue
         if re.fullmatch(r"(19|20)\d{2}", token):
             continue
-        tokens.append(token)
-    return set(tokens)
+        ordered.append(token)
+    colon_prefix = colon_suffix = None
+    if ":" in title:
+        colon_prefix, colon_suffix = [normalize_family_text(part) for part in title.split(":", 1)]
+    return TitleFeatures(
+        title=title,
+        normalized=normalized,
+        normalized_words=tuple(normalized.split()),
+        tokens=frozenset(ordered),
+        ordered_tokens=tuple(ordered),
+        ordinals=frozenset(token for token in ordered if token in ORDINAL_TOKENS),
+        colon_prefix=colon_prefix,
+        colon_suffix=colon_suffix,
+    )
 
 
-def ordered_family_tokens(title: str) -> list[str]:
-    tokens = []
-    for token in normalize_family_text(title).split():
-        if len(token) <= 1:
-            continue
-        if token in STOPWORDS:
-            continue
-        if re.fullmatch(r"(19|20)\d{2}", token):
-            continue
-        tokens.append(token)
-    return tokens
+def as_title_features(title: str | TitleFeatures) -> TitleFeatures:
+    if isinstance(title, TitleFeatures):
+        return title
+    return title_features(title)
+
 
+def family_tokens(title: str | TitleFeatures) -> set[str]:
+    return set(as_title_features(title).tokens)
 
-def ordinal_tokens(title: str) -> set[str]:
-    return {token for token in ordered_family_tokens(title) if token in ORDINAL_TOKENS}
 
+def ordered_family_tokens(title: str | TitleFeatures) -> list[str]:
+    return list(as_title_features(title).ordered_tokens)
 
-def titles_pass_family_heuristics(left_title: str, right_title: str) -> bool:
-    left_ordinals = ordinal_tokens(left_title)
-    right_ordinals = ordinal_tokens(right_title)
-    if left_ordinals and right_ordinals and left_ordinals != right_ordinals:
+
+def ordinal_tokens(title: str | TitleFeatures) -> set[str]:
+    return set(as_title_features(title).ordinals)
+
+
+def titles_pass_family_heuristics(left_title: str | TitleFeatures, right_title: str | TitleFeatures) -> bool:
+    left = as_title_features(left_title)
+    right = as_title_features(right_title)
+    if left.ordinals and right.ordinals and left.ordinals != right.ordinals:
         return False
-    left_normalized = normalize_family_text(left_title)
-    right_normalized = normalize_family_text(right_title)
-    if ":" in left_title and ":" in right_title:
-        left_prefix, left_suffix = [normalize_family_text(part) for part in left_title.split(":", 1)]
-        right_prefix, right_suffix = [normalize_family_text(part) for part in right_title.split(":", 1)]
-        if left_prefix == right_prefix and left_suffix and right_suffix:
+    if left.colon_prefix is not None and right.colon_prefix is not None:
+        if left.colon_prefix == right.colon_prefix and left.colon_suffix and right.colon_suffix:
+            left_suffix = title_features(left.colon_suffix)
+            right_suffix = title_features(right.colon_suffix)
             suffix_similarity = family_similarity(left_suffix, right_suffix)
             suffix_jaccard = family_jaccard_similarity(left_suffix, right_suffix)
             if suffix_similarity < 0.74 or suffix_jaccard < 0.74:
                 return False
-    if left_normalized.startswith(right_normalized) or right_normalized.startswith(left_normalized):
-        shorter, longer = sorted([left_normalized, right_normalized], key=len)
-        extra_tokens = [token for token in longer.split() if token not in shorter.split()]
+    if left.normalized.startswith(right.normalized) or right.normalized.startswith(left.normalized):
+        shorter, longer = sorted([left, right], key=lambda features: len(features.normalized))
+        shorter_words = set(shorter.normalized_words)
+        extra_tokens = [token for token in longer.normalized_words if token not in shorter_words]
         if len(extra_tokens) >= 4:
             return False
     return True
 
 
-def family_similarity(left_title: str, right_title: str) -> float:
-    left_tokens = family_tokens(left_title)
-    right_tokens = family_tokens(right_title)
+def family_similarity(left_title: str | TitleFeatures, right_title: str | TitleFeatures) -> float:
+    left_tokens = as_title_features(left_title).tokens
+    right_tokens = as_title_features(right_title).tokens
     if not left_tokens or not right_tokens:
         return 0.0
     overlap = len(left_tokens & right_tokens)
     return overlap / min(len(left_tokens), len(right_tokens))
 
 
-def family_jaccard_similarity(left_title: str, right_title: str) -> float:
-    left_tokens = family_tokens(left_title)
-    right_tokens = family_tokens(right_title)
+def family_jaccard_similarity(left_title: str | TitleFeatures, right_title: str | TitleFeatures) -> float:
+    left_tokens = as_title_features(left_title).tokens
+    right_tokens = as_title_features(right_title).tokens
     if not left_tokens or not right_tokens:
         return 0.0
     overlap = len(left_tokens & right_tokens)
@@ -152,20 +188,73 @@ def family_jaccard_similarity(left_title: str, right_title: str) -> float:
     return overlap / union if union else 0.0
 
 
+def common_token_cutoff(row_count: int) -> int:
+    return max(COMMON_TOKEN_MIN_ROWS, int(row_count * COMMON_TOKEN_FRACTION))
+
+
+def candidate_family_pairs(token_sets: list[frozenset[str]], *, min_similarity: float) -> list[tuple[int, int]]:
+    # Tokens held by more than `common_token_cutoff` rows stay out of the index.
+    # A pair is proposed only if its rare-token overlap could still clear the
+    # threshold; rows made mostly of common tokens fall back to a full scan.
+    row_count = len(token_sets)
+    if min_similarity <= 0:
+        return [(left, right) for left in range(row_count) for right in range(left + 1, row_count)]
+
+    document_frequency: dict[str, int] = {}
+    for tokens in token_sets:
+        for token in tokens:
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    cutoff = common_token_cutoff(row_count)
+    common_tokens = {token for token, count in document_frequency.items() if count > cutoff}
+
+    postings: dict[str, list[int]] = {}
+    rare_required = []
+    fallback_rows = []
+    for index, tokens in enumerate(token_sets):
+        common_count = len(tokens & common_tokens)
+        required = math.ceil(min_similarity * len(tokens) - 1e-9) - common_count
+        rare_required.append(required)
+        if tokens and required <= 0:
+            fallback_rows.append(index)
+        for token in tokens - common_tokens:
+            postings.setdefault(token, []).append(index)
+
+    shared_counts: dict[tuple[int, int], int] = {}
+    for row_ids in postings.values():
+        for position, left in enumerate(row_ids):
+            for right in row_ids[position + 1 :]:
+                shared_counts[(left, right)] = shared_counts.get((left, right), 0) + 1
+
+    pairs = set()
+    for (left, right), shared in shared_counts.items():
+        smaller = left if len(token_sets[left]) <= len(token_sets[right]) else right
+        if shared >= rare_required[smaller]:
+            pairs.add((left, right))
+    for index in fallback_rows:
+        for other in range(row_count):
+            if other == index or not token_sets[other] or len(token_sets[other]) < len(token_sets[index]):
+                continue
+            pairs.add((min(index, other), max(index, other)))
+    return sorted(pairs)
+
+
 def discover_merge_families(rows: list[dict], *, min_similarity: float = 0.74) -> list[list[dict]]:
     rows = [row for row in rows if row.get("row_id") and row.get("title")]
     neighbors: dict[str, set[str]] = {row["row_id"]: set() for row in rows}
     rows_by_id = {row["row_id"]: row for row in rows}
 
-    for index, left in enumerate(rows):
-        for right in rows[index + 1 :]:
-            if not titles_pass_family_heuristics(left.get("title", ""), right.get("title", "")):
-                continue
-            score = family_similarity(left.get("title", ""), right.get("title", ""))
-            if score < min_similarity:
-                continue
-            neighbors[left["row_id"]].add(right["row_id"])
-            neighbors[right["row_id"]].add(left["row_id"])
+    features = [title_features(row["title"]) for row in rows]
+    token_sets = [row_features.tokens for row_features in features]
+    for left_index, right_index in candidate_family_pairs(token_sets, min_similarity=min_similarity):
+        left = rows[left_index]
+        right = rows[right_index]
+        if not titles_pass_family_heuristics(features[left_index], features[right_index]):
+            continue
+        score = family_similarity(features[left_index], features[right_index])
+        if score < min_similarity:
+            continue
+        neighbors[left["row_id"]].add(right["row_id"])
+        neighbors[right["row_id"]].add(left["row_id"])
 
     families = []
     visited = set()
@@ -242,35 +331,74 @@ def target_row_ids(item: dict) -> set[str]:
     return {target.get("row_id", "") for target in item.get("targets", []) if target.get("row_id")}
 
 
-def queue_items_refer_to_same_family(existing: dict, discovered: dict) -> bool:
-    existing_label = normalize_family_text(existing.get("family_label", ""))
-    discovered_label = normalize_family_text(discovered.get("family_label", ""))
-    if existing_label != discovered_label:
-        return False
-    overlap = target_row_ids(existing) & target_row_ids(discovered)
-    return bool(overlap)
-
-
-def find_matching_existing_item(existing_items: list[dict], discovered_item: dict) -> dict | None:
-    exact = next((item for item in existing_items if item.get("id") == discovered_item.get("id")), None)
-    if exact is not None:
-        return exact
-    for item in existing_items:
-        if queue_items_refer_to_same_family(item, discovered_item):
-            return item
-    return None
+def family_label_key(item: dict) -> str:
+    return title_features(item.get("family_label", "")).normalized
+
+
+class QueueItemIndex:
+    """Positions of queue items by id, normalized family label and target row id.
+
+    A discovered family matches the existing item with the same id, else the
+    first item with the same normalized label that shares a target row.
+    """
+
+    def __init__(self, items: list[dict]) -> None:
+        self.items = items
+        self.positions_by_id: dict[str, int] = {}
+        self.positions_by_label: dict[str, set[int]] = {}
+        self.positions_by_row: dict[str, set[int]] = {}
+        for position, item in enumerate(items):
+            self._add(position, item)
+
+    def _add(self, position: int, item: dict) -> None:
+        item_id = item.get("id")
+        if item_id not in self.positions_by_id or position < self.positions_by_id[item_id]:
+            self.positions_by_id[item_id] = position
+        self.positions_by_label.setdefault(family_label_key(item), set()).add(position)
+        for row_id in target_row_ids(item):
+            self.positions_by_row.setdefault(row_id, set()).add(position)
+
+    def _remove(self, position: int, item: dict) -> None:
+        if self.positions_by_id.get(item.get("id")) == position:
+            del self.positions_by_id[item.get("id")]
+        self.positions_by_label.get(family_label_key(item), set()).discard(position)
+        for row_id in target_row_ids(item):
+            self.positions_by_row.get(row_id, set()).discard(position)
+
+    def find_match(self, discovered_item: dict) -> int | None:
+        position = self.positions_by_id.get(discovered_item.get("id"))
+        if position is not None:
+            return position
+        same_label = self.positions_by_label.get(family_label_key(discovered_item), set())
+        candidates = [
+            position
+            for row_id in target_row_ids(discovered_item)
+            for position in self.positions_by_row.get(row_id, ())
+            if position in same_label
+        ]
+        return min(candidates, default=None)
+
+    def append(self, item: dict) -> None:
+        self.items.append(item)
+        self._add(len(self.items) - 1, item)
+
+    def replace(self, position: int, item: dict) -> None:
+        self._remove(position, self.items[position])
+        self.items[position] = item
+        self._add(position, item)
 
 
 def merge_discovered_items(existing_payload: dict, discovered_items: list[dict]) -> dict:
     existing_items = [dict(item) for item in existing_payload.get("items", [])]
     items_by_id = {item["id"]: item for item in existing_items}
+    index = QueueItemIndex(existing_items)
     for item in discovered_items:
-        existing = find_matching_existing_item(existing_items, item)
-        if existing is None:
+        position = index.find_match(item)
+        if position is None:
             items_by_id[item["id"]] = item
-            existing_items.append(items_by_id[item["id"]])
+            index.append(items_by_id[item["id"]])
             continue
-        updated = dict(existing)
+        updated = dict(existing_items[position])
         old_id = updated["id"]
         updated["id"] = item["id"]
         updated["family_label"] = item["family_label"]
@@ -280,10 +408,7 @@ def merge_discovered_items(existing_payload: dict, discovered_items: list[dict])
         if old_id != item["id"]:
             items_by_id.pop(old_id, None)
         items_by_id[item["id"]] = updated
-        for index, existing_item in enumerate(existing_items):
-            if existing_item.get("id") == old_id:
-                existing_items[index] = updated
-                break
+        index.replace(position, updated)
     items = sorted(items_by_id.values(), key=lambda item: item.get("family_label", "").lower())
     return {"generated_at": utc_now_iso(), "items": items}
 
@@ -300,19 +425,30 @@ def get_queue_item(payload: dict, item_id: str) -> dict:
     raise KeyError(f"Unknown merge queue item id: {item_id}")
 
 
-def update_queue_item_status(
-    payload: dict,
+def approved_items_in_order(items: list[dict], *, limit: int | None = None) -> list[dict]:
+    approved_items = [
+        item
+        for item in items
+        if item.get("status") == "approved" and item.get("approved_by_operator")
+    ]
+    approved_items.sort(key=lambda item: (item.get("approved_at", ""), item.get("family_label", "").lower()))
+    if limit is not None:
+        return approved_items[:limit]
+    return approved_items
+
+
+def validate_queue_status(status: str) -> None:
+    if status not in MERGE_QUEUE_STATUSES:
+        raise ValueError(f"Unsupported merge queue status: {status}")
+
+
+def apply_status_update(
+    item: dict,
     *,
-    item_id: str,
     status: str,
     note: str | None = None,
     approved_by_operator: bool | None = None,
-) -> dict:
-    if status not in MERGE_QUEUE_STATUSES:
-        raise ValueError(f"Unsupported merge queue status: {status}")
-
-    updated_payload = {"generated_at": utc_now_iso(), "items": [dict(item) for item in payload.get("items", [])]}
-    item = get_queue_item(updated_payload, item_id)
+) -> None:
     item["status"] = status
     if note is not None:
         item["review_notes"] = note
@@ -325,31 +461,188 @@ def update_queue_item_status(
         item["approved_by_operator"] = bool(item.get("approved_by_operator", False) and status == "reviewed")
         if status != "reviewed":
             item.pop("approved_at", None)
-    return updated_payload
+
+
+def apply_result_update(item: dict, *, result: dict, status: str, increment_execution_attempts: bool) -> None:
+    item["status"] = status
+    item["result"] = result
+    if increment_execution_attempts:
+        item["execution_attempts"] = int(item.get("execution_attempts", 0)) + 1
+
+
+def apply_verification_update(item: dict, *, verification: dict) -> None:
+    existing_result = dict(item.get("result") or {})
+    existing_result["verification"] = verification
+    item["result"] = existing_result
+
+
+class MergeQueue:
+    """In-memory merge queue with id and status indexes.
+
+    Items are shared with the payload the queue was built from until they are
+    mutated; the first write to an item replaces it with a shallow copy, so the
+    source payload is never modified. Call `save` once per command.
+    """
+
+    def __init__(self, payload: dict | None = None) -> None:
+        payload = payload or {"generated_at": None, "items": []}
+        self.generated_at = payload.get("generated_at")
+        self._extra = {key: value for key, value in payload.items() if key not in {"generated_at", "items"}}
+        self._items: list[dict] = list(payload.get("items", []))
+        self._positions: dict[str, int] = {}
+        self._ids_by_status: dict[str, dict[str, None]] = {}
+        self._touched: set[str] = set()
+        for position, item in enumerate(self._items):
+            item_id = item.get("id")
+            if item_id in self._positions:
+                continue
+            self._positions[item_id] = position
+            self._ids_by_status.setdefault(item.get("status", ""), {})[item_id] = None
+
+    @classmethod
+    def load(cls, path: Path) -> MergeQueue:
+        return cls(load_merge_queue(path))
+
+    def close(self) -> None:
+        # Nothing to release; present so callers can treat both queue stores alike.
+        return None
+
+    def __enter__(self) -> MergeQueue:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def items(self) -> list[dict]:
+        return list(self._items)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._touched)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._positions
+
+    def get(self, item_id: str) -> dict:
+        position = self._positions.get(item_id)
+        if position is None:
+            raise KeyError(f"Unknown merge queue item id: {item_id}")
+        return self._items[position]
+
+    def items_with_status(self, status: str) -> list[dict]:
+        item_ids = sorted(self._ids_by_status.get(status, {}), key=self._positions.__getitem__)
+        return [self._items[self._positions[item_id]] for item_id in item_ids]
+
+    def approved_items(self, *, limit: int | None = None) -> list[dict]:
+        return approved_items_in_order(self.items_with_status("approved"), limit=limit)
+
+    def select(
+        self,
+        *,
+        status: str | None = None,
+        family_type: str | None = None,
+        confidence: str | None = None,
+        contains: str | None = None,
+        exclude_contains: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        return filter_queue_items(
+            self.items_with_status(status) if status else self._items,
+            status=status,
+            family_type=family_type,
+            confidence=confidence,
+            contains=contains,
+            exclude_contains=exclude_contains,
+            limit=limit,
+        )
+
+    def _writable(self, item_id: str) -> dict:
+        item = self.get(item_id)
+        if item_id not in self._touched:
+            item = dict(item)
+            self._items[self._positions[item_id]] = item
+            self._touched.add(item_id)
+        return item
+
+    def _set_status(self, item: dict, status: str) -> None:
+        previous = item.get("status", "")
+        if previous != status:
+            self._ids_by_status.get(previous, {}).pop(item.get("id"), None)
+            self._ids_by_status.setdefault(status, {})[item.get("id")] = None
+        item["status"] = status
+
+    def update_status(
+        self,
+        item_id: str,
+        *,
+        status: str,
+        note: str | None = None,
+        approved_by_operator: bool | None = None,
+    ) -> dict:
+        validate_queue_status(status)
+        item = self._writable(item_id)
+        self._set_status(item, status)
+        apply_status_update(item, status=status, note=note, approved_by_operator=approved_by_operator)
+        return item
+
+    def update_result(
+        self,
+        item_id: str,
+        *,
+        result: dict,
+        status: str,
+        increment_execution_attempts: bool,
+    ) -> dict:
+        validate_queue_status(status)
+        item = self._writable(item_id)
+        self._set_status(item, status)
+        apply_result_update(
+            item,
+            result=result,
+            status=status,
+            increment_execution_attempts=increment_execution_attempts,
+        )
+        return item
+
+    def update_verification(self, item_id: str, *, verification: dict) -> dict:
+        item = self._writable(item_id)
+        apply_verification_update(item, verification=verification)
+        return item
+
+    def to_payload(self) -> dict:
+        generated_at = utc_now_iso() if self.dirty else self.generated_at
+        return {**self._extra, "generated_at": generated_at, "items": list(self._items)}
+
+    def save(self, path: Path) -> None:
+        save_merge_queue(path, self.to_payload())
+
+
+def update_queue_item_status(
+    payload: dict,
+    *,
+    item_id: str,
+    status: str,
+    note: str | None = None,
+    approved_by_operator: bool | None = None,
+) -> dict:
+    queue = MergeQueue(payload)
+    queue.update_status(item_id, status=status, note=note, approved_by_operator=approved_by_operator)
+    return queue.to_payload()
 
 
 def select_next_approved_item(payload: dict) -> dict:
-    approved_items = [
-        item
-        for item in payload.get("items", [])
-        if item.get("status") == "approved" and item.get("approved_by_operator")
-    ]
+    approved_items = approved_items_in_order(payload.get("items", []), limit=1)
     if not approved_items:
         raise RuntimeError("No approved merge queue items found.")
-    approved_items.sort(key=lambda item: (item.get("approved_at", ""), item.get("family_label", "").lower()))
     return approved_items[0]
 
 
 def select_approved_items(payload: dict, *, limit: int | None = None) -> list[dict]:
-    approved_items = [
-        item
-        for item in payload.get("items", [])
-        if item.get("status") == "approved" and item.get("approved_by_operator")
-    ]
-    approved_items.sort(key=lambda item: (item.get("approved_at", ""), item.get("family_label", "").lower()))
-    if limit is not None:
-        return approved_items[:limit]
-    return approved_items
+    return approved_items_in_order(payload.get("items", []), limit=limit)
 
 
 def update_queue_item_result(
@@ -360,15 +653,14 @@ def update_queue_item_result(
     status: str,
     increment_execution_attempts: bool,
 ) -> dict:
-    if status not in MERGE_QUEUE_STATUSES:
-        raise ValueError(f"Unsupported merge queue status: {status}")
-    updated_payload = {"generated_at": utc_now_iso(), "items": [dict(item) for item in payload.get("items", [])]}
-    item = get_queue_item(updated_payload, item_id)
-    item["status"] = status
-    item["result"] = result
-    if increment_execution_attempts:
-        item["execution_attempts"] = int(item.get("execution_attempts", 0)) + 1
-    return updated_payload
+    queue = MergeQueue(payload)
+    queue.update_result(
+        item_id,
+        result=result,
+        status=status,
+        increment_execution_attempts=increment_execution_attempts,
+    )
+    return queue.to_payload()
 
 
 def summarize_verification_output(output: str) -> dict:
@@ -386,12 +678,9 @@ def update_queue_item_verification(
     item_id: str,
     verification: dict,
 ) -> dict:
-    updated_payload = {"generated_at": utc_now_iso(), "items": [dict(item) for item in payload.get("items", [])]}
-    item = get_queue_item(updated_payload, item_id)
-    existing_result = dict(item.get("result") or {})
-    existing_result["verification"] = verification
-    item["result"] = existing_result
-    return updated_payload
+    queue = MergeQueue(payload)
+    queue.update_verification(item_id, verification=verification)
+    return queue.to_payload()
 
 
 def format_merge_queue_item(item: dict) -> str:
@@ -488,8 +777,8 @@ def queue_item_matches_filters(
     return True
 
 
-def select_queue_items(
-    payload: dict,
+def filter_queue_items(
+    items: list[dict],
     *,
     status: str | None = None,
     family_type: str | None = None,
@@ -500,7 +789,7 @@ def select_queue_items(
 ) -> list[dict]:
     items = [
         item
-        for item in payload.get("items", [])
+        for item in items
         if queue_item_matches_filters(
             item,
             status=status,
@@ -516,6 +805,27 @@ def select_queue_items(
     return items
 
 
+def select_queue_items(
+    payload: dict,
+    *,
+    status: str | None = None,
+    family_type: str | None = None,
+    confidence: str | None = None,
+    contains: str | None = None,
+    exclude_contains: str | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    return filter_queue_items(
+        payload.get("items", []),
+        status=status,
+        family_type=family_type,
+        confidence=confidence,
+        contains=contains,
+        exclude_contains=exclude_contains,
+        limit=limit,
+    )
+
+
 def format_merge_queue_triage(items: list[dict], *, status: str | None = None, limit: int = 20) -> str:
     if status:
         items = [item for item in items if item.get("status") == status]
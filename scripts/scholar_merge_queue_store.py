@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from scripts.investigate_scholar_ui import default_artifact_dir
+from scripts.scholar_merge_queue import (
+    MergeQueue,
+    apply_result_update,
+    apply_status_update,
+    apply_verification_update,
+    filter_queue_items,
+    load_merge_queue,
+    merge_discovered_items,
+    save_merge_queue,
+    utc_now_iso,
+    validate_queue_status,
+)
+
+SQLITE_QUEUE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+
+def default_merge_queue_db_path() -> Path:
+    return default_artifact_dir() / "merge_queue.db"
+
+
+def is_sqlite_queue_path(path: Path) -> bool:
+    return path.suffix.lower() in SQLITE_QUEUE_SUFFIXES
+
+
+def ensure_merge_queue_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS merge_queue_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS merge_queue_items (
+            id TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT '',
+            family_label TEXT NOT NULL DEFAULT '',
+            approved_by_operator INTEGER NOT NULL DEFAULT 0,
+            approved_at TEXT,
+            item_json TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS merge_queue_targets (
+            item_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            row_id TEXT NOT NULL DEFAULT '',
+            target_json TEXT NOT NULL,
+            PRIMARY KEY (item_id, position),
+            FOREIGN KEY (item_id) REFERENCES merge_queue_items(id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS merge_queue_results (
+            item_id TEXT PRIMARY KEY,
+            result_json TEXT NOT NULL,
+            FOREIGN KEY (item_id) REFERENCES merge_queue_items(id)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_merge_queue_items_status ON merge_queue_items(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_merge_queue_items_approved_at ON merge_queue_items(approved_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_merge_queue_items_position ON merge_queue_items(position)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_merge_queue_targets_row ON merge_queue_targets(row_id)")
+    conn.commit()
+
+
+class SqliteMergeQueue:
+    """Merge queue stored in SQLite, with the same interface as `MergeQueue`.
+
+    Every mutation runs in its own `BEGIN IMMEDIATE` transaction that re-reads
+    the item, so a review shell and an execution shell can update different
+    items without overwriting each other's changes.
+    """
+
+    def __init__(self, path: Path, *, timeout_seconds: float = 30.0) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path), timeout=timeout_seconds, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Same case folding as `approved_items_in_order`, so LIMIT can run in SQL.
+        self.conn.create_function("py_lower", 1, str.lower, deterministic=True)
+        ensure_merge_queue_tables(self.conn)
+
+    @classmethod
+    def load(cls, path: Path) -> SqliteMergeQueue:
+        return cls(path)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> SqliteMergeQueue:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    @property
+    def generated_at(self) -> str | None:
+        row = self.conn.execute("SELECT value FROM merge_queue_meta WHERE key = 'generated_at'").fetchone()
+        return row[0] if row else None
+
+    @property
+    def items(self) -> list[dict]:
+        return self._query_items("SELECT id, item_json FROM merge_queue_items ORDER BY position")
+
+    @property
+    def dirty(self) -> bool:
+        return False
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM merge_queue_items").fetchone()[0]
+
+    def __contains__(self, item_id: object) -> bool:
+        row = self.conn.execute("SELECT 1 FROM merge_queue_items WHERE id = ?", (item_id,)).fetchone()
+        return row is not None
+
+    def get(self, item_id: str) -> dict:
+        items = self._query_items("SELECT id, item_json FROM merge_queue_items WHERE id = ?", (item_id,))
+        if not items:
+            raise KeyError(f"Unknown merge queue item id: {item_id}")
+        return items[0]
+
+    def items_with_status(self, status: str) -> list[dict]:
+        return self._query_items(
+            "SELECT id, item_json FROM merge_queue_items WHERE status = ? ORDER BY position",
+            (status,),
+        )
+
+    def approved_items(self, *, limit: int | None = None) -> list[dict]:
+        # Ordered like `approved_items_in_order`; position keeps its stable-sort tie-break.
+        return self._query_items(
+            """
+            SELECT id, item_json FROM merge_queue_items
+            WHERE status = 'approved' AND approved_by_operator = 1
+            ORDER BY COALESCE(approved_at, ''), py_lower(family_label), position
+            LIMIT ?
+            """,
+            (-1 if limit is None else limit,),
+        )
+
+    def select(
+        self,
+        *,
+        status: str | None = None,
+        family_type: str | None = None,
+        confidence: str | None = None,
+        contains: str | None = None,
+        exclude_contains: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        return filter_queue_items(
+            self.items_with_status(status) if status else self.items,
+            status=status,
+            family_type=family_type,
+            confidence=confidence,
+            contains=contains,
+            exclude_contains=exclude_contains,
+            limit=limit,
+        )
+
+    def update_status(
+        self,
+        item_id: str,
+        *,
+        status: str,
+        note: str | None = None,
+        approved_by_operator: bool | None = None,
+    ) -> dict:
+        validate_queue_status(status)
+        with self.transaction():
+            item = self.get(item_id)
+            apply_status_update(item, status=status, note=note, approved_by_operator=approved_by_operator)
+            self._write_item(item)
+        return item
+
+    def update_result(
+        self,
+        item_id: str,
+        *,
+        result: dict,
+        status: str,
+        increment_execution_attempts: bool,
+    ) -> dict:
+        validate_queue_status(status)
+        with self.transaction():
+            item = self.get(item_id)
+            apply_result_update(
+                item,
+                result=result,
+                status=status,
+                increment_execution_attempts=increment_execution_attempts,
+            )
+            self._write_item(item)
+        return item
+
+    def update_verification(self, item_id: str, *, verification: dict) -> dict:
+        with self.transaction():
+            item = self.get(item_id)
+            apply_verification_update(item, verification=verification)
+            self._write_item(item)
+        return item
+
+    def replace_payload(self, payload: dict) -> None:
+        with self.transaction():
+            self._replace_rows(payload)
+
+    def merge_discovered(self, discovered_items: list[dict]) -> dict:
+        with self.transaction():
+            payload = merge_discovered_items(self.to_payload(), discovered_items)
+            self._replace_rows(payload)
+        return payload
+
+    def to_payload(self) -> dict:
+        return {"generated_at": self.generated_at, "items": self.items}
+
+    def save(self, path: Path | None = None) -> None:
+        # Mutations are committed as they happen; nothing is buffered.
+        return None
+
+    def _replace_rows(self, payload: dict) -> None:
+        self.conn.execute("DELETE FROM merge_queue_results")
+        self.conn.execute("DELETE FROM merge_queue_targets")
+        self.conn.execute("DELETE FROM merge_queue_items")
+        for position, item in enumerate(payload.get("items", [])):
+            self._write_item(item, position=position)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO merge_queue_meta (key, value) VALUES ('generated_at', ?)",
+            (payload.get("generated_at"),),
+        )
+
+    def _query_items(self, sql: str, params: tuple = ()) -> list[dict]:
+        rows = self.conn.execute(sql, params).fetchall()
+        if not rows:
+            return []
+        item_ids = [item_id for item_id, _ in rows]
+        targets: dict[str, list[dict]] = {item_id: [] for item_id in item_ids}
+        results: dict[str, object] = {}
+        for chunk_start in range(0, len(item_ids), 500):
+            chunk = item_ids[chunk_start : chunk_start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            for item_id, target_json in self.conn.execute(
+                f"SELECT item_id, target_json FROM merge_queue_targets WHERE item_id IN ({placeholders}) ORDER BY item_id, position",
+                chunk,
+            ):
+                targets[item_id].append(json.loads(target_json))
+            for item_id, result_json in self.conn.execute(
+                f"SELECT item_id, result_json FROM merge_queue_results WHERE item_id IN ({placeholders})",
+                chunk,
+            ):
+                results[item_id] = json.loads(result_json)
+
+        items = []
+        for item_id, item_json in rows:
+            item = json.loads(item_json)
+            if "targets" in item:
+                item["targets"] = targets[item_id]
+            if item_id in results:
+                item["result"] = results[item_id]
+            items.append(item)
+        return items
+
+    def _write_item(self, item: dict, *, position: int | None = None) -> None:
+        item_id = item.get("id")
+        if position is None:
+            row = self.conn.execute("SELECT position FROM merge_queue_items WHERE id = ?", (item_id,)).fetchone()
+            position = row[0] if row else len(self)
+        stored = {key: value for key, value in item.items() if key != "result"}
+        if "targets" in stored:
+            stored["targets"] = []
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO merge_queue_items
+            (id, position, status, family_label, approved_by_operator, approved_at, item_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                item_id,
+                position,
+                item.get("status", ""),
+                item.get("family_label", ""),
+                int(bool(item.get("approved_by_operator"))),
+                item.get("approved_at"),
+                json.dumps(stored, sort_keys=True),
+            ),
+        )
+        self.conn.execute("DELETE FROM merge_queue_targets WHERE item_id = ?", (item_id,))
+        self.conn.executemany(
+            "INSERT INTO merge_queue_targets (item_id, position, row_id, target_json) VALUES (?, ?, ?, ?)",
+            [
+                (item_id, index, target.get("row_id", ""), json.dumps(target, sort_keys=True))
+                for index, target in enumerate(item.get("targets", []))
+            ],
+        )
+        self.conn.execute("DELETE FROM merge_queue_results WHERE item_id = ?", (item_id,))
+        if "result" in item:
+            self.conn.execute(
+                "INSERT INTO merge_queue_results (item_id, result_json) VALUES (?, ?)",
+                (item_id, json.dumps(item["result"], sort_keys=True)),
+            )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO merge_queue_meta (key, value) VALUES ('generated_at', ?)",
+            (utc_now_iso(),),
+        )
+
+
+def open_merge_queue(path: Path) -> MergeQueue | SqliteMergeQueue:
+    if is_sqlite_queue_path(path):
+        return SqliteMergeQueue.load(path)
+    return MergeQueue.load(path)
+
+
+def merge_discovered_into_queue(path: Path, discovered_items: list[dict]) -> dict:
+    if not is_sqlite_queue_path(path):
+        payload = merge_discovered_items(load_merge_queue(path), discovered_items)
+        save_merge_queue(path, payload)
+        return payload
+    queue = SqliteMergeQueue(path)
+    try:
+        return queue.merge_discovered(discovered_items)
+    finally:
+        queue.close()
+
+
+def import_merge_queue_json(db_path: Path, json_path: Path) -> int:
+    queue = SqliteMergeQueue(db_path)
+    try:
+        payload = load_merge_queue(json_path)
+        queue.replace_payload(payload)
+        return len(payload.get("items", []))
+    finally:
+        queue.close()
+
+
+def export_merge_queue_json(db_path: Path, json_path: Path) -> int:
+    queue = SqliteMergeQueue(db_path)
+    try:
+        payload = queue.to_payload()
+    finally:
+        queue.close()
+    save_merge_queue(json_path, payload)
+    return len(payload["items"])
@@ -4,25 +4,13 @@ Sorts bib entries in reverse chronological order
 
 """
 
+from pathlib import Path
 from typing import List, Tuple
 import re
+import sys
 
-
-def get_bib_chunks(lines: List[str]) -> List[str]:
-    # get bib starts
-    index_starts = []
-    for i, line in enumerate(lines):
-        if line.startswith('@'):
-            index_starts.append(i)
-    # group bibs
-    bibs = []
-    for i in range(len(index_starts) - 1):
-        start = index_starts[i]
-        end = index_starts[i + 1]
-        bibs.append(''.join(lines[start: end]))
-    # get last bib too
-    bibs.append(''.join(lines[index_starts[-1]:]))
-    return bibs
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.bib_parser import BibEntry, load_bib_entries
 
 
 month_to_score = {
@@ -47,30 +35,23 @@ def get_year(year_line: str) -> int:
 
 if __name__ == '__main__':
     # 1) read
-    with open('_bibliography/papers.bib') as f_in:
-        lines = f_in.readlines()
-
-    # 2) organize
-    bib_chunks: List[str] = get_bib_chunks(lines=lines)
+    entries: List[BibEntry] = load_bib_entries(Path('_bibliography/papers.bib'))
 
-    # 3) sort by date
+    # 2) sort by date
     bib_chunks_with_scores: List[Tuple] = []
-    for bib_chunk in bib_chunks:
-        assert 'year' in bib_chunk
-        assert 'month' in bib_chunk
-        # Use regex to find actual field lines, not just any line containing "year" or "month"
-        month_line = [line.lower() for line in bib_chunk.split('\n') if re.match(r'\s*month\s*=', line.lower())][0]
-        month_score = [score for month, score in month_to_score.items() if month in month_line][0]
-        year_line = [line.lower() for line in bib_chunk.split('\n') if re.match(r'\s*year\s*=', line.lower())][0]
-        year_score = get_year(year_line=year_line)
+    for entry in entries:
+        assert entry.get('year'), entry.key
+        assert entry.get('month'), entry.key
+        month_score = month_to_score[entry.get('month').lower()[:3]]
+        year_score = get_year(year_line=entry.get('year'))
         score = year_score * 100 + month_score
-        bib_chunks_with_scores.append((bib_chunk, score))
+        bib_chunks_with_scores.append((entry.raw, score))
 
     sorted_bib_chunks_with_scores = sorted(bib_chunks_with_scores,
                                            key=lambda tup: tup[-1],
                                            reverse=True)
 
-    # 4) write
+    # 3) write
     with open('_bibliography/papers.bib', 'w') as f_out:
         f_out.write('---\n')
         f_out.write('---\n\n')
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scripts import bib_parser
+from scripts.bib_parser import load_bib_entries, parse_bib_text, plain_text
+from scripts.scholar_hygiene.expected import load_expected_papers
+
+BIB = """---
+---
+
+@inproceedings{Lo2020S2ORC,
+  author      = {Lo, Kyle and
+                 Wang, Lucy Lu},
+  booktitle   = {Proceedings of ACL},
+  month       = jul,
+  title       = {{S}2{ORC}: The Semantic Scholar Open Research Corpus},
+  year        = 2020
+}
+
+@article{Soldaini2024Dolma,
+  journal = "ArXiv",
+  note    = "part one " # {part two},
+  title   = "Dolma: an Open Corpus of {Three Trillion} Tokens",
+  year    = {2024},
+}
+"""
+
+
+class TestBibParser(unittest.TestCase):
+    def test_parses_delimiters_and_keeps_raw_entry_text(self) -> None:
+        first, second = parse_bib_text(BIB)
+
+        self.assertEqual(first.entry_type, "inproceedings")
+        self.assertEqual(first.key, "Lo2020S2ORC")
+        self.assertEqual(first.get("author"), "Lo, Kyle and Wang, Lucy Lu")
+        self.assertEqual(first.get("title"), "{S}2{ORC}: The Semantic Scholar Open Research Corpus")
+        self.assertEqual(plain_text(first.get("title")), "S2ORC: The Semantic Scholar Open Research Corpus")
+        self.assertEqual(first.get("month"), "jul")
+        self.assertEqual(first.get("year"), "2020")
+        self.assertEqual(second.get("title"), "Dolma: an Open Corpus of {Three Trillion} Tokens")
+        self.assertEqual(second.get("note"), "part one part two")
+        self.assertEqual(first.raw + second.raw, BIB.split("\n\n", 1)[1])
+
+    def test_cache_is_reused_until_the_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bib_file = Path(tmpdir) / "papers.bib"
+            cache_file = Path(tmpdir) / "cache" / "papers.pickle"
+            bib_file.write_text(BIB)
+
+            entries = load_bib_entries(bib_file, cache_file)
+            with mock.patch.object(bib_parser, "parse_bib_text", side_effect=AssertionError("re-parsed")):
+                self.assertEqual(load_bib_entries(bib_file, cache_file), entries)
+
+            bib_file.write_text(BIB.replace("2024", "2025"))
+            self.assertEqual(load_bib_entries(bib_file, cache_file)[1].get("year"), "2025")
+
+            cache_file.write_bytes(b"not a pickle")
+            self.assertEqual(len(load_bib_entries(bib_file, cache_file)), 2)
+
+    def test_expected_papers_strip_protective_braces(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bib_file = Path(tmpdir) / "papers.bib"
+            bib_file.write_text(BIB)
+
+            papers = load_expected_papers(bib_file, cache_file=None)
+
+        self.assertEqual(
+            [(paper["id"], paper["title"], paper["venue"], paper["year"]) for paper in papers],
+            [
+                ("Lo2020S2ORC", "S2ORC: The Semantic Scholar Open Research Corpus", "Proceedings of ACL", "2020"),
+                ("Soldaini2024Dolma", "Dolma: an Open Corpus of Three Trillion Tokens", "ArXiv", "2024"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
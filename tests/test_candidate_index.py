@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import unittest
+from difflib import SequenceMatcher
+
+from scripts.scholar_hygiene.index import (
+    CandidateIndex,
+    NearestTitleIndex,
+    index_title,
+    indexed_token_jaccard,
+    title_ratio_upper_bound,
+)
+
+
+class TestCandidateIndex(unittest.TestCase):
+    def test_shortlists_identifier_and_title_variants(self) -> None:
+        records = [
+            {"title": "CORD-19: The COVID-19 Open Research Dataset", "ids": ["10.1/cord"]},
+            {"title": "Cord-19: The COVID-19 open research datasets. arXiv 2020", "ids": []},
+            {"title": "Retitled camera-ready version", "ids": ["10.1/cord"]},
+            {"title": "SciBERT: A pretrained language model for scientific text", "ids": []},
+        ]
+        index = CandidateIndex(records, title_of=lambda record: record["title"], identifiers_of=lambda record: record["ids"])
+        candidates = index.candidates(
+            index_title("CORD-19: The COVID-19 open research dataset"),
+            {"10.1/cord"},
+            min_title_ratio=0.8,
+            min_token_jaccard=0.75,
+        )
+        self.assertEqual(candidates, [0, 1, 2])
+
+    def test_title_matches_never_miss_a_qualifying_title(self) -> None:
+        titles = [
+            "SciBERT",
+            "Sci-BERT",
+            "SciBERT: A pretrained language model for scientific text",
+            "SCIBERT: a pre-trained language model for scientific texts",
+            "CORD-19: The COVID-19 Open Research Dataset",
+            "cord19 datasets",
+            "The COVID-19 open research dataset (CORD-19)",
+            "Dolma: an open corpus of three trillion tokens",
+            "OLMo",
+            "",
+        ]
+        index = CandidateIndex(
+            [{"title": title} for title in titles], title_of=lambda record: record["title"], identifiers_of=lambda record: ()
+        )
+        for query in titles:
+            query_title = index_title(query)
+            for min_title_ratio, min_token_jaccard in ((0.8, 0.75), (0.84, None), (0.45, 0.35)):
+                matches = index.title_matches(
+                    query_title, min_title_ratio=min_title_ratio, min_token_jaccard=min_token_jaccard
+                )
+                for position, title in enumerate(titles):
+                    other = index.titles[position]
+                    ratio = SequenceMatcher(None, query_title.normalized, other.normalized).ratio()
+                    jaccard = indexed_token_jaccard(query_title, other)
+                    if ratio >= min_title_ratio or (min_token_jaccard is not None and jaccard >= min_token_jaccard):
+                        self.assertIn(position, matches, (query, title, min_title_ratio))
+        self.assertIn(0, index.title_matches(index_title("Sci-BERT"), min_title_ratio=0.8))
+
+    def test_title_ratio_upper_bound_never_undershoots_sequence_matcher(self) -> None:
+        titles = [
+            "CORD-19: The COVID-19 Open Research Dataset",
+            "cord19 datasets",
+            "Dolma: an open corpus of three trillion tokens",
+            "",
+        ]
+        for left in titles:
+            for right in titles:
+                left_title = index_title(left)
+                right_title = index_title(right)
+                ratio = SequenceMatcher(None, left_title.normalized, right_title.normalized).ratio()
+                self.assertGreaterEqual(title_ratio_upper_bound(left_title, right_title), ratio)
+
+
+class TestNearestTitleIndex(unittest.TestCase):
+    def test_matches_linear_scan_including_ties(self) -> None:
+        titles = [
+            "Dolma: an open corpus of three trillion tokens",
+            "OLMo: Accelerating the science of language models",
+            "Dolma: An Open Corpus of Three Trillion Tokens",
+            "dolma: an open corpus of three trillion tokens ",
+            "S2ORC: The semantic scholar open research corpus",
+            "",
+        ]
+        queries = ["DOLMA: an open corpus of 3 trillion tokens", "OLMo", "open research corpus", "", "zzzz"]
+
+        def key(title: str) -> str:
+            return title.lower().strip()
+
+        index = NearestTitleIndex(titles, key=key)
+        for threshold in (0.0, 0.5, 0.7, 0.99):
+            for query in queries:
+                best_match, best_score = None, 0.0
+                for title in titles:
+                    score = SequenceMatcher(None, key(query), key(title)).ratio()
+                    if score > best_score:
+                        best_match, best_score = title, score
+                expected = (best_match, best_score) if best_score >= threshold else (None, 0.0)
+                self.assertEqual(index.best_match(query, threshold), expected, (query, threshold))
+
+        self.assertEqual(index.best_match("dolma: AN open corpus of three trillion tokens", 0.7), (titles[0], 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
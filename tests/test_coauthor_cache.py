@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from scripts.scholar_hygiene import coauthors
+from scripts.scholar_hygiene.db import ensure_base_tables
+
+
+def days_ago(days: int) -> str:
+    return (datetime.today() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class FakeScholarly:
+    def __init__(self) -> None:
+        self.listing = [("p1", 10), ("p2", 20)]
+        self.filled: list[str] = []
+
+    def search_author_id(self, scholar_id: str) -> dict:
+        return {"scholar_id": scholar_id}
+
+    def fill(self, item: dict, sections: list[str] | None = None) -> dict:
+        if sections == ["coauthors"]:
+            return {**item, "coauthors": [{"scholar_id": "a"}]}
+        if sections == ["publications"]:
+            publications = [
+                {"author_pub_id": pub_id, "num_citations": citations, "bib": {"title": pub_id}, "filled": False}
+                for pub_id, citations in self.listing
+            ]
+            return {**item, "name": "A", "publications": publications}
+        self.filled.append(item["author_pub_id"])
+        return {**item, "bib": {**item["bib"], "abstract": "details"}, "filled": True}
+
+
+class TestCoauthorPublicationCache(unittest.TestCase):
+    def refresh(self, conn: sqlite3.Connection, fake: FakeScholarly, **kwargs) -> dict:
+        with mock.patch.object(coauthors, "_scholarly", return_value=fake), mock.patch.object(
+            coauthors, "COAUTHOR_PROFILE_SLEEP_RANGE", (0, 0)
+        ), mock.patch.object(coauthors, "COAUTHOR_PUBLICATION_SLEEP_RANGE", (0, 0)):
+            return coauthors.refresh_coauthor_cache(conn, days_ago(0), **kwargs)
+
+    def test_expired_profile_only_fills_new_publications(self) -> None:
+        fake = FakeScholarly()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"))
+            try:
+                ensure_base_tables(conn)
+                self.refresh(conn, fake)
+                conn.execute("UPDATE coauthors SET date_scraped = ?", (days_ago(coauthors.CACHE_DAYS + 1),))
+                fake.listing = [("p1", 11), ("p2", 20), ("p3", 1)]
+                fake.filled = []
+                summary = self.refresh(conn, fake)
+                profile = json.loads(conn.execute("SELECT source_json FROM coauthors").fetchone()[0])
+            finally:
+                conn.close()
+
+        self.assertEqual(fake.filled, ["p3"])
+        self.assertEqual(summary["reused_publication_fills"], 2)
+        self.assertEqual(summary["filled_publications"], 1)
+        self.assertEqual([publication["num_citations"] for publication in profile["publications"]], [11, 20, 1])
+        self.assertTrue(all(publication["bib"]["abstract"] == "details" for publication in profile["publications"]))
+
+    def test_stale_fills_are_refetched_and_cache_is_lru_bounded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"))
+            try:
+                ensure_base_tables(conn)
+                rows = [
+                    ("a", "p1", days_ago(200), "2026-01-04T00:00:00"),
+                    ("b", "p1", days_ago(1), "2026-01-01T00:00:00"),
+                    ("b", "p2", days_ago(1), "2026-01-03T00:00:00"),
+                    ("b", "p3", days_ago(1), "2026-01-02T00:00:00"),
+                ]
+                conn.executemany(
+                    "INSERT INTO coauthor_publication_fills VALUES (?, ?, '{}', ?, ?)",
+                    rows,
+                )
+                fills = coauthors.load_publication_fills(conn, "a", [{"author_pub_id": "p1"}])
+                evicted = coauthors.evict_publication_fills(conn, ttl_days=180, max_entries=2)
+                kept = conn.execute(
+                    "SELECT scholar_id, author_pub_id FROM coauthor_publication_fills ORDER BY scholar_id, author_pub_id"
+                ).fetchall()
+            finally:
+                conn.close()
+
+        self.assertEqual(fills, {})
+        self.assertEqual(evicted, 2)
+        self.assertEqual(kept, [("b", "p2"), ("b", "p3")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scripts.scholar_hygiene import coauthors
+from scripts.scholar_hygiene.db import ensure_base_tables
+from scripts.scholar_hygiene.ingest import ScholarCaptchaError
+from scripts.scholar_hygiene.scheduler import FetchScheduler, FetchUnit, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+class FakeScholarly:
+    """Stand-in for `scholarly` that serves two coauthors with two papers each."""
+
+    def __init__(self, blocked_fills: int = 0) -> None:
+        self.blocked_fills = blocked_fills
+        self.filled: list[str] = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def search_author_id(self, scholar_id: str) -> dict:
+        return {"scholar_id": scholar_id, "name": scholar_id.upper()}
+
+    def fill(self, item: dict, sections: list[str] | None = None) -> dict:
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.001)
+            return self.fill_item(item, sections)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def fill_item(self, item: dict, sections: list[str] | None) -> dict:
+        if sections == ["coauthors"]:
+            return {**item, "coauthors": [{"scholar_id": "a"}, {"scholar_id": "b"}, {"scholar_id": ""}]}
+        if sections == ["publications"]:
+            publications = [
+                {"author_pub_id": f"{item['scholar_id']}:{index}", "bib": {"title": f"Paper {index}"}}
+                for index in range(2)
+            ]
+            return {**item, "publications": publications}
+        with self.lock:
+            if self.blocked_fills:
+                self.blocked_fills -= 1
+                raise RuntimeError("Got a captcha request.")
+            self.filled.append(item["author_pub_id"])
+        return {**item, "filled": True}
+
+
+class TestFetchScheduler(unittest.TestCase):
+    def test_token_bucket_spaces_acquisitions_and_honours_pause(self) -> None:
+        clock = FakeClock()
+        acquired: list[float] = []
+
+        async def acquire_all() -> None:
+            bucket = TokenBucket(0.5, clock=clock)
+            for _ in range(3):
+                await bucket.acquire(clock.sleep)
+                acquired.append(clock.now)
+            bucket.pause(10.0)
+            await bucket.acquire(clock.sleep)
+            acquired.append(clock.now)
+
+        asyncio.run(acquire_all())
+
+        self.assertEqual(acquired, [0.0, 2.0, 4.0, 16.0])
+
+    def test_scheduler_keeps_one_bucket_per_host(self) -> None:
+        hosts: list[str] = []
+        scheduler = FetchScheduler(workers=3)
+        units = [FetchUnit(key=f"{host}{index}", host=host) for host in ("a", "b") for index in range(3)]
+
+        report = scheduler.run(units, lambda unit: hosts.append(unit.host) or unit.key)
+
+        self.assertEqual(sorted(report.results), sorted(unit.key for unit in units))
+        self.assertEqual(sorted(scheduler.buckets), ["a", "b"])
+        self.assertEqual(sorted(hosts), ["a", "a", "a", "b", "b", "b"])
+
+    def test_retries_captcha_after_backoff_and_gives_up_after_max_retries(self) -> None:
+        clock = FakeClock()
+        attempts = {"flaky": 0, "blocked": 0}
+
+        def fetch(unit: FetchUnit) -> str:
+            attempts[unit.key] += 1
+            if unit.key == "blocked" or attempts[unit.key] == 1:
+                raise ScholarCaptchaError("captcha")
+            return "ok"
+
+        scheduler = FetchScheduler(
+            workers=1,
+            retry_on=(ScholarCaptchaError,),
+            max_retries=2,
+            backoff_base=10.0,
+            sleep=clock.sleep,
+            clock=clock,
+            rng=random.Random(0),
+        )
+        report = scheduler.run([FetchUnit(key="flaky"), FetchUnit(key="blocked")], fetch)
+
+        self.assertEqual(report.results, {"flaky": "ok"})
+        self.assertIsInstance(report.failures["blocked"], ScholarCaptchaError)
+        self.assertEqual(attempts, {"flaky": 2, "blocked": 3})
+        self.assertEqual(len(clock.sleeps), 3)
+        self.assertTrue(5.0 <= clock.sleeps[0] <= 15.0)
+        self.assertTrue(10.0 <= clock.sleeps[2] <= 30.0)
+
+    def test_refresh_coauthor_cache_against_fake_scholarly(self) -> None:
+        fake = FakeScholarly(blocked_fills=1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"))
+            try:
+                ensure_base_tables(conn)
+                with mock.patch.object(coauthors, "_scholarly", return_value=fake), mock.patch.object(
+                    coauthors, "COAUTHOR_PROFILE_SLEEP_RANGE", (0, 0)
+                ), mock.patch.object(coauthors, "COAUTHOR_PUBLICATION_SLEEP_RANGE", (0, 0)), mock.patch(
+                    "scripts.scholar_hygiene.scheduler.FetchScheduler.backoff_delay", return_value=0.0
+                ):
+                    summary = coauthors.refresh_coauthor_cache(conn, "2026-01-01")
+                rows = conn.execute("SELECT scholar_id, source_json FROM coauthors ORDER BY scholar_id").fetchall()
+            finally:
+                conn.close()
+
+        self.assertEqual(summary["coauthor_count"], 3)
+        self.assertEqual(summary["refreshed_profiles"], 2)
+        self.assertEqual(summary["filled_publications"], 4)
+        self.assertEqual(sorted(fake.filled), ["a:0", "a:1", "b:0", "b:1"])
+        self.assertEqual(fake.max_active, 1)
+        self.assertEqual([scholar_id for scholar_id, _ in rows], ["a", "b"])
+        for _scholar_id, source_json in rows:
+            profile = json.loads(source_json)
+            self.assertEqual([publication["filled"] for publication in profile["publications"]], [True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import copy
+import json
+import unittest
+
+from scripts.scholar_hygiene.detector import (
+    detect_metadata_anomalies,
+    detect_missing_profile_articles,
+    detect_under_clustered_articles,
+)
+from scripts.scholar_hygiene.incremental import detect_issues_incrementally
+
+EXPECTED = [
+    {
+        "id": "dolma",
+        "title": "Dolma: an Open Corpus of Three Trillion Tokens",
+        "author": "Luca Soldaini and Kyle Lo",
+        "year": "2024",
+        "venue": "ACL",
+        "doi": "",
+        "arxiv": "",
+        "url": "",
+    },
+    {
+        "id": "olmo",
+        "title": "OLMo: Accelerating the Science of Language Models",
+        "author": "Dirk Groeneveld and Kyle Lo",
+        "year": "2024",
+        "venue": "ACL",
+        "doi": "",
+        "arxiv": "",
+        "url": "",
+    },
+]
+PUBLICATIONS = [
+    {
+        "id": f"pub-{index}",
+        "title": title,
+        "author": "Luca Soldaini and Kyle Lo",
+        "year": "2024",
+        "num_citations": index,
+        "cites_id": [cluster],
+    }
+    for index, (title, cluster) in enumerate(
+        [
+            ("Dolma: an Open Corpus of Three Trillion Tokens", "c1"),
+            ("Dolma: an open corpus of three trillion tokens for LM pretraining", "c1"),
+            ("SciBERT: a pretrained language model for scientific text", "c2"),
+        ]
+    )
+]
+VERSIONS = {
+    "pub-0": [
+        {"pub_url": "u1", "source_json": {"bib": {"title": "Dolma", "pub_year": "2023", "journal": "arXiv"}}},
+        {"pub_url": "u2", "source_json": {"bib": {"title": "Dolma", "pub_year": "2024", "journal": "ACL"}}},
+    ]
+}
+COAUTHORS = [
+    {
+        "name": "Dirk Groeneveld",
+        "publications": [
+            {
+                "bib": {
+                    "title": "OLMo: Accelerating the Science of Language Models",
+                    "author": "Dirk Groeneveld and Kyle Lo",
+                    "pub_year": "2024",
+                },
+                "num_citations": 10,
+            }
+        ],
+    }
+]
+
+
+def full_detection(expected: list[dict], publications: list[dict], coauthors: list[dict]) -> list[dict]:
+    return (
+        detect_missing_profile_articles(expected, publications, coauthors, [])
+        + detect_under_clustered_articles(publications, coauthors, [])
+        + detect_metadata_anomalies(publications, VERSIONS, expected)
+    )
+
+
+class TestIncrementalDetection(unittest.TestCase):
+    def test_reuses_unchanged_units_and_matches_full_run(self) -> None:
+        issues, state = detect_issues_incrementally(EXPECTED, PUBLICATIONS, VERSIONS, COAUTHORS, [])
+        self.assertEqual(issues, full_detection(EXPECTED, PUBLICATIONS, COAUTHORS))
+        self.assertEqual(state["unit_counts"]["reused"], 0)
+        state = json.loads(json.dumps(state))
+
+        again, again_state = detect_issues_incrementally(
+            EXPECTED, PUBLICATIONS, VERSIONS, COAUTHORS, [], previous_state=state
+        )
+        self.assertEqual(again, issues)
+        self.assertEqual(again_state["unit_counts"]["recomputed"], 0)
+
+        publications = copy.deepcopy(PUBLICATIONS)
+        publications[2]["title"] = "SciBERT: a pretrained language model for science"
+        edited, edited_state = detect_issues_incrementally(
+            EXPECTED, publications, VERSIONS, COAUTHORS, [], previous_state=state
+        )
+        self.assertEqual(edited, full_detection(EXPECTED, publications, COAUTHORS))
+        self.assertEqual(edited_state["changed_inputs"]["publications"], 1)
+        self.assertGreater(edited_state["unit_counts"]["reused"], 0)
+        self.assertGreater(edited_state["unit_counts"]["recomputed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
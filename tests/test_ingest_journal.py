@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scripts.scholar_hygiene import ingest
+from scripts.scholar_hygiene.db import ensure_base_tables
+
+
+class FakeScholarly:
+    def __init__(self, failing_titles: set[str]) -> None:
+        self.failing_titles = failing_titles
+        self.calls: list[str] = []
+
+    def search_author_id(self, scholar_id: str) -> dict:
+        self.calls.append("search_author_id")
+        return {"scholar_id": scholar_id}
+
+    def fill(self, item: dict) -> dict:
+        if "scholar_id" in item:
+            self.calls.append("fill_profile")
+            publications = [{"bib": {"title": title}} for title in ("Dolma", "OLMo")]
+            return {**item, "name": "Example Author", "publications": publications}
+        title = item["bib"]["title"]
+        self.calls.append(f"fill:{title}")
+        if title in self.failing_titles:
+            raise RuntimeError("connection reset")
+        return {**item, "cites_id": [f"cluster-{title}"]}
+
+    def search_pubs_custom_url(self, url: str) -> list[dict]:
+        self.calls.append(url)
+        return [{"pub_url": f"https://example.org{url}"}]
+
+
+class TestIngestJournal(unittest.TestCase):
+    def test_interrupted_refresh_resumes_without_cleaning_early(self) -> None:
+        fake = FakeScholarly(failing_titles={"OLMo"})
+        preflight = mock.Mock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"))
+            try:
+                ensure_base_tables(conn)
+                ingest.insert_paper(conn, {"bib": {"title": "Removed paper"}}, "2026-01-01")
+                with mock.patch.object(ingest, "_scholarly", return_value=fake), mock.patch.object(
+                    ingest, "preflight_scholar_access", preflight
+                ):
+                    with self.assertRaises(RuntimeError):
+                        ingest.refresh_profile(conn, "user", profile_sleep_seconds=0, version_sleep_range=(0, 0))
+                    titles_after_failure = sorted(title for (title,) in conn.execute("SELECT title FROM publications"))
+
+                    fake.failing_titles = set()
+                    fake.calls = []
+                    summary = ingest.refresh_profile(conn, "user", profile_sleep_seconds=0, version_sleep_range=(0, 0))
+                    resumed_calls = list(fake.calls)
+
+                    fake.calls = []
+                    ingest.refresh_profile(conn, "user", profile_sleep_seconds=0, version_sleep_range=(0, 0))
+                    fresh_calls = list(fake.calls)
+
+                titles = sorted(title for (title,) in conn.execute("SELECT title FROM publications"))
+                runs = conn.execute("SELECT step FROM ingest_runs ORDER BY id").fetchall()
+                units = conn.execute("SELECT kind, unit_key FROM ingest_run_units WHERE run_id = 1 ORDER BY kind, unit_key").fetchall()
+            finally:
+                conn.close()
+
+        self.assertEqual(titles_after_failure, ["Dolma", "Removed paper"])
+        self.assertEqual(resumed_calls[0], "fill:OLMo")
+        self.assertNotIn("search_author_id", resumed_calls)
+        self.assertEqual(sorted(resumed_calls[1:]), ["/scholar?cluster=cluster-Dolma", "/scholar?cluster=cluster-OLMo"])
+        self.assertEqual(summary["resumed_from_step"], "listed")
+        self.assertEqual([row["title"] for row in summary["removed_publications"]], ["Removed paper"])
+        self.assertEqual(titles, ["Dolma", "OLMo"])
+        self.assertEqual(preflight.call_count, 2)
+        self.assertEqual(fresh_calls, ["search_author_id", "fill_profile"])
+        self.assertEqual(runs, [("done",), ("done",)])
+        self.assertEqual(
+            units,
+            sorted(
+                [
+                    ("cluster", "cluster-Dolma"),
+                    ("cluster", "cluster-OLMo"),
+                    ("paper", ingest.hash_title("Dolma")),
+                    ("paper", ingest.hash_title("OLMo")),
+                ]
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scripts.scholar_hygiene import ingest
+from scripts.scholar_hygiene.db import ensure_base_tables
+
+
+class CountingConnection(sqlite3.Connection):
+    commits = 0
+
+    def commit(self) -> None:
+        self.commits += 1
+        super().commit()
+
+
+class FakeScholarly:
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+
+    def search_pubs_custom_url(self, url: str) -> list[dict]:
+        self.urls.append(url)
+        if url.endswith("=c4"):
+            raise RuntimeError("blocked")
+        if url.endswith("=c3"):
+            return []
+        return [{"pub_url": f"https://example.org{url}", "bib": {"title": "Version"}}]
+
+
+class TestScrapeVersions(unittest.TestCase):
+    def test_scrapes_each_unscraped_cluster_once_and_batches_commits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"), factory=CountingConnection)
+            try:
+                ensure_base_tables(conn)
+                for pub_id, cites_id in (("p1", ["c1", "c2"]), ("p2", ["c2", "c3"]), ("p3", ["c4"])):
+                    ingest.insert_paper(conn, {"bib": {"title": pub_id}, "cites_id": cites_id}, "2026-01-01")
+                    conn.execute("UPDATE publications SET id = ? WHERE title = ?", (pub_id, pub_id))
+                ingest.insert_version(conn, "p1", "c1", "https://example.org/old", "{}", "2026-01-01")
+                conn.commit()
+
+                scholarly = FakeScholarly()
+                conn.commits = 0
+                with mock.patch.object(ingest, "_scholarly", return_value=scholarly):
+                    scraped = ingest.scrape_versions(conn, sleep_range=(0, 0), today="2026-01-02", commit_every=2)
+                rows = conn.execute(
+                    "SELECT publication_id, cluster_id, pub_url FROM versions WHERE date_scraped = '2026-01-02' ORDER BY cluster_id"
+                ).fetchall()
+                error = conn.execute("SELECT source_json FROM versions WHERE cluster_id = 'c4'").fetchone()
+                commits = conn.commits
+            finally:
+                conn.close()
+
+        self.assertEqual(scraped, 4)
+        self.assertEqual(sorted(scholarly.urls), ["/scholar?cluster=c2", "/scholar?cluster=c3", "/scholar?cluster=c4"])
+        self.assertEqual(
+            rows,
+            [
+                ("p1", "c2", "https://example.org/scholar?cluster=c2"),
+                ("p2", "c3", "__empty__"),
+                ("p3", "c4", "__error__"),
+            ],
+        )
+        self.assertEqual(json.loads(error[0]), {"error": "blocked"})
+        self.assertLessEqual(commits, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import unittest
 
-from scripts.scholar_hygiene.detector import detect_metadata_anomalies
+from scripts.scholar_hygiene.detector import ExpectedMatchStore, detect_metadata_anomalies, detect_missing_profile_articles
 
 
 class TestMetadataAnomalyDetection(unittest.TestCase):
@@ -50,6 +50,54 @@ class TestMetadataAnomalyDetection(unittest.TestCase):
         self.assertIn("2023", issues[0]["evidence"]["observed_years"])
         self.assertIn("2024", issues[0]["evidence"]["observed_years"])
 
+    def test_detectors_share_one_match_store(self) -> None:
+        publications = [
+            {
+                "id": "pub-1",
+                "title": "A Great Paper",
+                "author": "Alice Smith and Kyle Lo",
+                "year": "2024",
+                "num_citations": 10,
+                "full_json": {"bib": {"title": "A Great Paper"}},
+            },
+            {
+                "id": "pub-2",
+                "title": "An Unrelated Survey",
+                "author": "Bob Jones",
+                "year": "2021",
+                "num_citations": 3,
+                "full_json": {"bib": {"title": "An Unrelated Survey"}},
+            },
+        ]
+        versions_by_publication = {
+            "pub-1": [
+                {"cluster_id": "c1", "pub_url": "https://example.com/1", "source_json": {"bib": {"pub_year": "2024"}}},
+                {"cluster_id": "c1", "pub_url": "https://example.com/2", "source_json": {"bib": {"pub_year": "2022"}}},
+            ]
+        }
+        expected = [
+            {
+                "id": "paper-1",
+                "title": "A Great Paper",
+                "author": "Alice Smith and Kyle Lo",
+                "year": "2024",
+                "venue": "ACL",
+                "doi": "",
+                "arxiv": "",
+                "url": "",
+            }
+        ]
+
+        match_store = ExpectedMatchStore(expected, publications)
+        self.assertEqual(match_store.publications_by_expected, [[0]])
+        self.assertEqual(detect_missing_profile_articles(expected, publications, [], match_store=match_store), [])
+        self.assertEqual(len(match_store.results), 1)
+
+        shared = detect_metadata_anomalies(publications, versions_by_publication, expected, match_store=match_store)
+        self.assertEqual(len(match_store.results), 1)
+        self.assertEqual(len(shared), 1)
+        self.assertEqual(shared, detect_metadata_anomalies(publications, versions_by_publication, expected))
+
 
 if __name__ == "__main__":
     unittest.main()
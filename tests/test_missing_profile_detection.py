@@ -2,7 +2,13 @@ from __future__ import annotations
 
 import unittest
 
-from scripts.scholar_hygiene.detector import detect_missing_profile_articles
+from scripts.scholar_hygiene.detector import (
+    CoauthorRecordFilter,
+    MissingArticleScan,
+    UnderClusteredScan,
+    detect_missing_profile_articles,
+)
+from scripts.scholar_hygiene.records import CoauthorPublication
 
 
 class TestMissingProfileDetection(unittest.TestCase):
@@ -49,6 +55,45 @@ class TestMissingProfileDetection(unittest.TestCase):
         self.assertEqual(issues[0]["type"], "missing_profile_article")
         self.assertEqual(issues[0]["confidence"], "high")
 
+    def test_profile_title_variant_without_shared_tokens_is_not_missing(self) -> None:
+        expected = [
+            {
+                "id": "paper-scibert",
+                "title": "SciBERT",
+                "author": "Iz Beltagy and Kyle Lo and Arman Cohan",
+                "year": "2019",
+                "doi": "",
+                "arxiv": "",
+                "url": "",
+            }
+        ]
+        my_publications = [
+            {
+                "id": "pub-scibert",
+                "title": "Sci-BERT",
+                "author": "Iz Beltagy and Kyle Lo and Arman Cohan",
+                "year": "2019",
+                "full_json": {"bib": {"title": "Sci-BERT"}},
+            }
+        ]
+        coauthors = [
+            {
+                "name": "Iz Beltagy",
+                "publications": [
+                    {
+                        "bib": {
+                            "title": "SciBERT",
+                            "author": "Iz Beltagy and Kyle Lo and Arman Cohan",
+                            "pub_year": "2019",
+                        },
+                        "num_citations": 5000,
+                    }
+                ],
+            }
+        ]
+
+        self.assertEqual(detect_missing_profile_articles(expected, my_publications, coauthors), [])
+
     def test_detects_missing_paper_from_add_articles_evidence(self) -> None:
         expected = [
             {
@@ -102,6 +147,76 @@ class TestMissingProfileDetection(unittest.TestCase):
             issues[0]["evidence"]["reasons"],
         )
 
+    def test_identifier_match_survives_candidate_pruning(self) -> None:
+        expected = [
+            {
+                "id": "paper-doi",
+                "title": "A Great Paper",
+                "author": "Alice Smith and Kyle Lo",
+                "year": "2024",
+                "doi": "10.1000/test",
+                "arxiv": "",
+                "url": "",
+            }
+        ]
+        unrelated = [
+            {"bib": {"title": f"Unrelated study number {index}", "author": "Bob Jones", "pub_year": "2010"}}
+            for index in range(50)
+        ]
+        coauthors = [
+            {
+                "name": "Alice Smith",
+                "publications": unrelated
+                + [
+                    {
+                        "bib": {
+                            "title": "Completely retitled camera-ready version",
+                            "author": "Alice Smith and Kyle Lo",
+                            "pub_year": "2024",
+                            "doi": "10.1000/TEST",
+                        },
+                        "num_citations": 3,
+                    }
+                ],
+            }
+        ]
+
+        issues = detect_missing_profile_articles(expected, [], coauthors)
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0]["evidence"]["coauthor_title"], "Completely retitled camera-ready version")
+        self.assertIn("identifier overlap: 10.1000/test", issues[0]["evidence"]["reasons"])
+
+    def test_coauthor_filter_keeps_every_record_a_scan_shortlists(self) -> None:
+        titles = [
+            "SciBERT",
+            "Sci-BERT",
+            "SciBERT: A pretrained language model for scientific text",
+            "SCIBERT: a pre-trained language model for scientific texts",
+            "CORD-19: The COVID-19 Open Research Dataset",
+            "The COVID-19 open research dataset (CORD-19)",
+            "cord19 datasets",
+            "Dolma: an open corpus of three trillion tokens",
+            "OLMo",
+            "",
+        ]
+        expected = [{"title": title, "doi": f"10.1/{position}"} for position, title in enumerate(titles[::2])]
+        publications = [{"id": str(position), "title": title} for position, title in enumerate(titles[1::2])]
+        records = [CoauthorPublication("Kyle Lo", title, "", "", ()) for title in [*titles, "Unrelated robotics work"]]
+        records.append(CoauthorPublication("Luca Soldaini", "Retitled", "", "", ("10.1/3",)))
+
+        missing_scan = MissingArticleScan(expected, publications, records)
+        cluster_scan = UnderClusteredScan(publications, records)
+        shortlisted = set()
+        for position in range(len(expected)):
+            shortlisted.update(missing_scan.shortlists(position)[1])
+        for position in range(len(publications)):
+            shortlisted.update(cluster_scan.coauthor_candidates(position))
+
+        coauthor_filter = CoauthorRecordFilter(expected, publications)
+        kept = {position for position, record in enumerate(records) if coauthor_filter.keeps(record)}
+        self.assertEqual(kept, shortlisted)
+        self.assertLess(len(kept), len(records))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import re
+import unittest
+
+from scripts.parse_scholar_add_articles_snapshot import normalize_space
+from scripts.scholar_merge_queue import DIGIT_WORDS, normalize_family_text
+
+TITLES = [
+    "2 OLMo 2 Furious",
+    "OLMo: Accelerating the science of language models",
+    "Dolma: An open corpus of 3 trillion tokens for language model pretraining research",
+    "Tülu 3: Pushing frontiers in open language model post-training",
+    "GPT-4 and 4.5 on 10 tasks",
+    "1 2 3 4 5 6 7 8 9 0",
+    "12 34 0.5 v2 2x x2",
+    "x_1 vs 1x vs 1_x",
+    "Ｆｕｌｌｗｉｄｔｈ ３ digits and ٣ arabic digits",
+    "S2ORC: The semantic scholar open research corpus",
+    "&amp; 7&nbsp;8 escaped",
+    "  leading\tand\ntrailing 9  ",
+    "",
+]
+
+
+def legacy_normalize_family_text(text: str) -> str:
+    text = normalize_space(text).casefold()
+    for digit, word in DIGIT_WORDS.items():
+        text = re.sub(rf"\b{re.escape(digit)}\b", word, text)
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+class TestNormalizeFamilyText(unittest.TestCase):
+    def test_single_pass_normalizer_matches_legacy_output(self) -> None:
+        for title in TITLES:
+            self.assertEqual(normalize_family_text(title), legacy_normalize_family_text(title), title)
+
+    def test_maps_standalone_digits_to_words(self) -> None:
+        self.assertEqual(normalize_family_text("2 OLMo 2 Furious"), "two olmo two furious")
+        self.assertEqual(normalize_family_text("GPT-4 v2"), "gpt four v2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.parse_scholar_profile_snapshot import ScholarProfileParser, iter_snapshot_rows, parse_snapshot
+
+
+def row_html(index: int) -> str:
+    return (
+        '<tr class="gsc_a_tr"><td class="gsc_a_t">'
+        f'<a href="/citations?view_op=view_citation&amp;citation_for_view=X:{index}" class="gsc_a_at">Paper &amp; {index}</a>'
+        '<div class="gs_gray">K Lo, L Soldaini</div>'
+        f'<div class="gs_gray">arXiv<span class="gs_oph">, 20{index:02d}</span></div></td>'
+        f'<td class="gsc_a_c"><a href="https://scholar.google.com/scholar?cites={index}" class="gsc_a_ac gs_ibl">{index * 3}</a></td>'
+        f'<td class="gsc_a_y"><span class="gsc_a_h gsc_a_hc gs_ibl">20{index:02d}</span></td></tr>'
+    )
+
+
+def profile_html(row_count: int) -> str:
+    return (
+        '<html><body><div id="gsc_prf_in">Kyle Lo</div>'
+        '<div class="gsc_prf_il" id="gsc_prf_i">Allen Institute for AI</div>'
+        '<table id="gsc_rsb_st"><tr><td class="gsc_rsb_sth">Citations</td><td class="gsc_rsb_std">1234</td></tr></table>'
+        f'<span id="gsc_a_nn">Articles 1&ndash;{row_count}</span>'
+        f'<table><tbody id="gsc_a_b">{"".join(row_html(index) for index in range(row_count))}</tbody></table>'
+        "</body></html>"
+    )
+
+
+class TestParseScholarProfileSnapshot(unittest.TestCase):
+    def test_chunked_parse_matches_single_chunk(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            html_path = Path(tmpdir) / "profile.html"
+            html_path.write_text(profile_html(12))
+
+            whole = parse_snapshot(html_path, chunk_size=1 << 20)
+            for chunk_size in (1, 5, 64):
+                self.assertEqual(parse_snapshot(html_path, chunk_size=chunk_size), whole)
+
+        self.assertEqual(
+            whole["profile"],
+            {
+                "name": "Kyle Lo",
+                "affiliation": "Allen Institute for AI",
+                "stats": {"Citations": "1234"},
+                "visible_articles_label": "Articles 1–12",
+            },
+        )
+        self.assertEqual(whole["visible_row_count"], 12)
+        self.assertEqual(
+            whole["visible_rows"][3],
+            {
+                "title": "Paper & 3",
+                "detail_url": "https://scholar.google.com/citations?view_op=view_citation&citation_for_view=X:3",
+                "authors": "K Lo, L Soldaini",
+                "venue": "arXiv, 2003",
+                "citations": "9",
+                "citations_url": "https://scholar.google.com/scholar?cites=3",
+                "year": "2003",
+            },
+        )
+
+    def test_rows_are_emitted_as_they_close(self) -> None:
+        html = profile_html(3)
+        second_row_end = html.index(row_html(1)) + len(row_html(1))
+        parser = ScholarProfileParser()
+
+        parser.feed(html[:second_row_end])
+        self.assertEqual([row["title"] for row in parser.drain_rows()], ["Paper & 0", "Paper & 1"])
+        parser.feed(html[second_row_end:])
+        parser.close()
+        self.assertEqual([row["title"] for row in parser.drain_rows()], ["Paper & 2"])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            html_path = Path(tmpdir) / "profile.html"
+            html_path.write_text(html)
+            rows = iter_snapshot_rows(html_path, chunk_size=256)
+            self.assertEqual(next(rows)["title"], "Paper & 0")
+            self.assertEqual(len(list(rows)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.parse_scholar_snapshots import detect_snapshot_kind, parse_all
+
+PROFILE_HTML = (
+    '<div id="gsc_prf_in">Kyle Lo</div><table><tbody id="gsc_a_b"><tr class="gsc_a_tr"><td>'
+    '<a href="/citations?view_op=view_citation" class="gsc_a_at">OLMo</a></td></tr></tbody></table>'
+)
+DETAIL_HTML = '<div id="gsc_oci_title"><a class="gsc_oci_title_link" href="https://example.org">OLMo</a></div>'
+VERSIONS_HTML = (
+    '<div class="gs_r gs_or gs_scl" data-rp="0"><div class="gs_ri"><h3 class="gs_rt"><a id="abc" href="/x">OLMo</a></h3>'
+    '<div class="gs_a">D Groeneveld - arXiv</div><div class="gs_fl gs_flb"><a href="/scholar?cluster=42">All 2 versions</a></div>'
+    "</div></div>"
+)
+ADD_ARTICLES_HTML = PROFILE_HTML + '<div id="gsc_ia_res"><div class="gsc_iadb_art"></div></div>'
+
+
+class TestParseScholarSnapshots(unittest.TestCase):
+    def test_detects_kind_from_page_markers(self) -> None:
+        self.assertEqual(detect_snapshot_kind(PROFILE_HTML).name, "profile")
+        self.assertEqual(detect_snapshot_kind(DETAIL_HTML).name, "detail")
+        self.assertEqual(detect_snapshot_kind(VERSIONS_HTML).name, "versions")
+        self.assertEqual(detect_snapshot_kind(ADD_ARTICLES_HTML).name, "add_articles")
+        self.assertIsNone(detect_snapshot_kind("<html></html>"))
+
+    def test_parses_stale_snapshots_in_a_process_pool(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artifact_dir = Path(tmpdir)
+            (artifact_dir / "profile_page_1.html").write_text(PROFILE_HTML)
+            (artifact_dir / "detail_page_1.html").write_text(DETAIL_HTML)
+            (artifact_dir / "current_page_1.html").write_text(VERSIONS_HTML)
+            (artifact_dir / "current_page_2.html").write_text(ADD_ARTICLES_HTML)
+            (artifact_dir / "blank_1.html").write_text("<html></html>")
+
+            summary = parse_all(artifact_dir, workers=2)
+            self.assertEqual(summary["parsed"], {"add_articles": 1, "detail": 1, "profile": 1, "versions": 1})
+            self.assertEqual(summary["unrecognized"], [str(artifact_dir / "blank_1.html")])
+            versions = json.loads((artifact_dir / "current_page_1_versions.json").read_text())
+            self.assertEqual(versions["cluster_id"], "42")
+            self.assertEqual(json.loads((artifact_dir / "profile_page_1_rows.json").read_text())["visible_row_count"], 1)
+
+            summary = parse_all(artifact_dir, workers=2)
+            self.assertEqual(summary["skipped_up_to_date"], 4)
+            self.assertEqual(summary["parsed"], {})
+
+            output_mtime = (artifact_dir / "detail_page_1_parsed.json").stat().st_mtime
+            os.utime(artifact_dir / "detail_page_1.html", (output_mtime + 10, output_mtime + 10))
+            self.assertEqual(parse_all(artifact_dir, workers=2)["parsed"], {"detail": 1})
+
+            self.assertEqual(sum(parse_all(artifact_dir, workers=1, force=True)["parsed"].values()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
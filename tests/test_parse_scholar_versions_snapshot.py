@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.parse_scholar_versions_snapshot import parse_versions_snapshot
+
+
+def result_block(attrs: str, title: str, body: str) -> str:
+    return (
+        f'<div class="gs_r gs_or gs_scl"{attrs}><div class="gs_ri">'
+        f'<h3 class="gs_rt">{title}</h3>{body}</div></div>'
+    )
+
+
+META = '<div class="gs_a">D Groeneveld, <a href="/citations?user=jY919eMAAAAJ&amp;hl=en">K Lo</a> - arXiv, 2024</div>'
+FOOTER = (
+    '<div class="gs_fl gs_flb"><a href="javascript:void(0)" class="gs_or_sav"><svg></svg></a> '
+    '<a href="/scholar?cites=1&amp;hl=en">Cited by 12</a> '
+    '<a href="/scholar?cluster=1234567890&amp;hl=en">All 3 versions</a></div>'
+)
+VERSIONS_PAGE = "".join(
+    [
+        '<html><body><div id="gs_res_ccl_mid">',
+        result_block(
+            ' data-did="d0" data-rp="0"',
+            '<span class="gs_ct1">[PDF]</span> <a id="r0" href="https://example.org/olmo?id=0&amp;v=1">OLMo <b>0</b> &amp; friends&#39;\xa0paper</a>',
+            META + '<div class="gs_rs">Open <b>language</b> models &hellip;</div>' + FOOTER,
+        ),
+        # Citations have no linked title and are skipped.
+        result_block(' data-did="d1" data-rp="1"', '<span id="r1">Citation only</span>', META + FOOTER),
+        # No footer: dropped without swallowing the next block.
+        result_block(' data-did="d2" data-rp="2"', '<a id="r2" href="/r2">No footer</a>', META),
+        # A newline before the meta line does not fit the layout either.
+        result_block(' data-did="d3" data-rp="3"', '<a id="r3" href="/r3">Newline</a>', "\n" + META + FOOTER),
+        result_block(' data-did="d4"', '<a id="r4" href="/r4">Dolma</a>', META + FOOTER),
+        '</div></body></html>',
+    ]
+)
+FOOTER_LINKS = [
+    {"label": "Cited by 12", "url": "https://scholar.google.com/scholar?cites=1&hl=en"},
+    {"label": "All 3 versions", "url": "https://scholar.google.com/scholar?cluster=1234567890&hl=en"},
+]
+
+
+class TestParseScholarVersionsSnapshot(unittest.TestCase):
+    def test_parses_well_formed_blocks_and_skips_the_rest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            html_path = Path(tmpdir) / "versions.html"
+            html_path.write_text(VERSIONS_PAGE)
+            payload = parse_versions_snapshot(html_path)
+
+        self.assertEqual(payload["cluster_id"], "1234567890")
+        self.assertEqual(payload["result_count"], 2)
+        self.assertEqual(
+            payload["results"],
+            [
+                {
+                    "result_id": "r0",
+                    "result_rank": 0,
+                    "data_did": "d0",
+                    "title": "OLMo 0 & friends' paper",
+                    "title_url": "https://example.org/olmo?id=0&v=1",
+                    "meta": "D Groeneveld, K Lo - arXiv, 2024",
+                    "snippet": "Open language models …",
+                    "footer_links": FOOTER_LINKS,
+                },
+                {
+                    "result_id": "r4",
+                    "result_rank": None,
+                    "data_did": "d4",
+                    "title": "Dolma",
+                    "title_url": "https://scholar.google.com/r4",
+                    "meta": "D Groeneveld, K Lo - arXiv, 2024",
+                    "snippet": "",
+                    "footer_links": FOOTER_LINKS,
+                },
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
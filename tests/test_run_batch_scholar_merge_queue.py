@@ -5,7 +5,8 @@ import unittest
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
-from scripts.run_batch_scholar_merge_queue import run_batch
+from scripts.mutate_scholar_merge_family import ProfileSession
+from scripts.run_batch_scholar_merge_queue import format_batch_timings, run_batch
 from scripts.scholar_merge_queue import save_merge_queue
 
 
@@ -78,6 +79,9 @@ class TestRunBatchScholarMergeQueue(unittest.IsolatedAsyncioTestCase):
                 )
             self.assertEqual([call.kwargs["item_id"] for call in mock.await_args_list], ["a", "b"])
             self.assertEqual(results, [{"item_id": "a"}, {"item_id": "b"}])
+            sessions = [call.kwargs["session"] for call in mock.await_args_list]
+            self.assertIsInstance(sessions[0], ProfileSession)
+            self.assertIs(sessions[0], sessions[1])
 
     async def test_run_batch_respects_limit(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -118,6 +122,50 @@ class TestRunBatchScholarMergeQueue(unittest.IsolatedAsyncioTestCase):
                 )
             self.assertEqual([call.kwargs["item_id"] for call in mock.await_args_list], ["a"])
 
+    async def test_profile_session_reuses_page_until_it_is_closed(self) -> None:
+        class FakePage:
+            def __init__(self) -> None:
+                self.closed = False
+
+            def is_closed(self) -> bool:
+                return self.closed
+
+            def locator(self, selector: str):
+                return type("Locator", (), {"count": AsyncMock(return_value=1)})()
+
+        class FakeBrowser:
+            def __init__(self) -> None:
+                self.contexts = [type("Context", (), {"pages": [FakePage()]})()]
+                self.close = AsyncMock()
+
+            def is_connected(self) -> bool:
+                return True
+
+        session = ProfileSession("http://127.0.0.1:9224")
+        session._browser = FakeBrowser()
+        first = await session.profile_page()
+        self.assertIs(await session.profile_page(), first)
+        self.assertEqual(session.page_select_count, 1)
+
+        first.closed = True
+        replacement = FakePage()
+        session._browser.contexts[0].pages.append(replacement)
+        self.assertIs(await session.profile_page(), replacement)
+        self.assertEqual((session.connect_count, session.page_select_count), (0, 2))
+
+        browser = session._browser
+        await session.close()
+        browser.close.assert_awaited_once()
+
+    def test_format_batch_timings(self) -> None:
+        output = format_batch_timings(
+            [({"id": "a", "family_label": "A"}, 1.5), ({"id": "b", "family_label": "B"}, 0.5)],
+            connect_count=1,
+            page_select_count=1,
+        )
+        self.assertIn("   1.50s  a  A", output)
+        self.assertIn("Total 2.00s over 2 item(s), mean 1.00s; 1 CDP connection(s), 1 page selection(s)", output)
+
 
 if __name__ == "__main__":
     unittest.main()
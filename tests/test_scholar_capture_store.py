@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scripts.parse_scholar_add_articles_snapshot import parse_snapshot as parse_add_articles_snapshot
+from scripts.parse_scholar_profile_snapshot import parse_snapshot as parse_profile_snapshot
+from scripts.parse_scholar_snapshots import parse_all
+from scripts import scholar_capture_store
+from scripts.scholar_capture_store import (
+    CaptureStore,
+    capture_html_paths,
+    pack_artifact_dir,
+    read_capture_text,
+    save_capture,
+)
+
+PROFILE_HTML = (
+    '<div id="gsc_prf_in">Kyle Lo</div><table><tbody id="gsc_a_b"><tr class="gsc_a_tr"><td>'
+    '<a href="/citations?view_op=view_citation" class="gsc_a_at">OLMo</a></td></tr></tbody></table>'
+)
+ADD_ARTICLES_HTML = (
+    '<div id="gsc_ia_res"><div class="gsc_iadb_art"><h3 class="gsc_iadb_art_t">Dolma</h3>'
+    '<div class="gs_gray">L Soldaini, K Lo - arXiv, 2024</div></div></div>'
+)
+
+
+class TestScholarCaptureStore(unittest.TestCase):
+    def test_identical_captures_share_one_blob(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artifact_dir = Path(tmpdir)
+            store = CaptureStore(artifact_dir)
+
+            pre = store.put("merge_pre_1.html", PROFILE_HTML, {"capture_kind": "pre"})
+            post = store.put("merge_post_1.html", PROFILE_HTML, {"capture_kind": "post"})
+            changed = store.put("merge_post_2.html", PROFILE_HTML.replace("OLMo", "OLMo 2"))
+
+            self.assertFalse(pre["deduplicated"])
+            self.assertTrue(post["deduplicated"])
+            self.assertEqual(pre["blob_path"], post["blob_path"])
+            self.assertNotEqual(changed["blob_path"], pre["blob_path"])
+            self.assertEqual(len(list((artifact_dir / "blobs").rglob("*.gz"))), 2)
+            self.assertEqual(list(artifact_dir.glob("*.html")), [])
+
+            self.assertEqual(read_capture_text(artifact_dir / "merge_post_1.html"), PROFILE_HTML)
+            self.assertEqual(
+                [path.name for path in capture_html_paths(artifact_dir)],
+                ["merge_post_1.html", "merge_post_2.html", "merge_pre_1.html"],
+            )
+            payload = parse_profile_snapshot(artifact_dir / "merge_post_2.html")
+            self.assertEqual(payload["visible_rows"][0]["title"], "OLMo 2")
+
+    def test_parsers_read_metadata_and_html_through_the_store(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artifact_dir = Path(tmpdir)
+            CaptureStore(artifact_dir).put(
+                "current_page_1.html",
+                ADD_ARTICLES_HTML,
+                {"captured_url": "https://scholar.google.com/citations?hl=en#d=gsc_md_iad"},
+            )
+
+            payload = parse_add_articles_snapshot(artifact_dir / "current_page_1.html")
+            self.assertEqual(payload["captured_url"], "https://scholar.google.com/citations?hl=en#d=gsc_md_iad")
+
+            summary = parse_all(artifact_dir, workers=1)
+            self.assertEqual(summary["parsed"], {"add_articles": 1})
+            self.assertTrue((artifact_dir / "current_page_1_add_articles.json").exists())
+            self.assertEqual(parse_all(artifact_dir, workers=1)["skipped_up_to_date"], 1)
+
+    def test_pack_moves_plain_captures_into_the_store(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artifact_dir = Path(tmpdir)
+            for stem in ("mutation_pre_1", "mutation_post_1"):
+                (artifact_dir / f"{stem}.html").write_text(PROFILE_HTML)
+                (artifact_dir / f"{stem}_capture.json").write_text(json.dumps({"capture_kind": stem}))
+
+            summary = pack_artifact_dir(artifact_dir)
+
+            self.assertEqual((summary["packed"], summary["deduplicated"]), (2, 1))
+            self.assertEqual(sorted(path.name for path in artifact_dir.iterdir()), ["blobs", "captures.jsonl"])
+            entries = CaptureStore(artifact_dir).entries()
+            self.assertEqual(entries["mutation_pre_1.html"]["metadata"], {"capture_kind": "mutation_pre_1"})
+            self.assertEqual(read_capture_text(artifact_dir / "mutation_pre_1.html"), PROFILE_HTML)
+
+    def test_save_capture_keeps_plain_html_in_the_committed_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            committed_dir = Path(tmpdir) / "plans" / "artifacts" / "scholar_ui"
+            local_dir = Path(tmpdir) / "_local" / "scholar_ui"
+            with mock.patch.object(scholar_capture_store, "SCHOLAR_UI_ARTIFACT_DIR", committed_dir):
+                plain = save_capture(committed_dir, "merge_pre_1.html", PROFILE_HTML, {"capture_kind": "pre"})
+                stored = save_capture(local_dir, "merge_pre_1.html", PROFILE_HTML, {"capture_kind": "pre"})
+
+            self.assertEqual(set(plain), {"html_path", "metadata_path"})
+            self.assertEqual(plain["html_path"].read_text(), PROFILE_HTML)
+            self.assertEqual(json.loads(plain["metadata_path"].read_text()), {"capture_kind": "pre"})
+            self.assertFalse((committed_dir / "captures.jsonl").exists())
+
+            self.assertEqual(stored["capture_name"], "merge_pre_1.html")
+            self.assertEqual(stored["capture_manifest"], local_dir / "captures.jsonl")
+            self.assertTrue(stored["blob_path"].exists())
+            self.assertFalse((local_dir / "merge_pre_1.html").exists())
+            self.assertEqual(read_capture_text(local_dir / stored["capture_name"]), PROFILE_HTML)
+
+
+if __name__ == "__main__":
+    unittest.main()
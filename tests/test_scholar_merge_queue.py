@@ -5,11 +5,14 @@ import unittest
 from pathlib import Path
 
 from scripts.scholar_merge_queue import (
+    MergeQueue,
     build_discovered_queue_items,
+    candidate_family_pairs,
     classify_family_type,
     classify_queue_confidence,
     discover_merge_families,
     family_similarity,
+    family_tokens,
     format_merge_queue,
     format_merge_queue_item,
     format_merge_queue_triage,
@@ -23,6 +26,7 @@ from scripts.scholar_merge_queue import (
     select_next_approved_item,
     titles_pass_family_heuristics,
     summarize_verification_output,
+    title_features,
     update_queue_item_result,
     update_queue_item_status,
     update_queue_item_verification,
@@ -39,6 +43,17 @@ class TestScholarMergeQueue(unittest.TestCase):
             0.95,
         )
 
+    def test_title_features_are_cached_and_accepted_by_pairwise_functions(self) -> None:
+        left_title = "Scim: Intelligent skimming support for scientific papers"
+        right_title = "Scim: Intelligent faceted highlights for interactive, multi-pass skimming of scientific papers"
+        left = title_features(left_title)
+        self.assertIs(title_features(left_title), left)
+        self.assertEqual(left.colon_prefix, "scim")
+        self.assertIn("skimming", left.tokens)
+        right = title_features(right_title)
+        self.assertEqual(family_similarity(left, right), family_similarity(left_title, right_title))
+        self.assertFalse(titles_pass_family_heuristics(left, right))
+
     def test_discover_merge_families_finds_olmo_family(self) -> None:
         rows = [
             {
@@ -64,6 +79,20 @@ class TestScholarMergeQueue(unittest.TestCase):
         self.assertEqual(len(families), 1)
         self.assertEqual({row["row_id"] for row in families[0]}, {"anchor", "variant"})
 
+    def test_candidate_family_pairs_keeps_pairs_sharing_only_common_tokens(self) -> None:
+        titles = [f"Language model study number {index}" for index in range(40)]
+        titles += ["Language models", "Language model"]
+        token_sets = [family_tokens(title) for title in titles]
+        pairs = candidate_family_pairs(token_sets, min_similarity=0.74)
+        expected = {
+            (left, right)
+            for left in range(len(titles))
+            for right in range(left + 1, len(titles))
+            if family_similarity(titles[left], titles[right]) >= 0.74
+        }
+        self.assertTrue(expected)
+        self.assertTrue(expected.issubset(set(pairs)))
+
     def test_titles_pass_family_heuristics_rejects_ordinal_series_mismatch(self) -> None:
         self.assertFalse(
             titles_pass_family_heuristics(
@@ -211,6 +240,41 @@ class TestScholarMergeQueue(unittest.TestCase):
         self.assertEqual(payload["items"][0]["status"], "reviewed")
         self.assertEqual(payload["items"][0]["review_notes"], "keep reviewed state")
 
+    def test_merge_discovered_items_matches_family_by_label_and_row_overlap(self) -> None:
+        existing = {
+            "generated_at": "2026-04-13T00:00:00Z",
+            "items": [
+                {
+                    "id": "merge:dolma:other-rows",
+                    "status": "skipped",
+                    "family_label": "Dolma",
+                    "targets": [{"row_id": "x", "title": "Dolma", "citations": "1", "year": "2024"}],
+                },
+                {
+                    "id": "merge:dolma:old",
+                    "status": "approved",
+                    "family_label": "DOLMA!",
+                    "targets": [{"row_id": "a", "title": "Dolma", "citations": "1", "year": "2024"}],
+                },
+            ],
+        }
+        discovered = [
+            {
+                "id": "merge:dolma:new",
+                "status": "discovered",
+                "family_label": "Dolma",
+                "targets": [
+                    {"row_id": "a", "title": "Dolma", "citations": "2", "year": "2024"},
+                    {"row_id": "b", "title": "Dolma 2023", "citations": "1", "year": "2023"},
+                ],
+                "discovery_source": {},
+                "discovered_at": "2026-04-13T00:00:01Z",
+            }
+        ]
+        payload = merge_discovered_items(existing, discovered)
+        statuses = {item["id"]: item["status"] for item in payload["items"]}
+        self.assertEqual(statuses, {"merge:dolma:other-rows": "skipped", "merge:dolma:new": "approved"})
+
     def test_load_and_save_merge_queue(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "merge_queue.json"
@@ -475,6 +539,27 @@ class TestScholarMergeQueue(unittest.TestCase):
         self.assertEqual(item["status"], "approved")
         self.assertEqual(item["result"]["runner_mode"], "dry_run")
 
+    def test_merge_queue_indexes_and_copies_on_write(self) -> None:
+        original = {"id": "a", "status": "discovered", "family_label": "A", "targets": []}
+        untouched = {"id": "b", "status": "discovered", "family_label": "B", "targets": []}
+        payload = {"generated_at": "2026-04-13T00:00:00Z", "items": [original, untouched]}
+        queue = MergeQueue(payload)
+        self.assertFalse(queue.dirty)
+        self.assertEqual([item["id"] for item in queue.items_with_status("discovered")], ["a", "b"])
+
+        queue.update_status("a", status="approved", note="clear duplicate")
+        queue.update_result("a", result={"runner_mode": "dry_run"}, status="approved", increment_execution_attempts=True)
+
+        self.assertEqual(original["status"], "discovered")
+        self.assertEqual([item["id"] for item in queue.items_with_status("discovered")], ["b"])
+        self.assertEqual([item["id"] for item in queue.approved_items()], ["a"])
+        self.assertEqual(queue.get("a")["execution_attempts"], 1)
+        updated = queue.to_payload()
+        self.assertIs(updated["items"][1], untouched)
+        self.assertNotEqual(updated["generated_at"], "2026-04-13T00:00:00Z")
+        with self.assertRaises(KeyError):
+            queue.get("missing")
+
     def test_summarize_verification_output(self) -> None:
         summary = summarize_verification_output(
             "1. OLMo: Accelerating the science of language models (row_id=x, citations=508, year=2024)"
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.scholar_merge_queue import MergeQueue, save_merge_queue
+from scripts.scholar_merge_queue_store import (
+    SqliteMergeQueue,
+    export_merge_queue_json,
+    import_merge_queue_json,
+    merge_discovered_into_queue,
+    open_merge_queue,
+)
+
+PAYLOAD = {
+    "generated_at": "2026-04-13T00:00:00Z",
+    "items": [
+        {
+            "id": "merge:dolma:123",
+            "status": "approved",
+            "family_label": "Dolma",
+            "targets": [
+                {"row_id": "a", "title": "Dolma: An open corpus", "citations": "377", "year": "2024"},
+                {"row_id": "b", "title": "Dolma: an open corpus", "citations": "12", "year": "2023"},
+            ],
+            "discovery_source": {"captured_url": "https://scholar.google.com/example"},
+            "review_notes": "clear duplicate",
+            "approved_by_operator": True,
+            "approved_at": "2026-04-13T00:00:02Z",
+            "execution_attempts": 0,
+            "result": None,
+        },
+        {
+            "id": "merge:olmo:456",
+            "status": "approved",
+            "family_label": "OLMo",
+            "targets": [{"row_id": "c", "title": "OLMo", "citations": "5", "year": "2024"}],
+            "approved_by_operator": True,
+            "approved_at": "2026-04-13T00:00:01Z",
+            "result": {"runner_mode": "dry_run"},
+        },
+        {
+            "id": "merge:scim:789",
+            "status": "discovered",
+            "family_label": "Scim",
+            "targets": [],
+        },
+    ],
+}
+
+
+class TestScholarMergeQueueStore(unittest.TestCase):
+    def test_json_import_export_round_trips(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = Path(tmpdir) / "merge_queue.json"
+            db_path = Path(tmpdir) / "merge_queue.db"
+            export_path = Path(tmpdir) / "exported.json"
+            save_merge_queue(json_path, PAYLOAD)
+
+            self.assertEqual(import_merge_queue_json(db_path, json_path), 3)
+            self.assertEqual(export_merge_queue_json(db_path, export_path), 3)
+            self.assertEqual(json.loads(export_path.read_text()), PAYLOAD)
+            self.assertEqual(export_path.read_text(), json_path.read_text())
+
+    def test_open_merge_queue_dispatches_on_suffix(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertIsInstance(open_merge_queue(Path(tmpdir) / "merge_queue.json"), MergeQueue)
+            queue = open_merge_queue(Path(tmpdir) / "merge_queue.db")
+            try:
+                self.assertIsInstance(queue, SqliteMergeQueue)
+            finally:
+                queue.close()
+
+    def test_status_queries_and_approved_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            queue = SqliteMergeQueue(Path(tmpdir) / "merge_queue.db")
+            try:
+                queue.replace_payload(PAYLOAD)
+                self.assertEqual([item["id"] for item in queue.approved_items()], ["merge:olmo:456", "merge:dolma:123"])
+                self.assertEqual([item["id"] for item in queue.approved_items(limit=1)], ["merge:olmo:456"])
+                self.assertEqual([item["id"] for item in queue.items_with_status("discovered")], ["merge:scim:789"])
+                self.assertEqual([item["id"] for item in queue.select(status="approved", contains="dolma")], ["merge:dolma:123"])
+                with self.assertRaises(KeyError):
+                    queue.get("missing")
+            finally:
+                queue.close()
+
+    def test_approved_items_limit_matches_in_memory_order(self) -> None:
+        items = [
+            {"id": f"merge:{index}", "status": "approved", "approved_by_operator": True, "targets": []}
+            | {"approved_at": approved_at, "family_label": label}
+            for index, (approved_at, label) in enumerate(
+                [
+                    ("2026-04-13T00:00:02Z", "beta"),
+                    ("2026-04-13T00:00:01Z", "Ångström"),
+                    ("2026-04-13T00:00:01Z", "Zeta"),
+                    ("2026-04-13T00:00:01Z", "alpha"),
+                    ("2026-04-13T00:00:01Z", "alpha"),
+                ]
+            )
+        ]
+        payload = {"generated_at": None, "items": items}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SqliteMergeQueue(Path(tmpdir) / "merge_queue.db") as queue:
+                queue.replace_payload(payload)
+                for limit in (None, 1, 3, 10):
+                    self.assertEqual(
+                        [item["id"] for item in queue.approved_items(limit=limit)],
+                        [item["id"] for item in MergeQueue(payload).approved_items(limit=limit)],
+                    )
+
+    def test_concurrent_connections_do_not_clobber_each_other(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "merge_queue.db"
+            review = SqliteMergeQueue(db_path)
+            runner = SqliteMergeQueue(db_path)
+            try:
+                review.replace_payload(PAYLOAD)
+                runner.update_result(
+                    "merge:olmo:456",
+                    result={"runner_mode": "execute"},
+                    status="merged",
+                    increment_execution_attempts=True,
+                )
+                review.update_status("merge:scim:789", status="skipped", note="not a duplicate")
+
+                merged = review.get("merge:olmo:456")
+                self.assertEqual(merged["status"], "merged")
+                self.assertEqual(merged["execution_attempts"], 1)
+                skipped = runner.get("merge:scim:789")
+                self.assertEqual(skipped["status"], "skipped")
+                self.assertEqual(skipped["review_notes"], "not a duplicate")
+                self.assertEqual([item["id"] for item in runner.approved_items()], ["merge:dolma:123"])
+            finally:
+                review.close()
+                runner.close()
+
+    def test_merge_discovered_into_sqlite_queue_preserves_status(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "merge_queue.db"
+            queue = SqliteMergeQueue(db_path)
+            try:
+                queue.replace_payload(PAYLOAD)
+            finally:
+                queue.close()
+            discovered = [
+                {
+                    "id": "merge:dolma:123",
+                    "status": "discovered",
+                    "family_label": "Dolma",
+                    "targets": [{"row_id": "a", "title": "New", "citations": "2", "year": "2024"}],
+                    "discovery_source": {},
+                    "review_notes": "",
+                    "approved_by_operator": False,
+                    "execution_attempts": 0,
+                    "result": None,
+                    "discovered_at": "2026-04-14T00:00:00Z",
+                }
+            ]
+            merge_discovered_into_queue(db_path, discovered)
+            queue = SqliteMergeQueue(db_path)
+            try:
+                item = queue.get("merge:dolma:123")
+            finally:
+                queue.close()
+            self.assertEqual(item["status"], "approved")
+            self.assertEqual(item["targets"][0]["title"], "New")
+
+
+if __name__ == "__main__":
+    unittest.main()
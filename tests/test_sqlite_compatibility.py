@@ -1,18 +1,30 @@
 from __future__ import annotations
 
+import json
 import sqlite3
+import tempfile
 import unittest
+from pathlib import Path
 
 from scripts.scholar_hygiene.config import DB_FILE
-from scripts.scholar_hygiene.db import ensure_base_tables, load_cached_coauthors, load_publications, load_versions_for_publication_ids
+from scripts.scholar_hygiene.db import (
+    NORMALIZED_LAYOUT_VERSION,
+    connect,
+    iter_coauthor_publications,
+    load_cached_coauthors,
+    load_publications,
+    load_versions_for_publication_ids,
+    migrate_database,
+)
+from scripts.scholar_hygiene.detector import CoauthorRecordFilter, as_coauthor_publications
+from scripts.scholar_hygiene.records import CoauthorPublication
 
 
 class TestSqliteCompatibility(unittest.TestCase):
     def test_existing_db_is_readable_and_compatible(self) -> None:
         self.assertTrue(DB_FILE.exists(), f"Expected DB to exist at {DB_FILE}")
-        conn = sqlite3.connect(str(DB_FILE))
+        conn = connect(DB_FILE, read_only=True)
         try:
-            ensure_base_tables(conn)
             publications = load_publications(conn)
             versions = load_versions_for_publication_ids(conn)
             coauthors = load_cached_coauthors(conn)
@@ -27,6 +39,132 @@ class TestSqliteCompatibility(unittest.TestCase):
         self.assertIn("title", first)
         self.assertIn("full_json", first)
 
+    def test_read_only_loaders_return_nothing_for_an_empty_db(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_file = Path(tmpdir) / "export.db"
+            sqlite3.connect(str(db_file)).close()
+            conn = connect(db_file, read_only=True)
+            try:
+                publications = load_publications(conn, include_json=False)
+                versions = load_versions_for_publication_ids(conn, include_json=False)
+                coauthors = list(iter_coauthor_publications(conn))
+            finally:
+                conn.close()
+
+        self.assertEqual((publications, versions, coauthors), ([], {}, []))
+
+    def test_old_layout_is_migrated_to_typed_columns(self) -> None:
+        publication = {
+            "bib": {"title": "Dolma: An open corpus", "author": "Luca Soldaini and Kyle Lo", "pub_year": "2024", "journal": "ACL", "doi": "10.1/dolma"},
+            "num_citations": 377,
+            "pub_url": "https://example.org/dolma",
+            "cites_id": ["123", "456"],
+        }
+        coauthor = {
+            "name": "Kyle Lo",
+            "affiliation": "AI2",
+            "publications": [{"bib": {"title": "OLMo", "pub_year": "2024"}, "num_citations": 5, "author_pub_id": "x"}],
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"))
+            try:
+                conn.execute("CREATE TABLE publications (id TEXT PRIMARY KEY, title TEXT, date_added TEXT, full_json TEXT, validated INTEGER DEFAULT 0)")
+                conn.execute("CREATE TABLE coauthors (scholar_id TEXT PRIMARY KEY, source_json TEXT NOT NULL, date_scraped TEXT NOT NULL)")
+                conn.execute("INSERT INTO publications VALUES ('p1', 'Dolma', '2026-01-01', ?, 0)", (json.dumps(publication),))
+                conn.execute("INSERT INTO coauthors VALUES ('s1', ?, '2026-01-01')", (json.dumps(coauthor),))
+                legacy = load_publications(conn, include_json=False)
+                legacy_coauthors = load_cached_coauthors(conn, include_json=False)
+
+                migrate_database(conn)
+                lean = load_publications(conn, include_json=False)
+                clusters = conn.execute("SELECT cluster_id FROM publication_clusters ORDER BY position").fetchall()
+                coauthors = load_cached_coauthors(conn, include_json=False)
+                full = load_publications(conn)
+            finally:
+                conn.close()
+
+        self.assertEqual(lean, legacy)
+        self.assertEqual(coauthors, legacy_coauthors)
+        self.assertEqual(clusters, [("123",), ("456",)])
+        self.assertEqual(lean[0]["year"], "2024")
+        self.assertEqual(lean[0]["venue"], "ACL")
+        self.assertEqual(lean[0]["cites_id"], ["123", "456"])
+        self.assertEqual(lean[0]["full_json"]["bib"], {"doi": "10.1/dolma"})
+        self.assertEqual(full[0]["full_json"], publication)
+        self.assertEqual(coauthors[0]["name"], "Kyle Lo")
+        self.assertEqual(coauthors[0]["publications"], [{"bib": {"title": "OLMo", "pub_year": "2024"}, "num_citations": 5}])
+
+    def test_streams_coauthor_publications_and_keeps_only_reachable_ones(self) -> None:
+        profiles = [
+            {
+                "name": "Kyle Lo",
+                "publications": [
+                    {"bib": {"title": "Dolma: an open corpus", "author": "L Soldaini", "pub_year": "2024"}, "num_citations": 7},
+                    {"bib": {"title": "Unrelated robotics work"}, "num_citations": 1},
+                    {"bib": {"title": "Sci-BERT"}, "num_citations": 3},
+                ],
+            },
+            {
+                "name": "Luca Soldaini",
+                "publications": [{"bib": {"title": "Retitled", "doi": "10.1/OLMO"}, "pub_url": "https://example.org/olmo"}],
+            },
+        ]
+        expected = [{"title": "Dolma: An Open Corpus", "doi": "10.1/olmo"}]
+        # Shares no token with "Sci-BERT", but the title ratio can reach coauthor support.
+        publications = [{"title": "SciBERT"}]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"))
+            try:
+                migrate_database(conn)
+                for position, profile in enumerate(profiles):
+                    conn.execute(
+                        "INSERT INTO coauthors (scholar_id, source_json, date_scraped) VALUES (?, ?, '2026-01-01')",
+                        (f"s{position}", json.dumps(profile)),
+                    )
+                unsynced = list(iter_coauthor_publications(conn))
+                migrate_database(conn)
+                streamed = list(iter_coauthor_publications(conn))
+                coauthor_filter = CoauthorRecordFilter(expected, publications)
+                filtered = [record for record in iter_coauthor_publications(conn) if coauthor_filter.keeps(record)]
+            finally:
+                conn.close()
+
+        self.assertEqual(streamed, as_coauthor_publications(profiles))
+        self.assertEqual(unsynced, streamed)
+        self.assertEqual(
+            filtered,
+            [
+                CoauthorPublication("Kyle Lo", "Dolma: an open corpus", "L Soldaini", "2024", (), 7),
+                CoauthorPublication("Kyle Lo", "Sci-BERT", "", "", (), 3),
+                CoauthorPublication("Luca Soldaini", "Retitled", "", "", ("10.1/olmo", "https://example.org/olmo"), 0),
+            ],
+        )
+
+    def test_layout_version_change_rebuilds_normalized_rows_once(self) -> None:
+        coauthor = {"name": "Kyle Lo", "publications": [{"bib": {"title": "OLMo"}}]}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = sqlite3.connect(str(Path(tmpdir) / "export.db"))
+            try:
+                migrate_database(conn)
+                conn.execute("INSERT INTO coauthors (scholar_id, source_json, date_scraped) VALUES ('s1', ?, '2026-01-01')", (json.dumps(coauthor),))
+                migrate_database(conn)
+                conn.execute("UPDATE coauthor_publications SET title = 'stale'")
+                conn.execute("PRAGMA user_version = 0")
+                conn.commit()
+
+                migrate_database(conn)
+                rebuilt = conn.execute("SELECT title FROM coauthor_publications").fetchall()
+                conn.execute("UPDATE coauthor_publications SET title = 'kept'")
+                migrate_database(conn)
+                kept = conn.execute("SELECT title FROM coauthor_publications").fetchall()
+                (version,) = conn.execute("PRAGMA user_version").fetchone()
+            finally:
+                conn.close()
+
+        self.assertEqual(rebuilt, [("OLMo",)])
+        self.assertEqual(kept, [("kept",)])
+        self.assertEqual(version, NORMALIZED_LAYOUT_VERSION)
+
 
 if __name__ == "__main__":
     unittest.main()
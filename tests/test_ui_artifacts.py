@@ -5,10 +5,21 @@ import tempfile
 import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from scripts.scholar_hygiene import ui_artifacts
 from scripts.scholar_hygiene.ui_artifacts import load_add_articles_candidates
 
 
+def capture(query: str, *rows: tuple[str, str]) -> dict:
+    return {
+        "search_query": query,
+        "captured_url": f"https://example.com/{query}",
+        "result_stats": {},
+        "rows": [{"title": title, "authors_venue": "K Lo - arXiv, 2024", "doc_id": doc_id} for title, doc_id in rows],
+    }
+
+
 class TestUiArtifacts(unittest.TestCase):
     def test_prefers_newest_candidate_by_doc_id(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -87,6 +98,45 @@ class TestUiArtifacts(unittest.TestCase):
             self.assertEqual(candidates[0]["doc_id"], "o054MLHYLD4J")
             self.assertEqual(candidates[0]["captured_url"], "https://example.com/old")
 
+    def test_cache_only_reads_new_or_changed_artifacts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artifact_dir = Path(tmpdir) / "artifacts"
+            artifact_dir.mkdir()
+            cache_file = Path(tmpdir) / "cache.json"
+            (artifact_dir / "a_add_articles.json").write_text(json.dumps(capture("dolma", ("Dolma", "d1"), ("OLMo", "o1"))))
+            (artifact_dir / "b_add_articles.json").write_text(json.dumps(capture("olmo", ("OLMo 2", "o1"))))
+
+            def load() -> tuple[list[dict], list[str]]:
+                ui_artifacts._loaded_candidates.clear()
+                read = []
+                original = ui_artifacts.read_artifact_candidates
+
+                def counting(path: Path, mtime: float) -> list[dict]:
+                    read.append(path.name)
+                    return original(path, mtime)
+
+                with mock.patch.object(ui_artifacts, "read_artifact_candidates", counting):
+                    candidates = load_add_articles_candidates(artifact_dir, cache_file=cache_file)
+                ui_artifacts._loaded_candidates.clear()
+                self.assertEqual(candidates, load_add_articles_candidates(artifact_dir))
+                return candidates, read
+
+            first, read = load()
+            self.assertEqual(read, ["a_add_articles.json", "b_add_articles.json"])
+            self.assertEqual([candidate["title"] for candidate in first], ["Dolma", "OLMo 2"])
+
+            self.assertEqual(load(), (first, []))
+
+            (artifact_dir / "c_add_articles.json").write_text(json.dumps(capture("dolma", ("Dolma v2", "d1"))))
+            appended, read = load()
+            self.assertEqual(read, ["c_add_articles.json"])
+            self.assertEqual([candidate["title"] for candidate in appended], ["Dolma v2", "OLMo 2"])
+
+            (artifact_dir / "b_add_articles.json").write_text(json.dumps(capture("olmo", ("OLMo 2 Furious", "o2"))))
+            changed, read = load()
+            self.assertEqual(read, ["b_add_articles.json"])
+            self.assertEqual([candidate["title"] for candidate in changed], ["Dolma v2", "OLMo", "OLMo 2 Furious"])
+
 
 if __name__ == "__main__":
     unittest.main()
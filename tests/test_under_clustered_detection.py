@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import unittest
 
-from scripts.scholar_hygiene.detector import detect_under_clustered_articles
+from scripts.scholar_hygiene.detector import (
+    detect_under_clustered_articles,
+    publication_features,
+    under_clustered_candidate_pairs,
+)
 
 
 class TestUnderClusteredDetection(unittest.TestCase):
@@ -177,6 +181,48 @@ class TestUnderClusteredDetection(unittest.TestCase):
             "; ".join(issues[0]["evidence"]["reasons"]),
         )
 
+    def test_reports_coauthor_support_only_for_pairs_in_a_shared_block(self) -> None:
+        def publication(pub_id: str, title: str, year: str, cluster: str) -> dict:
+            return {
+                "id": pub_id,
+                "title": title,
+                "author": "Alice Smith and Kyle Lo",
+                "year": year,
+                "num_citations": 1,
+                "cites_id": [cluster],
+            }
+
+        publications = [
+            publication("left", "Dolma: an open corpus of three trillion tokens", "2024", "c1"),
+            publication("unrelated", "SciBERT: a pretrained language model for scientific text", "2019", "c2"),
+            publication("right", "Dolma: an open corpus of three trillion token", "2023", "c1"),
+            publication("stale", "Dolma: an open corpus of three trillion tokens", "2020", "c3"),
+        ]
+        coauthors = [
+            {
+                "name": "Luca Soldaini",
+                "publications": [{"bib": {"title": "Dolma: An Open Corpus of Three Trillion Tokens"}}],
+            }
+        ]
+
+        issues = detect_under_clustered_articles(publications, coauthors)
+        self.assertEqual([issue["id"] for issue in issues], ["cluster:left:right"])
+        self.assertIn(
+            "coauthor sees a single likely merged paper: Luca Soldaini",
+            issues[0]["evidence"]["reasons"],
+        )
+
+    def test_candidate_pairs_include_title_variants_that_share_no_token(self) -> None:
+        def publication(title: str, year: str, author: str = "Iz Beltagy and Kyle Lo and Arman Cohan") -> dict:
+            return {"title": title, "author": author, "year": year, "cites_id": []}
+
+        features = [
+            publication_features(publication("SciBERT", "2019")),
+            publication_features(publication("Sci-BERT", "2020")),
+            publication_features(publication("Sci-BERT", "2022")),
+            publication_features(publication("Sci-BERT", "2019", author="Someone Else")),
+        ]
+        self.assertEqual(under_clustered_candidate_pairs(features), [(0, 1)])
 
 if __name__ == "__main__":
     unittest.main()